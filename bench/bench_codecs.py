@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Micro-benchmark of variable size field codecs.
+
+Measures decoding and encoding of a stream of variable size fields, similar
+to attributes of Heap Nodes, using generic functions on BytesIO and methods
+of BinaryReader and BinaryWriter.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import io
+import sys
+import random
+import timeit
+import argparse
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVmisc as LV
+
+
+def prepareValues(count, seed=8320):
+    """ Prepares list of (attribute id, attribute value) pairs
+
+    Most values are small, like in real heaps, with some requiring longer encoding.
+    """
+    rnd = random.Random(seed)
+    values = []
+    for i in range(count):
+        atId = rnd.choice([rnd.randint(-120, 120), rnd.randint(-0x8000, 0x7FFF)])
+        atVal = rnd.choice([rnd.randint(-0x8000, 0x7FFE), rnd.randint(-2**31, 2**31-1)])
+        values.append((atId, atVal,))
+    return values
+
+def encodeGeneric(values):
+    data_buf = bytearray()
+    data_buf += LV.prepareVariableSizeFieldU124(len(values))
+    for atId, atVal in values:
+        data_buf += LV.prepareVariableSizeFieldS124(atId)
+        data_buf += LV.prepareVariableSizeFieldS24(atVal)
+    return bytes(data_buf)
+
+def encodeWriter(values):
+    data_buf = LV.BinaryWriter()
+    data_buf.writeVarU124(len(values))
+    for atId, atVal in values:
+        data_buf.writeVarS124(atId)
+        data_buf.writeVarS24(atVal)
+    return bytes(data_buf)
+
+def decodeGeneric(data):
+    bldata = io.BytesIO(data)
+    count = LV.readVariableSizeFieldU124(bldata)
+    values = []
+    for i in range(count):
+        atId = LV.readVariableSizeFieldS124(bldata)
+        atVal = LV.readVariableSizeFieldS24(bldata)
+        values.append((atId, atVal,))
+    return values
+
+def decodeReader(data):
+    bldata = LV.BinaryReader(data)
+    count = bldata.readVarU124()
+    values = []
+    for i in range(count):
+        atId = bldata.readVarS124()
+        atVal = bldata.readVarS24()
+        values.append((atId, atVal,))
+    return values
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('-n', '--count', default=100000, type=int,
+            help="amount of attributes in the stream (default is %(default)s)")
+
+    parser.add_argument('-r', '--repeat', default=5, type=int,
+            help="number of repetitions; best time is reported (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    values = prepareValues(po.count)
+    data = encodeGeneric(values)
+    if encodeWriter(values) != data or decodeReader(data) != decodeGeneric(data):
+        raise RuntimeError("Codecs produced different results")
+    print("{:10s}\t{:>14s}\t{:>14s}".format("codec","encode Mattr/s","decode Mattr/s"))
+    for name, encode, decode in (("generic", encodeGeneric, decodeGeneric,), ("binary", encodeWriter, decodeReader,),):
+        t_enc = min(timeit.repeat(lambda: encode(values), number=1, repeat=po.repeat))
+        t_dec = min(timeit.repeat(lambda: decode(data), number=1, repeat=po.repeat))
+        print("{:10s}\t{:14.2f}\t{:14.2f}".format(name, po.count / t_enc / 1e6, po.count / t_dec / 1e6))
+
+if __name__ == "__main__":
+    main()
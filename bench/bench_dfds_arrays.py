@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of loading default data of numeric arrays.
+
+Loads a synthetic VI with large numeric array in default data, and measures
+time and memory of loading the VI with items stored as list of Data Fill
+objects, and with items stored as single typed array.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import gc
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVdatafill as LVdatafill
+from bench_rsrc import generateVI
+from bench_heap_memory import prepareVIOptions, loadVI
+
+
+def measureArrayLoad(rsrc_fname, typed_arrays):
+    """ Loads VI and returns load time, memory used by default data, and the data re-created.
+
+    Smart storage of large arrays as raw data block is disabled, so the
+    list of Data Fills is created regardless of array size; that is what
+    happens for arrays of types which are not stored as raw data block.
+    """
+    po = prepareVIOptions(rsrc_fname)
+    po.typed_arrays = typed_arrays
+    po.store_as_data_above = po.array_data_limit
+    gc.collect()
+    start_time = time.perf_counter()
+    vi = loadVI(po, rsrc_fname)
+    load_time = time.perf_counter() - start_time
+    DFDS = vi.get_or_raise('DFDS')
+    DFDS_data = DFDS.prepareRSRCData(DFDS.defaultSectionNumber())
+    del vi, DFDS
+    # Load again with tracing, which would affect the time measurement
+    gc.collect()
+    tracemalloc.start()
+    vi = loadVI(po, rsrc_fname)
+    gc.collect()
+    mem_loaded, _ = tracemalloc.get_traced_memory()
+    section = vi.get_or_raise('DFDS').getSection()
+    section.content = []
+    gc.collect()
+    mem_released, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return load_time, mem_loaded - mem_released, DFDS_data
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--array-len', default=200000, type=int,
+            help="amount of items in the array of default data (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    po = parser.parse_args()
+    # Only the default data is scaled up
+    po.heap_nodes = 0
+    po.typedescs = 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_dfds_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        results = []
+        for typed_arrays in (False, True,):
+            load_time, dfds_mem, DFDS_data = measureArrayLoad(rsrc_fname, typed_arrays)
+            results.append(("typed" if typed_arrays else "objects", load_time, dfds_mem, DFDS_data,))
+
+    if any(DFDS_data != results[0][3] for _, _, _, DFDS_data in results):
+        raise RuntimeError("Default data re-created differently depending on storage")
+    print("Typed arrays stored in {}".format("numpy" if LVdatafill.numpy is not None else "array module"))
+    print("{:>12s}\t{:>12s}\t{:>12s}".format("storage", "load time s", "memory kB"))
+    for storage, load_time, dfds_mem, _ in results:
+        print("{:>12s}\t{:12.3f}\t{:12.1f}".format(storage, load_time, dfds_mem / 1024))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of default data lookup for single type.
+
+Loads a synthetic VI with large default data, and measures time of loading
+the VI and retrieving default value of one type, with Data Fills parsed while
+loading, and with Data Fills parsed on first access (lazy mode).
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import time
+import argparse
+import tempfile
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+from pylabview.LVrsrcontainer import VI
+from bench_rsrc import generateVI
+from bench_heap_memory import prepareVIOptions, loadVI
+
+
+def lookupDefaultData(rsrc_fname, lazy, tdIndex):
+    """ Loads VI and returns binary data of default value of type with given index.
+
+    Also returns time of parsing DFDS and the lookup. To exclude parsing of
+    blocks DFDS depends on from that time, the DFDS is parsed again for the lookup.
+    """
+    po = prepareVIOptions(rsrc_fname)
+    po.lazy = lazy
+    # In lazy mode, blocks are read on access, so the file must remain open
+    with open(rsrc_fname, "rb") as rsrc_fh:
+        vi = VI(po, rsrc_fh=rsrc_fh, text_encoding="mac_roman")
+        DFDS = vi.get_or_raise('DFDS')
+        DFDS.getParsedSection(None)
+        DFDS.getSection().raw_data_updated = True
+        start_time = time.perf_counter()
+        df = DFDS.getDFForTypeId(tdIndex)
+        dfds_time = time.perf_counter() - start_time
+        return df.prepareRSRCData(), dfds_time
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--typedescs', default=100, type=int,
+            help="amount of type descriptors in the cluster (default is %(default)s)")
+
+    parser.add_argument('--array-len', default=1000, type=int,
+            help="amount of items in the array with default data (default is %(default)s)")
+
+    parser.add_argument('--repeat', default=5, type=int,
+            help="amount of repetitions of each measurement (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    po = parser.parse_args()
+    # Only the default data is scaled up
+    po.heap_nodes = 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_dfds_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        # Look for the type with default data which is first in DFDS
+        vi = loadVI(prepareVIOptions(rsrc_fname), rsrc_fname)
+        tdIndex = vi.get_or_raise('DFDS').getDataFill(0).index
+        del vi
+        results = []
+        for lazy in (False, True,):
+            best_total, best_dfds = None, None
+            for i in range(po.repeat):
+                start_time = time.perf_counter()
+                df_data, dfds_time = lookupDefaultData(rsrc_fname, lazy, tdIndex)
+                total_time = time.perf_counter() - start_time
+                best_total = total_time if best_total is None else min(best_total, total_time)
+                best_dfds = dfds_time if best_dfds is None else min(best_dfds, dfds_time)
+            results.append(("lazy" if lazy else "eager", best_total, best_dfds, df_data,))
+
+    if any(df_data != results[0][3] for _, _, _, df_data in results):
+        raise RuntimeError("Default data differs depending on parsing mode")
+    print("{:>12s}\t{:>12s}\t{:>12s}".format("parsing", "total s", "DFDS s"))
+    for parsing, total_time, dfds_time, _ in results:
+        print("{:>12s}\t{:12.3f}\t{:12.4f}".format(parsing, total_time, dfds_time))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of heap export to XML.
+
+Loads a synthetic VI with large block diagram heap, and measures the time
+of exporting Heap Nodes of all heap blocks into XML elements.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import sys
+import random
+import timeit
+import argparse
+import tempfile
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVxml as ET
+from pylabview.LVblock import HeapVerb
+from pylabview.readRSRC import main as readRSRC_main
+from bench_rsrc import TEMPLATE_VI, runTool, extractTemplate, scaleHeapXML
+from bench_heap_memory import prepareVIOptions, loadVI
+
+
+def generateVI(work_path, po):
+    """ Generates synthetic VI file with large block diagram heap.
+    """
+    rnd = random.Random(po.seed)
+    xml_fname = extractTemplate(TEMPLATE_VI, os.path.join(work_path, "gen_vi"))
+    fname_base = os.path.splitext(xml_fname)[0]
+    scaleHeapXML(fname_base + "_BDHb.xml", po.heap_nodes, rnd, list_tag="nodeList", part_class="sRN")
+    rsrc_fname = os.path.join(work_path, "synth_bd.vi")
+    runTool(readRSRC_main, ["-c", "-m", xml_fname, "-i", rsrc_fname])
+    return rsrc_fname
+
+def exportHeaps(vi, fname_base):
+    """ Exports all heap sections of the VI into XML elements; returns amount of nodes.
+    """
+    nodes_count = 0
+    for block in vi.blocks.values():
+        if not isinstance(block, HeapVerb):
+            continue
+        for snum, section in block.sections.items():
+            section_elem = ET.Element("Section")
+            block.exportXMLSectionData(section_elem, snum, section, fname_base)
+            nodes_count += len(section.objects)
+    return nodes_count
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--heap-nodes', default=50000, type=int,
+            help="amount of nodes to add to block diagram heap (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    parser.add_argument('-r', '--repeat', default=5, type=int,
+            help="number of repetitions; best time is reported (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_heap_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        vi = loadVI(prepareVIOptions(rsrc_fname), rsrc_fname)
+        fname_base = os.path.join(work_path, "export")
+        nodes_count = exportHeaps(vi, fname_base)
+        t_export = min(timeit.repeat(lambda: exportHeaps(vi, fname_base), number=1, repeat=po.repeat))
+
+    print("{:>12s}\t{:>12s}\t{:>12s}".format("heap nodes", "export s", "knodes/s"))
+    print("{:12d}\t{:12.3f}\t{:12.1f}".format(nodes_count, t_export, nodes_count / t_export / 1e3))
+
+if __name__ == "__main__":
+    main()
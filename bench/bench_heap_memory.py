@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Memory benchmark of loaded heap.
+
+Loads a synthetic VI with large front panel heap, and measures the amount of
+memory taken by Heap Nodes of all heap blocks.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import gc
+import argparse
+import tempfile
+import tracemalloc
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+from pylabview.LVrsrcontainer import VI
+from pylabview.readRSRC import prepareArgParser, setInternalOptions
+from pylabview.LVblock import HeapVerb
+from bench_rsrc import generateVI
+
+
+def prepareVIOptions(rsrc_fname):
+    """ Prepares options object for VI loading, with defaults same as in readRSRC.
+    """
+    po = prepareArgParser().parse_args(["--list", "--rsrc", rsrc_fname])
+    setInternalOptions(po)
+    po.filebase = "bench"
+    return po
+
+def loadVI(po, rsrc_fname):
+    """ Loads VI file with given options.
+    """
+    with open(rsrc_fname, "rb") as rsrc_fh:
+        vi = VI(po, rsrc_fh=rsrc_fh, text_encoding="mac_roman")
+    return vi
+
+def measureHeapMemory(rsrc_fname, compact_heap):
+    """ Loads VI and returns amount of Heap Nodes and memory they use.
+
+    The memory is measured as difference between loaded VI, and the same VI
+    after all Heap Nodes are released.
+    """
+    po = prepareVIOptions(rsrc_fname)
+    po.compact_heap = compact_heap
+    gc.collect()
+    tracemalloc.start()
+    vi = loadVI(po, rsrc_fname)
+    gc.collect()
+    mem_loaded, _ = tracemalloc.get_traced_memory()
+    nodes_count = 0
+    for block in vi.blocks.values():
+        if not isinstance(block, HeapVerb):
+            continue
+        for section in block.sections.values():
+            if section.hasObjects():
+                nodes_count += len(section.objects)
+            else:
+                nodes_count += len(section.heap_columns)
+            section.objects = []
+            section.heap_columns = None
+            section.heap_index = None
+            section.heap_cache = None
+    gc.collect()
+    mem_released, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return nodes_count, mem_loaded - mem_released
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--heap-nodes', default=50000, type=int,
+            help="amount of nodes to add to front panel heap (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    po = parser.parse_args()
+    # Only the heap is scaled up
+    po.typedescs = 0
+    po.array_len = 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_heap_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        results = []
+        for compact_heap in (False, True,):
+            nodes_count, heap_mem = measureHeapMemory(rsrc_fname, compact_heap)
+            results.append(("compact" if compact_heap else "objects", nodes_count, heap_mem,))
+
+    print("{:>12s}\t{:>12s}\t{:>12s}\t{:>12s}".format("storage", "heap nodes", "memory kB", "bytes/node"))
+    for storage, nodes_count, heap_mem in results:
+        print("{:>12s}\t{:12d}\t{:12.1f}\t{:12.1f}".format(storage, nodes_count, heap_mem / 1024, heap_mem / max(nodes_count, 1)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of re-saving a VI after small heap edits.
+
+Loads a synthetic VI with large block diagram heap, modifies a few Heap Nodes
+and measures the time of saving the RSRC file; with delta update of heap
+data, and with the whole heap prepared again.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import random
+import timeit
+import argparse
+import tempfile
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVheap as LVheap
+from pylabview.LVrsrcontainer import VI
+from pylabview.LVblock import HeapVerb
+from bench_heap_export import generateVI
+from bench_heap_memory import prepareVIOptions
+
+
+def modifyHeaps(vi, rnd, count, full):
+    """ Modifies given amount of nodes with uid in each heap section, then saves the VI.
+    """
+    uidAttrId = LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__uid.value
+    for block in vi.blocks.values():
+        if not isinstance(block, HeapVerb):
+            continue
+        for snum, section in block.sections.items():
+            block.parseData(section_num=snum)
+            if not full:
+                block.enableDeltaUpdate(snum)
+            uid_nodes = [obj for obj in section.objects if uidAttrId in obj.attribs]
+            for obj in rnd.sample(uid_nodes, min(count, len(uid_nodes))):
+                obj.attribs[uidAttrId] += 1
+                obj.markUpdated()
+    return vi.saveRSRCToBytes()
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--heap-nodes', default=50000, type=int,
+            help="amount of nodes to add to block diagram heap (default is %(default)s)")
+
+    parser.add_argument('--modified', default=5, type=int,
+            help="amount of nodes to modify in each heap section (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    parser.add_argument('-r', '--repeat', default=5, type=int,
+            help="number of repetitions; best time is reported (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    rnd = random.Random(po.seed)
+    with tempfile.TemporaryDirectory(prefix="bench_heap_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        times = []
+        for full in (False, True,):
+            # Keep the file open, as not all sections are read while loading
+            with open(rsrc_fname, "rb") as rsrc_fh:
+                vi = VI(prepareVIOptions(rsrc_fname), rsrc_fh=rsrc_fh, text_encoding="mac_roman")
+                times.append(min(timeit.repeat(lambda: modifyHeaps(vi, rnd, po.modified, full),
+                             number=1, repeat=po.repeat)))
+
+    print("{:>12s}\t{:>12s}\t{:>12s}".format("heap nodes", "delta s", "full s"))
+    print("{:12d}\t{:12.3f}\t{:12.3f}".format(po.heap_nodes, times[0], times[1]))
+
+if __name__ == "__main__":
+    main()
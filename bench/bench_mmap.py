@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of memory-mapped reading of RSRC files.
+
+Loads a synthetic LLB with many uncompressed entries, with and without memory
+mapping, and measures time of reading raw data of all sections and memory
+allocated for it. Pages of the mapped file belong to the OS page cache, so
+they are not included in the allocated memory.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import gc
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+from pylabview.LVrsrcontainer import VI
+from bench_rsrc import generateLLB
+from bench_heap_memory import prepareVIOptions
+
+
+def measureRawDataRead(rsrc_fname, use_mmap):
+    """ Loads the file and reads raw data of all sections; returns data size, memory and time.
+    """
+    po = prepareVIOptions(rsrc_fname)
+    po.mmap = use_mmap
+    gc.collect()
+    tracemalloc.start()
+    start_mem, _ = tracemalloc.get_traced_memory()
+    start_time = time.perf_counter()
+    with open(rsrc_fname, "rb") as rsrc_fh, VI(po, rsrc_fh=rsrc_fh, text_encoding="mac_roman") as vi:
+        for block in vi.blocks.values():
+            block.readRawDataSections(section_count=0xffffffff)
+        read_time = time.perf_counter() - start_time
+        end_mem, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        data_size = sum(len(section.raw_data) for block in vi.blocks.values()
+          for section in block.sections.values() if section.raw_data is not None)
+    return data_size, end_mem - start_mem, read_time
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--llb-entries', default=2000, type=int,
+            help="amount of entries in the library (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_mmap_") as work_path:
+        rsrc_fname = generateLLB(work_path, po)
+        results = []
+        for use_mmap in (False, True,):
+            data_size, read_mem, read_time = measureRawDataRead(rsrc_fname, use_mmap)
+            results.append(("mmap" if use_mmap else "read", data_size, read_mem, read_time,))
+
+    print("{:>12s}\t{:>12s}\t{:>12s}\t{:>12s}".format("reading", "raw data kB", "memory kB", "time s"))
+    for reading, data_size, read_mem, read_time in results:
+        print("{:>12s}\t{:12.1f}\t{:12.1f}\t{:12.3f}".format(reading, data_size / 1024, read_mem / 1024, read_time))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of RSRC files processing.
+
+Generates synthetic VI and LLB files of controllable size, by scaling up the
+extracted XMLs of example files and re-creating RSRC files from them. Then
+measures time of reading, extracting, creating and fixing these files.
+Results can be stored and compared with a baseline, to catch regressions.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import os
+import copy
+import json
+import random
+import shutil
+import timeit
+import argparse
+import tempfile
+import contextlib
+from unittest.mock import patch
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVxml as ET
+from pylabview.readRSRC import main as readRSRC_main
+from pylabview.modRSRC import main as modRSRC_main
+
+
+TEMPLATE_VI = os.path.join("examples", "lv14f1", "empty_vifile.vi")
+TEMPLATE_LLB = os.path.join("examples", "lv14f1", "empty_libfile.llb")
+
+BENCH_COMMANDS = ("list", "extract", "create", "fix",)
+
+# Same as store_as_data_above option set by readRSRC
+STORE_AS_DATA_ABOVE = 4095
+
+
+def runTool(tool_main, args):
+    """ Executes main function of a tool with given command line, with output muted.
+    """
+    with patch.object(sys, 'argv', ["bench"] + args):
+        with open(os.devnull, "w") as null_fh:
+            with contextlib.redirect_stdout(null_fh):
+                tool_main()
+
+def extractTemplate(rsrc_fname, out_path):
+    """ Extracts template RSRC file and returns name of the main XML.
+    """
+    os.makedirs(out_path, exist_ok=True)
+    xml_fname = os.path.join(out_path, os.path.splitext(os.path.basename(rsrc_fname))[0] + ".xml")
+    runTool(readRSRC_main, ["-x", "-i", rsrc_fname, "-m", xml_fname])
+    return xml_fname
+
+def getMaxUid(root):
+    max_uid = 0
+    for elem in root.iter():
+        uid = elem.get("uid")
+        if uid is not None:
+            max_uid = max(max_uid, int(uid, 0))
+    return max_uid
+
+def scaleHeapXML(heap_fname, nodes_count, rnd, list_tag="partsList", part_class="cosm"):
+    """ Adds given amount of parts to a heap XML.
+
+    By default, cosmetic parts of the front panel heap are added. Each part
+    is a few heap nodes; copies of existing part are used, with unique uids
+    and varied bounds.
+    """
+    tree = ET.parse(heap_fname, parser=ET.XMLParser(target=ET.CommentedTreeBuilder()))
+    root = tree.getroot()
+    parts_elem = root.find(".//{}".format(list_tag))
+    cosm_elem = parts_elem.find("./SL__arrayElement[@class='{}']".format(part_class))
+    nodes_per_part = len(list(cosm_elem.iter()))
+    uid = getMaxUid(root)
+    for i in range(max(nodes_count // nodes_per_part, 0)):
+        uid += 1
+        part_elem = copy.deepcopy(cosm_elem)
+        part_elem.set("uid", str(uid))
+        top, left = rnd.randint(0, 600), rnd.randint(0, 1000)
+        part_elem.find("./bounds").text = "({:d}, {:d}, {:d}, {:d})".format(top, left, top + 16, left + 16)
+        parts_elem.append(part_elem)
+    parts_elem.set("elements", str(len(parts_elem.findall("./SL__arrayElement"))))
+    ET.pretty_element_tree_heap(root)
+    tree.write(heap_fname, encoding='utf-8', xml_declaration=True)
+
+def scaleMainXML(root, typedescs_count, array_len, rnd):
+    """ Adds type descriptors and default data to the main XML of a VI.
+
+    Creates a Cluster of many numeric Type Descriptors, and an Array of
+    32-bit integers with default fill of given length.
+    """
+    vctp_elem = root.find("./VCTP/Section")
+    toplevel_elem = vctp_elem.find("./TopLevel")
+    flat_list = vctp_elem.findall("./TypeDesc")
+    # Add the new TDs before TopLevel, so that they get next FlatTypeIDs
+    insert_pos = list(vctp_elem).index(toplevel_elem)
+    def addFlatTD(td_elem):
+        nonlocal insert_pos
+        vctp_elem.insert(insert_pos, td_elem)
+        insert_pos += 1
+        flat_list.append(td_elem)
+        return len(flat_list) - 1
+
+    num_types = ("NumInt8", "NumInt16", "NumInt32", "NumInt64", "NumUInt16", "NumFloat64",)
+    cluster_elem = ET.Element("TypeDesc", {"Type": "Cluster", "Format": "inline"})
+    for i in range(typedescs_count):
+        td_elem = ET.Element("TypeDesc", {"Type": rnd.choice(num_types), "Prop1": "0", "Format": "inline"})
+        flat_id = addFlatTD(td_elem)
+        ET.SubElement(cluster_elem, "TypeDesc", {"TypeID": str(flat_id)})
+    cluster_flat_id = addFlatTD(cluster_elem)
+
+    int_flat_id = addFlatTD(ET.Element("TypeDesc", {"Type": "NumInt32", "Prop1": "0", "Format": "inline"}))
+    array_elem = ET.Element("TypeDesc", {"Type": "Array", "Format": "inline"})
+    ET.SubElement(array_elem, "Dimension", {"Flags": "0x00FF", "FixedSize": "0xFFFFFF"})
+    ET.SubElement(array_elem, "TypeDesc", {"TypeID": str(int_flat_id)})
+    array_flat_id = addFlatTD(array_elem)
+
+    # Make the new TDs top level, and add Type Map entries for them
+    top_indexes = [int(elem.get("Index"), 0) for elem in toplevel_elem.findall("./TypeDesc")]
+    tm80_elem = root.find("./TM80/Section")
+    index_shift = int(tm80_elem.get("IndexShift"), 0)
+    cluster_type_id = max(top_indexes) + 1
+    array_type_id = cluster_type_id + 1
+    ET.SubElement(toplevel_elem, "TypeDesc", {"Index": str(cluster_type_id), "FlatTypeID": str(cluster_flat_id)})
+    ET.SubElement(toplevel_elem, "TypeDesc", {"Index": str(array_type_id), "FlatTypeID": str(array_flat_id)})
+    while len(tm80_elem.findall("./Client")) + index_shift < array_type_id:
+        ET.SubElement(tm80_elem, "Client", {"TMFBit12": "1", "TMFBit14": "1", "TMFBit15": "1"})
+    ET.SubElement(tm80_elem, "Client", {"TMFBit0": "1", "TMFBit12": "1", "TMFBit14": "1", "TMFBit15": "1"})
+
+    # Default fill for the array
+    dfds_elem = root.find("./DFDS/Section")
+    df_elem = ET.SubElement(dfds_elem, "DataFill", {"TypeID": str(array_type_id)})
+    arr_elem = ET.SubElement(df_elem, "Array")
+    ET.SubElement(arr_elem, "dim").text = str(array_len)
+    values = [rnd.randint(-2**31, 2**31-1) for i in range(array_len)]
+    if 4 * array_len > STORE_AS_DATA_ABOVE:
+        # Large numeric arrays are stored as raw data block, like the extractor does
+        ET.SubElement(arr_elem, "Block").text = b''.join(val.to_bytes(4, byteorder='big', signed=True) for val in values).hex()
+    else:
+        for val in values:
+            ET.SubElement(arr_elem, "I32").text = str(val)
+
+def generateVI(work_path, po):
+    """ Generates synthetic VI file with large heap, many TDs and big default data.
+    """
+    rnd = random.Random(po.seed)
+    xml_fname = extractTemplate(TEMPLATE_VI, os.path.join(work_path, "gen_vi"))
+    fname_base = os.path.splitext(xml_fname)[0]
+    scaleHeapXML(fname_base + "_FPHb.xml", po.heap_nodes, rnd)
+    tree = ET.parse(xml_fname, parser=ET.XMLParser(target=ET.CommentedTreeBuilder()))
+    scaleMainXML(tree.getroot(), po.typedescs, po.array_len, rnd)
+    ET.pretty_element_tree_heap(tree.getroot())
+    tree.write(xml_fname, encoding='utf-8', xml_declaration=True)
+    rsrc_fname = os.path.join(work_path, "synth_vi.vi")
+    runTool(readRSRC_main, ["-c", "-m", xml_fname, "-i", rsrc_fname])
+    return rsrc_fname
+
+def generateLLB(work_path, po):
+    """ Generates synthetic LLB file with many entries.
+
+    Entries are copies of template VI file, stored within uncompressed resource file block.
+    """
+    xml_fname = extractTemplate(TEMPLATE_LLB, os.path.join(work_path, "gen_llb"))
+    fname_base = os.path.splitext(xml_fname)[0]
+    tree = ET.parse(xml_fname, parser=ET.XMLParser(target=ET.CommentedTreeBuilder()))
+    root = tree.getroot()
+    block_elem = ET.SubElement(root, "UCRF")
+    for i in range(po.llb_entries):
+        entry_fname = "{:s}_UCRF{:d}.vi".format(fname_base, i)
+        shutil.copyfile(TEMPLATE_VI, entry_fname)
+        ET.SubElement(block_elem, "Section", {"Index": str(i), "Name": "entry{:04d}.vi".format(i),
+            "Format": "bin", "File": os.path.basename(entry_fname)})
+    ET.pretty_element_tree_heap(root)
+    tree.write(xml_fname, encoding='utf-8', xml_declaration=True)
+    rsrc_fname = os.path.join(work_path, "synth_llb.llb")
+    runTool(readRSRC_main, ["-c", "-m", xml_fname, "-i", rsrc_fname])
+    return rsrc_fname
+
+def benchFile(rsrc_fname, work_path, repeat):
+    """ Measures best time of each command on given RSRC file.
+
+    The fix command is only measured for VIs, as it does not support libraries.
+    """
+    fname_base = os.path.splitext(os.path.basename(rsrc_fname))[0]
+    xml_fname = os.path.join(work_path, fname_base + "_extr", fname_base + ".xml")
+    os.makedirs(os.path.dirname(xml_fname), exist_ok=True)
+    out_fname = os.path.join(work_path, fname_base + "_out" + os.path.splitext(rsrc_fname)[1])
+    is_library = os.path.splitext(rsrc_fname)[1].lower() == ".llb"
+    commands = {
+        "list": (readRSRC_main, ["-l", "-i", rsrc_fname]),
+        "extract": (readRSRC_main, ["-x", "-i", rsrc_fname, "-m", xml_fname] + (["--keep-names"] if is_library else [])),
+        "create": (readRSRC_main, ["-c", "-m", xml_fname, "-i", out_fname]),
+    }
+    if not is_library:
+        commands["fix"] = (modRSRC_main, ["-f", "-m", xml_fname])
+    results = {}
+    for command in BENCH_COMMANDS:
+        if command not in commands:
+            continue
+        tool_main, args = commands[command]
+        results[command] = min(timeit.repeat(lambda: runTool(tool_main, args), number=1, repeat=repeat))
+    return results
+
+def compareResults(results, baseline, tolerance):
+    """ Compares results with baseline; returns list of regressions found.
+    """
+    regressions = []
+    for fname, file_results in results.items():
+        for command, seconds in file_results.items():
+            base_seconds = baseline.get(fname, {}).get(command)
+            if base_seconds is None:
+                continue
+            if seconds > base_seconds * (1.0 + tolerance):
+                regressions.append((fname, command, base_seconds, seconds))
+    return regressions
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--heap-nodes', default=5000, type=int,
+            help="amount of nodes to add to front panel heap (default is %(default)s)")
+
+    parser.add_argument('--typedescs', default=2000, type=int,
+            help="amount of Type Descriptors to add to VCTP (default is %(default)s)")
+
+    parser.add_argument('--array-len', default=100000, type=int,
+            help="amount of elements in default fill array (default is %(default)s)")
+
+    parser.add_argument('--llb-entries', default=200, type=int,
+            help="amount of entries within the LLB file (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    parser.add_argument('-r', '--repeat', default=3, type=int,
+            help="number of repetitions; best time is reported (default is %(default)s)")
+
+    parser.add_argument('-w', '--workdir', default=None, type=str,
+            help="directory to store generated files in; if not provided," \
+            " temporary directory is used and removed at end")
+
+    parser.add_argument('--save', default=None, type=str, metavar='FILE',
+            help="store the results in given JSON file, to be used as baseline")
+
+    parser.add_argument('--baseline', default=None, type=str, metavar='FILE',
+            help="compare the results with baseline from given JSON file;" \
+            " exit with error if any command became slower")
+
+    parser.add_argument('--tolerance', default=0.2, type=float,
+            help="ratio by which a command may be slower than the baseline" \
+            " before it is treated as regression (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        if po.workdir is not None:
+            work_path = po.workdir
+            os.makedirs(work_path, exist_ok=True)
+        else:
+            work_path = stack.enter_context(tempfile.TemporaryDirectory(prefix="bench_rsrc_"))
+
+        vi_fname = generateVI(work_path, po)
+        llb_fname = generateLLB(work_path, po)
+
+        results = {}
+        print("{:16s}\t{:>10s}\t{:>10s}\t{:>10s}\t{:>10s}\t{:>10s}".format("file", "size kB", *BENCH_COMMANDS))
+        for rsrc_fname in (vi_fname, llb_fname):
+            fname = os.path.basename(rsrc_fname)
+            results[fname] = benchFile(rsrc_fname, work_path, po.repeat)
+            print("{:16s}\t{:10.1f}\t{:>10s}".format(fname, os.path.getsize(rsrc_fname) / 1024,
+              "\t".join("{:10.3f}".format(results[fname][command]) if command in results[fname] else "{:>10s}".format("-")
+                for command in BENCH_COMMANDS)))
+
+    # Results are only comparable if the files were generated the same way
+    options = { name: getattr(po, name) for name in ('heap_nodes', 'typedescs', 'array_len', 'llb_entries', 'seed',) }
+
+    if po.save is not None:
+        with open(po.save, "w", encoding='utf-8') as save_fh:
+            json.dump({ "Options": options, "Results": results }, save_fh, indent=1)
+
+    if po.baseline is not None:
+        with open(po.baseline, "r", encoding='utf-8') as base_fh:
+            baseline = json.load(base_fh)
+        if baseline.get("Options") != options:
+            raise ValueError("Baseline was measured on files generated with different options: {}"
+              .format(baseline.get("Options")))
+        regressions = compareResults(results, baseline["Results"], po.tolerance)
+        for fname, command, base_seconds, seconds in regressions:
+            print("Regression: {:s} {:s} took {:.3f} s, baseline {:.3f} s".format(fname, command, seconds, base_seconds))
+        if len(regressions) > 0:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
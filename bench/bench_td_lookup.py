@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of consolidated type lookups.
+
+Loads a synthetic VI with many TDs, and for each TD, lists consolidated TDs
+of the same type and finds its Top Level index; the way scripts walking all
+controls of a VI do. Measures time of linear scans over VCTP, and of the
+indexed lookups.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import time
+import argparse
+import tempfile
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+from bench_rsrc import generateVI
+from bench_heap_memory import prepareVIOptions, loadVI
+
+
+def enumerateLinear(vi, mainType=None, fullType=None):
+    """ Lists consolidated TDs by checking each entry; the previous implementation.
+    """
+    VCTP = vi.get_or_raise('VCTP')
+    typeList = VCTP.getContent()
+    out_list = []
+    for conn_idx, clientTD in enumerate(typeList):
+        if mainType is not None and clientTD.nested.mainType() != mainType:
+            continue
+        if fullType is not None and clientTD.nested.fullType() != fullType:
+            continue
+        out_list.append( (len(out_list), conn_idx, clientTD.nested,) )
+    return out_list
+
+def topIndexLinear(vi, flatIdx):
+    topLevel = vi.get_or_raise('VCTP').getSection().topLevel
+    if flatIdx not in topLevel:
+        return None
+    return topLevel.index(flatIdx) + 1
+
+def walkTypes(vi, enumerateTDs, topIndexOf):
+    results = []
+    for _, flatIdx, td in enumerateTDs(vi):
+        sameTypeTDs = enumerateTDs(vi, fullType=td.fullType())
+        sameMainTDs = enumerateTDs(vi, mainType=td.mainType())
+        results.append( (len(sameTypeTDs), len(sameMainTDs), topIndexOf(vi, flatIdx),) )
+    return results
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--typedescs', default=2000, type=int,
+            help="amount of type descriptors in the cluster (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    po = parser.parse_args()
+    # Only the type descriptors are scaled up
+    po.heap_nodes = 0
+    po.array_len = 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_td_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        vi = loadVI(prepareVIOptions(rsrc_fname), rsrc_fname)
+
+    start_time = time.perf_counter()
+    linResults = walkTypes(vi, enumerateLinear, topIndexLinear)
+    linTime = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    idxResults = walkTypes(vi, lambda vi, **kwargs: vi.consolidatedTDEnumerate(**kwargs),
+      lambda vi, flatIdx: vi.consolidatedTDTopIndex(flatIdx))
+    idxTime = time.perf_counter() - start_time
+    if linResults != idxResults:
+        raise RuntimeError("Indexed lookups differ from linear ones")
+    print("{:d} TDs walked: linear {:.3f} s, indexed {:.3f} s".format(len(linResults), linTime, idxTime))
+
+if __name__ == "__main__":
+    main()
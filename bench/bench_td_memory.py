@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of memory used by Type Descriptors and Data Fills.
+
+Loads a synthetic VI with a Cluster of many Type Descriptors, and measures
+memory used by the parsed VCTP, and by Data Fill of the large Cluster.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import gc
+import sys
+import argparse
+import tempfile
+import tracemalloc
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVmisc as LV
+import pylabview.LVdatatype as LVdatatype
+import pylabview.LVdatafill as LVdatafill
+from bench_rsrc import generateVI
+from bench_heap_memory import prepareVIOptions, loadVI
+
+
+def countDataFills(df):
+    count = 1
+    if isinstance(df.value, list):
+        for sub_df in df.value:
+            if isinstance(sub_df, LVdatafill.DataFill):
+                count += countDataFills(sub_df)
+    return count
+
+def measureTypeDescMemory(vi):
+    """ Returns amount of TDs in VCTP, and memory used by them after parsing.
+
+    The VCTP is parsed again, after releasing TDs parsed while loading the VI.
+    """
+    VCTP = vi.get_or_raise('VCTP')
+    section = VCTP.getSection()
+    section.content = []
+    section.topLevel = []
+    section.raw_data_updated = True
+    gc.collect()
+    tracemalloc.start()
+    start_mem, _ = tracemalloc.get_traced_memory()
+    typeList = VCTP.getContent()
+    end_mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(typeList), end_mem - start_mem
+
+def measureDataFillMemory(vi):
+    """ Returns amount of Data Fills in default value of the largest Cluster, and memory used by them.
+    """
+    VCTP = vi.get_or_raise('VCTP')
+    clusterTD = None
+    for clientTD in VCTP.getContent():
+        td = clientTD.nested
+        if td.fullType() == LVdatatype.TD_FULL_TYPE.Cluster:
+            if clusterTD is None or len(td.clients) > len(clusterTD.clients):
+                clusterTD = td
+    # All items are numeric, so zeros are valid data of sufficient size
+    bldata = LV.BinaryReader(bytes(8 * len(clusterTD.clients)))
+    blockref = ('DFDS', 0,)
+    gc.collect()
+    tracemalloc.start()
+    start_mem, _ = tracemalloc.get_traced_memory()
+    df = LVdatafill.newDataFillObjectWithTD(vi, blockref, clusterTD.index, 0, clusterTD, vi.po)
+    df.initWithRSRC(bldata)
+    end_mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return countDataFills(df), end_mem - start_mem
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--typedescs', default=5000, type=int,
+            help="amount of type descriptors in the cluster (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    po = parser.parse_args()
+    # Only the type descriptors are scaled up
+    po.heap_nodes = 0
+    po.array_len = 0
+
+    with tempfile.TemporaryDirectory(prefix="bench_td_") as work_path:
+        rsrc_fname = generateVI(work_path, po)
+        vi = loadVI(prepareVIOptions(rsrc_fname), rsrc_fname)
+
+    td_count, td_mem = measureTypeDescMemory(vi)
+    df_count, df_mem = measureDataFillMemory(vi)
+    print("{:>12s}\t{:>12s}\t{:>12s}\t{:>12s}".format("objects", "count", "memory B", "per object B"))
+    print("{:>12s}\t{:12d}\t{:12d}\t{:12.1f}".format("TypeDescs", td_count, td_mem, td_mem / td_count))
+    print("{:>12s}\t{:12d}\t{:12d}\t{:12.1f}".format("DataFills", df_count, df_mem, df_mem / df_count))
+
+if __name__ == "__main__":
+    main()
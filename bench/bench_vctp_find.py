@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Benchmark of finding equivalent TDs in VCTP XML.
+
+Creates XML VCTP section with many Flat TDs, and measures time of finding
+or adding TDs by comparing with each Flat TD, and with hash lookup used by
+VCTP_find_or_add_TypeDesc_copy().
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import time
+import random
+import argparse
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVxml as ET
+import pylabview.modRSRC as modRSRC
+
+
+TD_LEAF_TYPES = ("NumInt8", "NumInt16", "NumInt32", "NumFloat64", "Boolean", "String",)
+
+def newTypeDesc(parent, tdType, label, clientIDs):
+    typeDesc = ET.SubElement(parent, "TypeDesc")
+    typeDesc.set("Type", tdType)
+    typeDesc.set("Label", label)
+    for flatTypeID in clientIDs:
+        subTypeDesc = ET.SubElement(typeDesc, "TypeDesc")
+        subTypeDesc.set("TypeID", str(flatTypeID))
+    return typeDesc
+
+def randomTypeDesc(parent, rnd, flatCount):
+    """ Adds random leaf TD or Cluster of earlier TDs to parent element.
+    """
+    label = "td{:d}".format(rnd.randrange(8))
+    if flatCount < 8 or rnd.random() < 0.75:
+        return newTypeDesc(parent, rnd.choice(TD_LEAF_TYPES), label, ())
+    clientIDs = [rnd.randrange(flatCount) for i in range(rnd.randint(2, 6))]
+    return newTypeDesc(parent, "Cluster", label, clientIDs)
+
+def findOrAddLinear(RSRC, fo, po, srcTypeDesc, VCTP):
+    """ Finds equivalent TD by comparing with each Flat TD; the previous implementation.
+    """
+    VCTP_FlatTypeDescList = VCTP.findall("./TypeDesc")
+    for cmpTypeID, cmpTypeDesc in enumerate(VCTP_FlatTypeDescList):
+        if modRSRC.TypeDesc_equivalent(RSRC, fo, po, cmpTypeDesc, srcTypeDesc, VCTP_FlatTypeDescList, sameLabels=True):
+            return cmpTypeDesc, cmpTypeID
+    return modRSRC.VCTP_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=VCTP)
+
+def runSearches(po, findOrAdd):
+    rnd = random.Random(po.seed)
+    RSRC = ET.Element("RSRC")
+    VCTP = ET.SubElement(ET.SubElement(RSRC, "VCTP"), "Section")
+    for i in range(po.typedescs):
+        randomTypeDesc(VCTP, rnd, i)
+    ET.SubElement(VCTP, "TopLevel")
+    opts = argparse.Namespace(xml="bench.xml", verbose=0)
+    foundIDs = []
+    start_time = time.perf_counter()
+    for i in range(po.searches):
+        srcTypeDesc = randomTypeDesc(ET.Element("VCTP"), rnd, po.typedescs)
+        _, dstTypeID = findOrAdd(RSRC, [], opts, srcTypeDesc, VCTP)
+        foundIDs.append(dstTypeID)
+    return foundIDs, time.perf_counter() - start_time
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('--typedescs', default=4000, type=int,
+            help="amount of flat type descriptors in VCTP (default is %(default)s)")
+
+    parser.add_argument('--searches', default=500, type=int,
+            help="amount of TDs to find or add (default is %(default)s)")
+
+    parser.add_argument('--seed', default=8320, type=int,
+            help="seed for random content generation (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    linIDs, linTime = runSearches(po, findOrAddLinear)
+    idxIDs, idxTime = runSearches(po, modRSRC.VCTP_find_or_add_TypeDesc_copy)
+    assert linIDs == idxIDs, "Indexed search gave different TDs than linear one"
+    print("{:d} searches in {:d} TDs: linear {:.3f} s, indexed {:.3f} s"\
+      .format(po.searches, po.typedescs, linTime, idxTime))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Micro-benchmark of XOR8320 cipher engines.
+
+Measures throughput of encryption and decryption for each available engine,
+on data of size similar to large XOR-coded blocks.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import random
+import timeit
+import argparse
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVmisc as LV
+
+
+def prepareData(size, seed=8320):
+    rnd = random.Random(seed)
+    return bytes(rnd.getrandbits(8) for i in range(size))
+
+def benchEngine(engine, data, repeat):
+    enc_data = LV.crypto_xor8320_encrypt(data, engine=engine)
+    t_enc = min(timeit.repeat(lambda: LV.crypto_xor8320_encrypt(data, engine=engine), number=1, repeat=repeat))
+    t_dec = min(timeit.repeat(lambda: LV.crypto_xor8320_decrypt(enc_data, engine=engine), number=1, repeat=repeat))
+    return t_enc, t_dec
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('-s', '--size', default=1024*1024, type=int,
+            help="size of plain data, in bytes (default is %(default)s)")
+
+    parser.add_argument('-r', '--repeat', default=3, type=int,
+            help="number of repetitions; best time is reported (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    data = prepareData(po.size)
+    print("{:10s}\t{:>14s}\t{:>14s}".format("engine","encrypt MB/s","decrypt MB/s"))
+    for engine in LV.XOR8320_ENGINES:
+        t_enc, t_dec = benchEngine(engine, data, po.repeat)
+        print("{:10s}\t{:14.2f}\t{:14.2f}".format(engine, len(data) / t_enc / 1e6, len(data) / t_dec / 1e6))
+
+if __name__ == "__main__":
+    main()
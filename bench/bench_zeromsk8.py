@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+""" Micro-benchmark of ZeroMask8 compression engines.
+
+Measures throughput of compression and decompression for each available engine.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import sys
+import random
+import timeit
+import argparse
+
+if __name__ == "__main__":
+    # allow execution from CWD, without package install
+    sys.path.insert(0, './')
+
+import pylabview.LVmisc as LV
+
+
+def prepareData(size, zeros_ratio, seed=8320):
+    rnd = random.Random(seed)
+    return bytes(0 if rnd.random() < zeros_ratio else rnd.randint(1, 255) for i in range(size))
+
+def benchEngine(engine, data, repeat):
+    comp_data = LV.zcomp_zeromsk8_compress(data, engine=engine)
+    t_comp = min(timeit.repeat(lambda: LV.zcomp_zeromsk8_compress(data, engine=engine), number=1, repeat=repeat))
+    t_decomp = min(timeit.repeat(lambda: LV.zcomp_zeromsk8_decompress(comp_data, len(data), engine=engine), number=1, repeat=repeat))
+    return t_comp, t_decomp
+
+def main():
+    """ Main executable function.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('-s', '--size', default=1024*1024, type=int,
+            help="size of uncompressed data, in bytes (default is %(default)s)")
+
+    parser.add_argument('-z', '--zeros', default=0.6, type=float,
+            help="ratio of zero bytes within the data (default is %(default)s)")
+
+    parser.add_argument('-r', '--repeat', default=3, type=int,
+            help="number of repetitions; best time is reported (default is %(default)s)")
+
+    po = parser.parse_args()
+
+    data = prepareData(po.size, po.zeros)
+    print("{:10s}\t{:>14s}\t{:>14s}".format("engine","compress MB/s","decompress MB/s"))
+    for engine in LV.ZEROMSK8_ENGINES:
+        t_comp, t_decomp = benchEngine(engine, data, po.repeat)
+        print("{:10s}\t{:14.2f}\t{:14.2f}".format(engine, len(data) / t_comp / 1e6, len(data) / t_decomp / 1e6))
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,7 @@ import pylabview.LVmisc as LV
 from pylabview.LVmisc import eprint, isSmallerVersion, isGreaterOrEqVersion, RSRCStructure, \
     getPrettyStrFromRsrcType, getRsrcTypeFromPrettyStr, importXMLBitfields, exportXMLBitfields
 import pylabview.LVxml as ET
+import pylabview.LVlookup as LVlookup
 import pylabview.LVdatatype as LVdatatype
 import pylabview.LVinstrument as LVinstrument
 import pylabview.LVclasses as LVclasses
@@ -123,11 +124,153 @@ class Section(object):
         self.name_text = None
         # Section name object, in case it's not a simple text
         self.name_obj = None
+        # Whether parsing and integration of this section was deferred until first access
+        self.parse_pending = False
+
+
+class HeapSection(Section):
+    def __init__(self, vi, po):
+        """ Create new HeapSection object, a Section which stores Heap Nodes.
+
+        The nodes can be stored as list of HeapNode objects, or in compact form
+        as HeapColumns; in the latter case, the objects list is created from
+        the columns on first access.
+        """
+        super().__init__(vi, po)
+        # List of Heap Nodes; None if not created from heap_columns yet
+        self._objects = []
+        # Compact storage of Heap Nodes, if used
+        self.heap_columns = None
+        # Index of Heap Nodes
+        self.heap_index = None
+        # Whether only nodes marked as updated are re-encoded on save
+        self.delta_update = False
+        # Binary data of the Heap Nodes, for delta update; created on first update
+        self.heap_cache = None
+
+    def hasObjects(self):
+        """ Whether list of Heap Nodes exists, rather than only compact storage
+        """
+        return (self._objects is not None)
+
+    @property
+    def objects(self):
+        if self._objects is None:
+            columns = self.heap_columns
+            self._objects = columns.createNodes(self)
+            columns.objects = self._objects
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects):
+        self._objects = objects
+        self.heap_index = None
+
+
+class DFDSSection(Section):
+    def __init__(self, vi, po):
+        """ Create new DFDSSection object, a Section which stores Default Fill of Data Space.
+
+        The Data Fills can be parsed all at once, or each on first access to it;
+        in the latter case, only positions of the Data Fills within section data
+        are stored until then.
+        """
+        super().__init__(vi, po)
+        self.parse_failed = False
+        # List of Data Fills; those not parsed yet are None
+        self._content = []
+        # Type Map entries and positions of the Data Fills, if their parsing is deferred
+        self.df_index = None
+        # Plain data of the section, if parsing of the Data Fills is deferred
+        self.df_data = None
+
+    def hasContent(self):
+        """ Whether all Data Fills are parsed
+        """
+        return all(df is not None for df in self._content)
+
+    def dataFillsCount(self):
+        """ Gives amount of Data Fills, including the ones not parsed yet
+        """
+        return len(self._content)
+
+    def parseRSRCDataFill(self, blockref, tmEntry, defDataType, bldata):
+        """ Creates Data Fill for given Type Map entry, and parses it from given data
+        """
+        if defDataType == 1:
+            try:
+                df = LVdatafill.newSpecialDSTMClusterWithTD(self.vi, blockref,
+                                                            tmEntry.index, tmEntry.flags, tmEntry.td, self.po)
+                df.initWithRSRC(bldata)
+            except Exception as e:
+                tdType = tmEntry.td.fullType()
+                raise RuntimeError("Special DSTM {}: {}".format(LV.enumOrIntToName(tdType), str(e)))
+        else:
+            try:
+                df = LVdatafill.newDataFillObjectWithTD(self.vi, blockref,
+                                                        tmEntry.index, tmEntry.flags, tmEntry.td, self.po)
+                df.initWithRSRC(bldata)
+            except Exception as e:
+                tdType = tmEntry.td.fullType()
+                raise RuntimeError("Data type {}: {}".format(LV.enumOrIntToName(tdType), str(e)))
+        return df
+
+    def getDataFill(self, df_idx):
+        """ Gives Data Fill of given index, parsing it if that was deferred
+        """
+        df = self._content[df_idx]
+        if df is None:
+            dfEntry = self.df_index[df_idx]
+            bldata = LV.BinaryReader(self.df_data)
+            bldata.seek(dfEntry.start)
+            df = self.parseRSRCDataFill(dfEntry.blockref, dfEntry.tmEntry, dfEntry.defDataType, bldata)
+            self._content[df_idx] = df
+        return df
+
+    def getDataFillRSRCData(self, df_idx):
+        """ Gives binary data of Data Fill of given index
+
+        If parsing of the Data Fill was deferred, its original data is returned.
+        """
+        df = self._content[df_idx]
+        if df is None:
+            dfEntry = self.df_index[df_idx]
+            return self.df_data[dfEntry.start:dfEntry.end]
+        return df.prepareRSRCData()
+
+    def getDataFillRSRCSize(self, df_idx):
+        """ Gives size of binary data of Data Fill of given index, or None if unknown
+        """
+        df = self._content[df_idx]
+        if df is None:
+            dfEntry = self.df_index[df_idx]
+            return dfEntry.end - dfEntry.start
+        return df.expectedRSRCSize()
+
+    @property
+    def content(self):
+        if self.df_index is not None:
+            for df_idx, df in enumerate(self._content):
+                if df is None:
+                    self.getDataFill(df_idx)
+            # All Data Fills are parsed, so positions and data are no longer needed
+            self.df_index = None
+            self.df_data = None
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+        self.df_index = None
+        self.df_data = None
 
 
 class Block(object):
     """ Generic block
     """
+    # Class of sections within the block
+    section_class = Section
+
     def __init__(self, vi, po):
         """ Creates new Block object, capable of retrieving Block data.
         """
@@ -151,7 +294,7 @@ class Block(object):
 
         To be overloaded for setting any initial properties, if neccessary.
         """
-        section = Section(self.vi, self.po)
+        section = self.section_class(self.vi, self.po)
         return section
 
     def appendPrintMapEntry(self, section, relative_end_pos, entry_len, entry_align, sub_name):
@@ -446,7 +589,11 @@ class Block(object):
                     raise IOError("Out of block/container data in {} ({:d} + {:d}) > {:d}"
                                   .format(self.ident, sum_size, blksect.size, self.size))
 
-                data = fh.read(blksect.size)
+                if hasattr(fh, 'readview'):
+                    # Memory-mapped input gives a slice of the file instead of a copy
+                    data = fh.readview(blksect.size)
+                else:
+                    data = fh.read(blksect.size)
                 section.raw_data = data
                 section.raw_data_updated = True
                 if self.po.print_map == "RSRC":
@@ -553,17 +700,39 @@ class Block(object):
         else:
             self.active_section_num = section_num
 
+        self.parsePendingData(section_num=section_num)
         if self.needParseData(section_num=section_num):
             section = self.sections[section_num]
             if self.vi.dataSource == "rsrc" or self.hasRawData(section_num=section_num):
                 bldata = self.getData(section_num=section_num)
-                self.parseRSRCData(section_num, bldata)
+                with LV.StatsPhase(self.po.stats, "parseRSRCData", self.ident) as sp:
+                    sp.bytes_in = section.last_plain_data_size
+                    self.parseRSRCData(section_num, bldata)
                 section.raw_data_updated = False
             elif self.vi.dataSource == "xml":
-                self.parseXMLData(section_num=section_num)
+                with LV.StatsPhase(self.po.stats, "parseXMLData", self.ident):
+                    self.parseXMLData(section_num=section_num)
                 section.parsed_data_updated = False
         pass
 
+    def parsePendingData(self, section_num=None):
+        """ Parse and integrate section which parsing was deferred
+
+        In lazy mode, sections are not parsed while the file is read; instead, they
+        are marked as pending and parsed on first access to their properties.
+        Blocks this one depends on are then parsed on demand, by the same mechanism.
+        """
+        if section_num is None:
+            section_num = self.active_section_num
+        section = self.sections.get(section_num)
+        if section is None or not section.parse_pending:
+            return
+        # Clear the flag first, as parsing may access properties of this section
+        section.parse_pending = False
+        self.parseData(section_num=section_num)
+        with LV.StatsPhase(self.po.stats, "integrateData", self.ident):
+            self.integrateData(section_num=section_num)
+
     def integrateData(self, section_num=None):
         """ Integrate data of specific section with other blocks
 
@@ -626,7 +795,8 @@ class Block(object):
         """ Retrieve file stream with raw data of specific section of this block
 
         This will return raw data buffer, uncompressed and decrypted if neccessary,
-        and wrapped by BytesIO.
+        and wrapped by BinaryReader, which is compatible with BytesIO. Coded data is
+        passed to decoders as slices of the raw buffer, so only the decoded result gets wrapped.
 
         :param int section_num: Section for which the raw data buffer will be returned.
             If not provided, active section will be assumed.
@@ -634,43 +804,51 @@ class Block(object):
         if section_num is None:
             section_num = self.active_section_num
         raw_data_section = self.getRawData(section_num)
-        data = io.BytesIO(raw_data_section)
+        with LV.StatsPhase(self.po.stats, "getData", self.ident, bytes_in=len(raw_data_section)) as sp:
+            data, usize = self.decodeRawData(raw_data_section, section_num, use_coding)
+            sp.bytes_out = usize
+        section = self.sections[section_num]
+        section.last_plain_data_size = usize
+        return data
+
+    def decodeRawData(self, raw_data_section, section_num, use_coding):
+        """ Decodes raw data of a section; returns BinaryReader with plain data, and its size
+        """
         if use_coding == BLOCK_CODING.NONE:
             usize = len(raw_data_section)
+            data = LV.BinaryReader(raw_data_section)
         elif use_coding == BLOCK_CODING.COMP:
             size = len(raw_data_section) - 4
             if size < 2:
                 raise IOError("Unable to decompress block {} section {}: "
                               "block-size-error - size: {}".format(self.ident, section_num, size))
-            usize = int.from_bytes(data.read(4), byteorder='big', signed=False)
+            usize = int.from_bytes(raw_data_section[:4], byteorder='big', signed=False)
             # Every 8 bytes result in at least one mask byte, so ratio is 9/8 to 8/1, and up to 7 bytes of input padded
             if (usize > size * 8 or (usize+7) < (size * 8) // 9):
                 raise IOError("Unable to decompress block {} section {}: "
                               "uncompress-size-error - size: {} - uncompress-size: {}"
                               .format(self.ident, section_num, size, usize))
-            data = io.BytesIO(LV.zcomp_zeromsk8_decompress(data.read(size), usize))
+            data = LV.BinaryReader(LV.zcomp_zeromsk8_decompress(memoryview(raw_data_section)[4:], usize))
         elif use_coding == BLOCK_CODING.ZLIB:
             size = len(raw_data_section) - 4
             if size < 2:
                 raise IOError("Unable to decompress block {} section {}: "
                               "block-size-error - size: {}".format(self.ident, section_num, size))
-            usize = int.from_bytes(data.read(4), byteorder='big', signed=False)
+            usize = int.from_bytes(raw_data_section[:4], byteorder='big', signed=False)
             # Acording to zlib docs, max theoretical compression ration is 1032:1
             if ((size > 16) and (usize < (size*5) // 10)) or \
                ((size > 128) and (usize < (size*9) // 10)) or (usize > size * 1032):
                 raise IOError("Unable to decompress block {} section {}: "
                               "uncompress-size-error - size: {} - uncompress-size: {}"
                               .format(self.ident, section_num, size, usize))
-            data = io.BytesIO(zlib.decompress(data.read(size)))
+            data = LV.BinaryReader(zlib.decompress(memoryview(raw_data_section)[4:]))
         elif use_coding == BLOCK_CODING.XOR:
             size = len(raw_data_section)
             usize = size
-            data = io.BytesIO(LV.crypto_xor8320_decrypt(data.read(size)))
+            data = LV.BinaryReader(LV.crypto_xor8320_decrypt(raw_data_section))
         else:
             raise ValueError("Unsupported compression type")
-        section = self.sections[section_num]
-        section.last_plain_data_size = usize
-        return data
+        return data, usize
 
     def setData(self, data_buf, section_num=None, use_coding=BLOCK_CODING.NONE):
         """ Set raw data of specific section of this block
@@ -911,6 +1089,8 @@ class Block(object):
             section_num = object.__getattribute__(self, 'active_section_num')
             section = object.__getattribute__(self, 'sections')[section_num]
             if hasattr(section, name):
+                if section.parse_pending:
+                    self.parseData(section_num=section_num)
                 return getattr(section, name)
         except (AttributeError, IndexError, KeyError):
             pass
@@ -1045,6 +1225,14 @@ class CompleteBlock(Block):
     def initWithImageSectionData(self, section, section_elem, image, block_fh):
         raise NotImplementedError("Inintialization from Image is not implemented")
 
+    def initWithXMLSectionFile(self, section, xml_fname):
+        """ Initialize section data from separate XML file
+
+        Loads the whole XML tree from file, then initializes the section with it.
+        """
+        tree = ET.parse(xml_fname)
+        self.initWithXMLSectionData(section, tree.getroot())
+
     def initWithXMLSection(self, section, section_elem):
         snum = section.start.section_idx
         section.parse_failed = False
@@ -1064,11 +1252,10 @@ class CompleteBlock(Block):
             else:
                 xml_fname = section_elem.get("File")
             try:
-                tree = ET.parse(xml_fname)
-            except Exception as e:
+                self.initWithXMLSectionFile(section, xml_fname)
+            except (ET.ParseError, OSError,) as e:
                 section.parse_failed = True
                 raise RuntimeError("XML file '{}' parsing exception: {}".format(section_elem.get("File"), str(e)))
-            self.initWithXMLSectionData(section, tree.getroot())
         elif fmt == "png":  # Format="png" - the content is stored separately as image file
             if (self.po.verbose > 2):
                 print("{:s}: For Block {} section {:d}, reading PNG file '{}'"
@@ -1107,6 +1294,19 @@ class CompleteBlock(Block):
     def exportImageSectionData(self, section_elem, block_fh, section_num, section, fname_base):
         raise NotImplementedError("Export of image is not implemented")
 
+    def exportXMLSectionFile(self, block_fh, section_num, section, fname_base):
+        """ Export section data as separate XML file, into given file handle
+
+        Creates the whole XML tree of the section, then writes it.
+        """
+        root = ET.Element("SectionRoot")
+        self.exportXMLSectionData(root, section_num, section, fname_base)
+
+        ET.pretty_element_tree_heap(root)
+
+        tree = ET.ElementTree(root)
+        tree.write(block_fh, encoding='utf-8', xml_declaration=True)
+
     def exportXMLSection(self, section_elem, section_num, section, fname_base):
         self.parseData(section_num=section_num)
 
@@ -1131,17 +1331,11 @@ class CompleteBlock(Block):
 
                 block_fname = "{:s}.{:s}".format(fname_base, "xml")
 
-                root = ET.Element("SectionRoot")
-                self.exportXMLSectionData(root, section_num, section, fname_base)
-
-                ET.pretty_element_tree_heap(root)
-
-                tree = ET.ElementTree(root)
                 with open(block_fname, "wb") as block_fh:
                     if (self.po.verbose > 1):
                         print("{}: Storing block {} section {:d} xml in '{}'"
                               .format(self.vi.src_fname, self.ident, section_num, block_fname))
-                    tree.write(block_fh, encoding='utf-8', xml_declaration=True)
+                    self.exportXMLSectionFile(block_fh, section_num, section, fname_base)
 
                 section_elem.set("Format", "xml")
                 section_elem.set("File", os.path.basename(block_fname))
@@ -2460,6 +2654,8 @@ class CLIv(LinkObjRefs):
 class DFDS(CompleteBlock):
     """ Default Fill of Data Space
     """
+    section_class = DFDSSection
+
     def createSection(self):
         section = super().createSection()
         section.parse_failed = False
@@ -2513,44 +2709,62 @@ class DFDS(CompleteBlock):
         section.content = []
         if isGreaterOrEqVersion(ver, 8,0,0,1):  # noqa: E231
             blockref = (self.ident, section.start.section_idx,)
+            if self.po.lazy:
+                # Only find positions of the Data Fills; they will be parsed on first access
+                self.parseRSRCSectionIndex(section, blockref, bldata)
+                return
+            content = []
             for tmEntry, defDataType in self.getTypeMapWithDefltData():
-                df = None
-                if defDataType == 0:
-                    try:
-                        df = LVdatafill.newDataFillObjectWithTD(self.vi, blockref,
-                                                                tmEntry.index, tmEntry.flags, tmEntry.td, self.po)
-                        section.content.append(df)
-                        df.initWithRSRC(bldata)
-                    except Exception as e:
-                        tdType = tmEntry.td.fullType()
-                        raise RuntimeError("Data type {}: {}".format(LV.enumOrIntToName(tdType), str(e)))
-                    pass
-                elif defDataType == 1:
-                    try:
-                        df = LVdatafill.newSpecialDSTMClusterWithTD(self.vi, blockref,
-                                                                    tmEntry.index, tmEntry.flags, tmEntry.td, self.po)
-                        section.content.append(df)
-                        df.initWithRSRC(bldata)
-                    except Exception as e:
-                        tdType = tmEntry.td.fullType()
-                        raise RuntimeError("Special DSTM {}: {}".format(LV.enumOrIntToName(tdType), str(e)))
-                    pass
+                if defDataType in (0, 1,):
+                    df = section.parseRSRCDataFill(blockref, tmEntry, defDataType, bldata)
+                    content.append(df)
+            section.content = content
         else:
             raise NotImplementedError("No support for the LV7.1 default data format")
         pass
 
+    def parseRSRCSectionIndex(self, section, blockref, bldata):
+        """ Stores positions of Data Fills within the data, for parsing them on first access
+
+        Sizes of the Data Fills are computed without parsing them where possible;
+        Data Fills which cannot be skipped that way are parsed immediately.
+        """
+        content = []
+        df_index = []
+        data_buf = bldata.getvalue()
+        for tmEntry, defDataType in self.getTypeMapWithDefltData():
+            if defDataType not in (0, 1,):
+                continue
+            df = None
+            start_pos = bldata.tell()
+            if defDataType != 0 or not LVdatafill.skipDataFillWithTD(self.vi, tmEntry.td, bldata, self.po) or \
+              bldata.tell() > len(data_buf):
+                bldata.seek(start_pos)
+                df = section.parseRSRCDataFill(blockref, tmEntry, defDataType, bldata)
+            dfEntry = SimpleNamespace()
+            dfEntry.blockref = blockref
+            dfEntry.tmEntry = tmEntry
+            dfEntry.defDataType = defDataType
+            dfEntry.start = start_pos
+            dfEntry.end = bldata.tell()
+            df_index.append(dfEntry)
+            content.append(df)
+        section.content = content
+        section.df_index = df_index
+        section.df_data = data_buf
+
     def prepareRSRCData(self, section_num):
         section = self.sections[section_num]
         data_buf = b''
-        for df in section.content:
-            data_buf += df.prepareRSRCData()
+        for df_idx in range(section.dataFillsCount()):
+            data_buf += section.getDataFillRSRCData(df_idx)
         return data_buf
 
     def expectedRSRCSize(self, section_num):
         section = self.sections[section_num]
         exp_whole_len = 0
-        for df in section.content:
-            df_len = df.expectedRSRCSize()
+        for df_idx in range(section.dataFillsCount()):
+            df_len = section.getDataFillRSRCSize(df_idx)
             if df_len is None:
                 exp_whole_len = None
                 break
@@ -2559,6 +2773,7 @@ class DFDS(CompleteBlock):
 
     def initWithXMLSectionDataFillTag(self, section, dftop_elem):
         blockref = (self.ident, section.start.section_idx,)
+        content = []
         for subelem in dftop_elem:
             if (subelem.tag == "SpecialDSTMCluster"):
                 # Special condition for special cluster - its type is just Cluster
@@ -2567,7 +2782,8 @@ class DFDS(CompleteBlock):
                 # Normal processing for everything else
                 df = LVdatafill.newDataFillObjectWithTag(self.vi, blockref, subelem.tag, self.po)
             df.initWithXML(subelem)
-            section.content.append(df)
+            content.append(df)
+        section.content.extend(content)
         pass
 
     def initWithXMLSectionData(self, section, section_elem):
@@ -2586,20 +2802,21 @@ class DFDS(CompleteBlock):
         super().initWithXMLLate()
         for snum in self.sections:
             section = self.sections[snum]
+            content = section.content
             df_idx = 0
             if not section.parse_failed:
                 for tmEntry, defDataType in self.getTypeMapWithDefltData():
                     df = None
                     if defDataType in (0, 1,):
-                        if df_idx >= len(section.content):
+                        if df_idx >= len(content):
                             raise AttributeError("Cannot apply Type Map to Default Fill; amounts of types exceed fills")
-                        df = section.content[df_idx]
+                        df = content[df_idx]
                         df_idx += 1
                         df.setTD(tmEntry.td, tmEntry.index, tmEntry.flags)
-                if df_idx != len(section.content):
+                if df_idx != len(content):
                     raise AttributeError("Cannot apply Type Map to Default Fill; amounts of types does not match")
             # Now all TDs are propagated
-            for df in section.content:
+            for df in content:
                 df.initWithXMLLate()
         pass
 
@@ -2630,7 +2847,7 @@ class DFDS(CompleteBlock):
 
     def getDataFill(self, df_idx, section_num=None):
         section = self.getParsedSection(section_num)
-        df = section.content[df_idx]
+        df = section.getDataFill(df_idx)
         return df
 
     def getDFForTD(self, td, section_num=None):
@@ -2645,6 +2862,13 @@ class DFDS(CompleteBlock):
 
     def getDFForTypeId(self, tdIndex, section_num=None):
         section = self.getParsedSection(section_num)
+        if section.df_index is not None:
+            # Find the Data Fill within index, so that only the one found gets parsed
+            for df_idx, dfEntry in enumerate(section.df_index):
+                if dfEntry.tmEntry.index != tdIndex:
+                    continue
+                return section.getDataFill(df_idx)
+            return None
         for df in section.content:
             if df.index != tdIndex:
                 continue
@@ -5048,16 +5272,87 @@ class HeapVerP(CompleteBlock):
 class HeapVerb(CompleteBlock):
     """ BD/FP Heap version b
     """
+    section_class = HeapSection
+
     def createSection(self):
         section = super().createSection()
         section.storage_format = "xml"
-        section.objects = []
         return section
 
     def setDefaultEncoding(self, section_num):
         section = self.sections[section_num]
         section.block_coding = BLOCK_CODING.ZLIB
 
+    def getHeapIndex(self, section_num=None):
+        """ Gives index of Heap Nodes within given section
+
+        The index is created on first use, and reflects the nodes at that time.
+        It is re-created if the list of objects was replaced, nodes were added
+        or removed, or a node was marked by HeapNode.markUpdated(). Nodes modified
+        in place without marking are not detected.
+        """
+        section = self.getParsedSection(section_num)
+        if section.heap_index is None or not section.heap_index.isValidFor(section.objects):
+            section.heap_index = LVheap.HeapIndex(section.objects)
+        return section.heap_index
+
+    def getHeapColumns(self, section_num=None):
+        """ Gives compact storage of Heap Nodes within given section
+
+        In compact heap mode, the storage is created while parsing, and Heap Node
+        objects are not created unless requested. Otherwise, it is created from
+        binary data of the nodes on first use. It is re-created if the list of objects
+        was replaced, nodes were added or removed, or a node was marked by
+        HeapNode.markUpdated(); same as the heap index.
+        """
+        if section_num is None:
+            section_num = self.active_section_num
+        section = self.getParsedSection(section_num)
+        if section.hasObjects():
+            heap_columns = section.heap_columns
+            if heap_columns is None or not heap_columns.isValidFor(section.objects):
+                data = self.prepareRSRCData(section_num)
+                heap_columns = LVheap.HeapColumns(LV.BinaryReader(data))
+                # Share the data, so that it's kept only once
+                heap_columns.data = data
+                heap_columns.objects = section.objects
+                section.heap_columns = heap_columns
+        return section.heap_columns
+
+    def findNodeByUid(self, uid, section_num=None):
+        """ Gives Heap Node with given uid, or None
+
+        If the heap is stored in compact form and Heap Node objects were not created,
+        gives position of the node within HeapColumns instead.
+        """
+        section = self.getParsedSection(section_num)
+        if not section.hasObjects():
+            i = section.heap_columns.findByUid(uid)
+            return i if i >= 0 else None
+        return self.getHeapIndex(section_num).findByUid(uid)
+
+    def findNodesByClass(self, classEn, section_num=None):
+        """ Gives list of Heap Nodes with given class
+
+        If the heap is stored in compact form and Heap Node objects were not created,
+        gives positions of the nodes within HeapColumns instead.
+        """
+        section = self.getParsedSection(section_num)
+        if not section.hasObjects():
+            return section.heap_columns.findByClass(classEn)
+        return self.getHeapIndex(section_num).findByClass(classEn)
+
+    def findNodesByTag(self, tagEn, section_num=None):
+        """ Gives list of Heap Nodes with given tag
+
+        If the heap is stored in compact form and Heap Node objects were not created,
+        gives positions of the nodes within HeapColumns instead.
+        """
+        section = self.getParsedSection(section_num)
+        if not section.hasObjects():
+            return section.heap_columns.findByTag(tagEn)
+        return self.getHeapIndex(section_num).findByTag(tagEn)
+
     def getTopClassEn(self, section, obj_idx):
         """ Return classId of top object with class
 
@@ -5078,32 +5373,39 @@ class HeapVerb(CompleteBlock):
         i = obj_idx[-1]
         return section.objects[i]
 
-    def parseRSRCHeap(self, section, bldata, parentNode):
+    def parseRSRCHeap(self, section, bldata, parentNode, classStack):
+        """ Parses one Heap Node from RSRC data
+
+        The classStack contains top class of parentNode and all its parents,
+        so that tags can be resolved without traversing the parents.
+        """
         startPos = bldata.tell()
-        cmd = bldata.read(2)
+        cmd = bldata.readU16()
 
-        sizeSpec = (cmd[0] >> 5) & 7
-        hasAttrList = (cmd[0] >> 4) & 1
-        scopeInfo = (cmd[0] >> 2) & 3
-        rawTagId = cmd[1] | ((cmd[0] & 3) << 8)
+        sizeSpec = (cmd >> 13) & 7
+        hasAttrList = (cmd >> 12) & 1
+        scopeInfo = (cmd >> 10) & 3
+        rawTagId = cmd & 0x3FF
 
         if rawTagId == 1023:
-            tagId = int.from_bytes(bldata.read(4), byteorder='big', signed=True)
+            tagId = bldata.readS32()
         else:
             tagId = rawTagId - 31
 
         if scopeInfo == LVheap.NODE_SCOPE.TagClose and parentNode is not None:
             parentNode = parentNode.parent
+            classStack.pop()
 
-        tagEn = LVheap.tagIdToEnum(tagId, parentNode)
+        tagEn, nodeFactory = LVheap.resolveTagId(tagId, classStack[-1])
 
-        obj = LVheap.createObjectNode(self.vi, self.po, parentNode, tagEn, scopeInfo)
+        obj = nodeFactory(section, parentNode, tagEn, scopeInfo)
         section.objects.append(obj)
         if parentNode is not None:
             parentNode.childs.append(obj)
         obj.parseRSRCData(bldata, hasAttrList, sizeSpec)
         if scopeInfo == LVheap.NODE_SCOPE.TagOpen:
             parentNode = obj
+            classStack.append(LVheap.nodeTopClassEn(obj, classStack[-1]))
         dataLen = bldata.tell() - startPos
 
         # TODO Should we re-read the bytes and set raw data inside the obj?
@@ -5116,12 +5418,22 @@ class HeapVerb(CompleteBlock):
         section = self.sections[section_num]
 
         section.objects = []
+        section.heap_columns = None
+        section.heap_index = None
+        section.heap_cache = None
+        if self.po.compact_heap:
+            # Store the nodes in compact form; the objects will be created on first access
+            section.heap_columns = LVheap.HeapColumns(bldata)
+            section.objects = None
+            return
+
         content_len = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
 
         parentNode = None
+        classStack = [LVheap.SL_CLASS_TAGS.SL__oHExt]
         tot_len = 0
         while tot_len < content_len:
-            parentNode, entry_len = self.parseRSRCHeap(section, bldata, parentNode)
+            parentNode, entry_len = self.parseRSRCHeap(section, bldata, parentNode, classStack)
             if entry_len <= 0:
                 raise RuntimeError("Not enough raw data for complete heap")
             tot_len += entry_len
@@ -5129,62 +5441,134 @@ class HeapVerb(CompleteBlock):
         if parentNode is not None:
             eprint("{}: Warning: In block {}, heap did not closed all tags"
                    .format(self.vi.src_fname, self.ident))
-        pass
 
-    def prepareRSRCData(self, section_num):
-        section = self.sections[section_num]
-
-        for obj in section.objects:
-            if not obj.raw_data_updated:
-                obj.updateData()
-
-        data_buf = b''
-        for i, obj in enumerate(section.objects):
-            bldata = obj.getData()
-            data_buf += bldata.read()
+    def enableDeltaUpdate(self, section_num=None):
+        """ Enables re-encoding only modified Heap Nodes when the section is saved
 
-        data_buf = int(len(data_buf)).to_bytes(4, byteorder='big') + data_buf
-        return data_buf
+        By default, all nodes are re-encoded on each update of the section data.
+        With delta update enabled, binary data of the heap is cached on first update,
+        and later only nodes marked by HeapNode.markUpdated() are re-encoded.
+        Whoever enables it has to mark every node modified in place; adding, removing
+        or replacing nodes in the list is detected without marking.
+        """
+        section = self.getSection(section_num)
+        section.delta_update = True
 
-    def expectedRSRCSize(self, section_num):
-        section = self.sections[section_num]
-        exp_whole_len = 0
-        for obj in section.objects:
-            # TODO implement and use expected size
-            # exp_whole_len += obj.expectedRSRCSize()
-            bldata = obj.getData()
-            exp_whole_len += len(bldata.read())
-        exp_whole_len += 4
-        return exp_whole_len
+    def getHeapDataCache(self, section):
+        """ Gives cache of binary data for the section, or None if it is not valid
+        """
+        heap_cache = section.heap_cache
+        if heap_cache is None or not section.delta_update or not heap_cache.isValidFor(section.objects):
+            return None
+        return heap_cache
 
-    def initWithXMLHeap(self, section, elem, parentNode):
-        tagEn = LVheap.tagNameToEnum(elem.tag, parentNode)
-        if tagEn is None:
-            raise AttributeError("Unrecognized tag in heap XML; tag '{}', parent tag '{}'"
-                                 .format(elem.tag, parentNode.tagEn.name))
-        scopeInfo = LVheap.autoScopeInfoFromET(elem)
-        obj = LVheap.createObjectNode(self.vi, self.po, parentNode, tagEn, scopeInfo)
-        section.objects.append(obj)
-        if parentNode is not None:
-            parentNode.childs.append(obj)
+    def updateSectionData(self, section_num=None):
+        """ Update RAW data of the section, from properties of Heap Nodes
 
-        obj.initWithXML(elem)
+        If delta update is enabled, only modified nodes are re-encoded; and if no node
+        was modified, the raw data is left as it is, without re-compressing.
+        """
+        section = self.getSection(section_num)
+        if not section.hasObjects() and self.hasRawData(section_num):
+            return  # Nodes exist only in compact form, so they could not have been modified
+        if section.delta_update and self.hasRawData(section_num) and not section.parse_failed:
+            heap_cache = self.getHeapDataCache(section)
+            if heap_cache is not None:
+                data_changed = heap_cache.update()
+            else:
+                # Cache the data, and compare it with the data nodes were parsed from
+                heap_cache = LVheap.prepareHeapDataCache(section.objects)
+                section.heap_cache = heap_cache
+                data_changed = (heap_cache.data != self.getData(section_num).getvalue())
+            if not data_changed:
+                return
+        super().updateSectionData(section_num)
+        if not section.parse_failed:
+            # New raw data was prepared from the nodes, so there's no need to parse it again
+            section.raw_data_updated = False
 
-        for subelem in elem:
-            self.initWithXMLHeap(section, subelem, obj)
+    def prepareRSRCData(self, section_num):
+        section = self.sections[section_num]
+        if not section.delta_update:
+            return LVheap.prepareHeapRSRCData(section.objects)
+        heap_cache = self.getHeapDataCache(section)
+        if heap_cache is None:
+            section.heap_cache = LVheap.prepareHeapDataCache(section.objects)
+        else:
+            heap_cache.update()
+        return section.heap_cache.data
 
-        if obj.scopeInfo == LVheap.NODE_SCOPE.TagOpen.value:
-            scopeInfo = LVheap.NODE_SCOPE.TagClose.value
-            obj = LVheap.createObjectNode(self.vi, self.po, parentNode, tagEn, scopeInfo)
-            section.objects.append(obj)
-            if parentNode is not None:
-                parentNode.childs.append(obj)
-            # obj.initWithXML(elem)  # No init needed for closing tag
+    def expectedRSRCSize(self, section_num):
+        section = self.sections[section_num]
+        heap_cache = self.getHeapDataCache(section)
+        if heap_cache is not None:
+            return heap_cache.expectedSize()
+        return LVheap.expectedHeapRSRCSize(section.objects)
+
+    def initWithXMLHeapEvents(self, section, events):
+        """ Creates Heap Nodes from XML parse events of a heap section
+
+        The events are ("start", elem) and ("end", elem) tuples, as given by
+        ET.iterparse() or ET.iterwalk(); elements do not need to have children
+        attached. A node is created when the event after start of its element
+        arrives - only then text of the element is complete, and it is known
+        whether the element has children. Each stack entry stores the node,
+        top class for children of the node, and factory for the closing tag.
+        """
+        resolveTagName = LVheap.resolveTagName
+        autoScopeInfoFromET = LVheap.autoScopeInfoFromET
+        scopeTagOpen = LVheap.NODE_SCOPE.TagOpen.value
+        scopeTagClose = LVheap.NODE_SCOPE.TagClose.value
+        classAttrId = LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+        objects = []
+        stack = [(None, LVheap.SL_CLASS_TAGS.SL__oHExt, None,)]
+        pending_elem = None
+        for event, elem in events:
+            if pending_elem is not None:
+                parentNode, parentClassEn, _ = stack[-1]
+                tagEn, nodeFactory = resolveTagName(pending_elem.tag, parentClassEn)
+                if tagEn is None:
+                    raise AttributeError("Unrecognized tag in heap XML; tag '{}', parent tag '{}'"
+                                         .format(pending_elem.tag, parentNode.tagEn.name if parentNode is not None else None))
+                scopeInfo = autoScopeInfoFromET(pending_elem, hasChilds=(event == "start"))
+                obj = nodeFactory(section, parentNode, tagEn, scopeInfo)
+                objects.append(obj)
+                if parentNode is not None:
+                    parentNode.childs.append(obj)
+
+                obj.initWithXML(pending_elem)
+
+                # Same as LVheap.nodeTopClassEn(), inlined
+                stack.append((obj, obj.attribs.get(classAttrId, parentClassEn), nodeFactory,))
+                pending_elem = None
+            if event == "start":
+                pending_elem = elem
+                continue
+            # All children are loaded, the tag can be closed
+            parentNode, _, closeFactory = stack.pop()
+            if parentNode.scopeInfo == scopeTagOpen:
+                obj = closeFactory(section, parentNode.parent, parentNode.tagEn, scopeTagClose)
+                objects.append(obj)
+                if parentNode.parent is not None:
+                    parentNode.parent.childs.append(obj)
+                # obj.initWithXML(elem)  # No init needed for closing tag
+        return objects
+
+    def initWithXMLHeap(self, section, root_elem):
+        """ Creates Heap Nodes from XML tree of a heap section
+        """
+        return self.initWithXMLHeapEvents(section, ET.iterwalk(root_elem))
 
     def initWithXMLSectionData(self, section, section_elem):
-        section.objects = []
+        section.objects = self.initWithXMLHeap(section, section_elem)
 
-        self.initWithXMLHeap(section, section_elem, None)
+    def initWithXMLSectionFile(self, section, xml_fname):
+        """ Initialize heap section from separate XML file
+
+        The file is parsed incrementally, and Heap Nodes are created while parsing;
+        the XML tree of the heap is never created.
+        """
+        section.objects = self.initWithXMLHeapEvents(section, ET.iterparse(xml_fname))
 
     def exportXMLSectionData(self, section_elem, section_num, section, fname_base):
         root = section_elem
@@ -5215,6 +5599,90 @@ class HeapVerb(CompleteBlock):
                    .format(self.vi.src_fname, self.ident))
         pass
 
+    def findHeapXMLClosingTags(self, section):
+        """ Gives dict which maps positions of opening tags to positions of their closing tags
+
+        Fails the same way as exportXMLSectionData() would, if heap structure
+        cannot be stored as XML tree.
+        """
+        scopeTagOpen = LVheap.NODE_SCOPE.TagOpen.value
+        scopeTagClose = LVheap.NODE_SCOPE.TagClose.value
+        closing = {}
+        opened = []
+        for i, obj in enumerate(section.objects):
+            if i == 0:
+                pass  # First object is always the root
+            elif obj.scopeInfo == scopeTagClose:
+                if len(opened) < 1:
+                    raise RuntimeError("Closing tag at position {:d} has no opening".format(i))
+                closing[opened.pop()] = i
+                continue
+            elif len(opened) < 1:
+                raise RuntimeError("Heap has more than one root, second one at position {:d}".format(i))
+            if obj.scopeInfo == scopeTagOpen:
+                opened.append(i)
+        return closing
+
+    def exportXMLSectionFile(self, block_fh, section_num, section, fname_base):
+        """ Export heap section as separate XML file, into given file handle
+
+        Writes elements one by one while walking the Heap Nodes, so that the XML tree
+        of the heap is never created; the output is the same as if it was.
+        Each opening tag gets data from its closing node before being written, as
+        the closing node is exported to the same element.
+        """
+        scopeTagClose = LVheap.NODE_SCOPE.TagClose
+        scopeTagOpen = LVheap.NODE_SCOPE.TagOpen
+        objects = section.objects
+        closing = self.findHeapXMLClosingTags(section)
+        writer = ET.HeapXMLWriter(block_fh)
+        writer.writeDeclaration()
+        # Tag name of each opened element, and whether it has children
+        parent_elems = []
+        for i, obj in enumerate(objects):
+            scopeInfo = obj.getScopeInfo()
+            tagName = LVheap.tagEnToName(obj.tagEn, obj.parent)
+            if i > 0 and scopeInfo == scopeTagClose:
+                parentTag, hasChilds = parent_elems.pop()
+                if parentTag != tagName:
+                    eprint("{}: Warning: In block {}, closing tag {} instead of {}"
+                           .format(self.vi.src_fname, self.ident, tagName, parentTag))
+                if hasChilds:
+                    writer.endElement(parentTag, len(parent_elems))
+                continue
+
+            elem = ET.Element(tagName)
+            obj.exportXML(elem, scopeInfo, "{:s}_obj{:04d}".format(fname_base, i))
+
+            if scopeInfo != scopeTagOpen:
+                writer.writeLeaf(elem, len(parent_elems))
+                continue
+
+            close_i = closing.get(i, len(objects))
+            hasChilds = (close_i > i + 1)
+            if close_i < len(objects):
+                if hasChilds:
+                    # Closing node should see the element as having children
+                    placeholder = ET.SubElement(elem, "Placeholder")
+                closeObj = objects[close_i]
+                closeObj.exportXML(elem, closeObj.getScopeInfo(), "{:s}_obj{:04d}".format(fname_base, close_i))
+                if hasChilds:
+                    elem.remove(placeholder)
+            if hasChilds:
+                writer.startElement(elem, len(parent_elems))
+            else:
+                writer.writeLeaf(elem, len(parent_elems))
+            parent_elems.append((tagName, hasChilds,))
+
+        if len(parent_elems) > 0:
+            eprint("{}: Warning: In block {}, heap structure is not a valid XML tree"
+                   .format(self.vi.src_fname, self.ident))
+            while len(parent_elems) > 0:
+                parentTag, hasChilds = parent_elems.pop()
+                if hasChilds:
+                    writer.endElement(parentTag, len(parent_elems))
+        writer.flush()
+
     def initWithXMLLate(self):
         super().initWithXMLLate()
         for snum in self.sections:
@@ -5646,8 +6114,22 @@ class TypeDescListBase(CompleteBlock):
         section = super().createSection()
         section.content = []
         section.topLevel = []
+        # Index of Type Descriptors, created on first use
+        section.td_index = None
+        # Block reference shared by all TDs within the section
+        section.td_blockref = None
         return section
 
+    def getTypeDescBlockRef(self, section):
+        """ Gives block reference for TDs within given section
+
+        The same tuple is given for all TDs, so that it is not stored separately in each.
+        """
+        blockref = (self.ident, section.start.section_idx,)
+        if section.td_blockref != blockref:
+            section.td_blockref = blockref
+        return section.td_blockref
+
     def parseRSRCTypeDesc(self, section_num, bldata, td_idx, pos):
         section = self.sections[section_num]
 
@@ -5656,10 +6138,10 @@ class TypeDescListBase(CompleteBlock):
         if (self.po.verbose > 2):
             print("{:s}: Block {} TypeDesc {:d}, at 0x{:04x}, type 0x{:02x} flags 0x{:02x} len {:d}"
                   .format(self.vi.src_fname, self.ident, len(section.content), pos, obj_type, obj_flags, obj_len))
-        blockref = (self.ident, section.start.section_idx,)
+        blockref = self.getTypeDescBlockRef(section)
         # This block is typically compressed within RSRC file; add entries to RSRC map only if there is no compression
         if self.po.print_map is not None:
-            if obj_type not in set(item.value for item in LVdatatype.TD_FULL_TYPE):
+            if not LVlookup.enumHasValue(LVdatatype.TD_FULL_TYPE, obj_type):
                 obj_type_str = "Type_{}".format(obj_type)
             else:
                 obj_type_str = LVdatatype.TD_FULL_TYPE(obj_type).name
@@ -5712,7 +6194,7 @@ class TypeDescListBase(CompleteBlock):
         obj_idx = len(section.content)
         obj_type = LV.valFromEnumOrIntString(LVdatatype.TD_FULL_TYPE, td_elem.get("Type"))
         obj_flags = importXMLBitfields(LVdatatype.TYPEDESC_FLAGS, td_elem)
-        blockref = (self.ident, section.start.section_idx,)
+        blockref = self.getTypeDescBlockRef(section)
         obj = LVdatatype.newTDObject(self.vi, blockref, obj_idx, obj_flags, obj_type, self.po)
         clientTD = SimpleNamespace()
         clientTD.index = -1  # Nested clients have index -1
@@ -5723,14 +6205,15 @@ class TypeDescListBase(CompleteBlock):
         obj.initWithXML(td_elem)
 
     def initWithXMLTopType(self, section, tlist_elem):
+        section.td_index = None
         for subtlelem in tlist_elem:
             if (subtlelem.tag == "TypeDesc"):
                 i = int(subtlelem.get("Index"), 0) - 1
                 val = int(subtlelem.get("FlatTypeID"), 0)
                 # Grow the list if needed (the labels may be in wrong order)
-                if i >= len(self.topLevel):
-                    self.topLevel.extend([None] * (i - len(self.topLevel) + 1))
-                self.topLevel[i] = val
+                if i >= len(section.topLevel):
+                    section.topLevel.extend([None] * (i - len(section.topLevel) + 1))
+                section.topLevel[i] = val
             else:
                 raise AttributeError("TopLevel within Section contains unexpected tag")
         pass
@@ -5743,12 +6226,14 @@ class TypeDescListBase(CompleteBlock):
         pass
 
     def updateAllInTypeDescList(self, section, section_num):
+        section.td_index = None
         for clientTD in section.content:
             if not clientTD.nested.raw_data_updated:
                 clientTD.nested.updateData()
         pass
 
     def parseAllInTypeDescList(self, section, section_num):
+        section.td_index = None
         for clientTD in section.content:
             clientTD.nested.parseData()
         pass
@@ -5828,21 +6313,25 @@ class TypeDescListBase(CompleteBlock):
         TM = self.vi.get_one_of('TM80', 'DSTM')
         if TM is not None:
             topRange = range(TM.getMinTypeId(), TM.getMaxTypeId())
-        # Make flat range, leaving only valid entries to avoid multiplying checks
-        flatRange = []
-        for typeId in topRange:
-            flatIdx = len(section.topLevel)+1
-            if typeId >= 1 and typeId <= len(section.topLevel):
-                flatIdx = section.topLevel[typeId-1]
-            if flatIdx >= len(section.content):
-                continue
-            flatRange.append(flatIdx)
-        # Now find the special types
         from pylabview.LVdatatype import TD_FULL_TYPE
         from pylabview.LVparts import DSINIT, DCO
+        tdIndex = self.getTypeDescIndex(section_num)
+
+        def _topFlatRange(fullTypes):
+            # Flat indexes of TDs of given types which are in top range, ordered by first Top Level index within the range
+            topFlatIdxs = []
+            for fullType in fullTypes:
+                for _, flatIdx, _ in tdIndex.enumerate(fullType=fullType):
+                    for typeId in tdIndex.topIndexesOf(flatIdx):
+                        if typeId in topRange:
+                            topFlatIdxs.append((typeId, flatIdx,))
+                            break
+            return [flatIdx for _, flatIdx in sorted(topFlatIdxs)]
+
+        # Now find the special types
         # Find DSInit
         tdDSInit = None
-        for flatIdx in flatRange:
+        for flatIdx in _topFlatRange((TD_FULL_TYPE.RepeatedBlock, TD_FULL_TYPE.Cluster,)):
             clientTD = section.content[flatIdx]
             if clientTD.nested.fullType() == TD_FULL_TYPE.RepeatedBlock and clientTD.nested.getNumRepeats() == 51:
                 tdDSInit = clientTD.nested
@@ -5862,10 +6351,8 @@ class TypeDescListBase(CompleteBlock):
         # Find DCO
         tdDCO = None
         tdDCOList = None
-        for flatIdx in flatRange:
+        for flatIdx in _topFlatRange((TD_FULL_TYPE.RepeatedBlock,)):
             clientTD = section.content[flatIdx]
-            if clientTD.nested.fullType() != TD_FULL_TYPE.RepeatedBlock:
-                continue
             td_clust = None
             for cli_idx, td_idx, td_obj, td_flags in clientTD.nested.clientsEnumerate():
                 td_clust = td_obj
@@ -5957,6 +6444,18 @@ class TypeDescListBase(CompleteBlock):
             )
         return type_list
 
+    def getTypeDescIndex(self, section_num=None):
+        """ Gives index of Type Descriptors within given section
+
+        The index is created on first use, and dropped when the section is parsed,
+        loaded from XML or its data is updated. Code which modifies TDs within the
+        lists in place should set section.td_index to None.
+        """
+        section = self.getParsedSection(section_num)
+        if section.td_index is None or not section.td_index.isValidFor(section.content, section.topLevel):
+            section.td_index = LVdatatype.TypeDescIndex(section.content, section.topLevel)
+        return section.td_index
+
     def getFlatType(self, flatIdx, section_num=None):
         """ Retrieve type of given flat list index
 
@@ -6001,6 +6500,7 @@ class VCTP(TypeDescListBase):
 
     def parseRSRCSectionData(self, section_num, bldata):
         section = self.sections[section_num]
+        section.td_index = None
         # First we have flat list of TypeDescs
         self.parseRSRCTypeDescList(section_num, section, bldata)
         # After that, there is a list of Top Level TD indexes
@@ -6013,6 +6513,7 @@ class VCTP(TypeDescListBase):
     def initWithXMLSectionData(self, section, section_elem):
         section.content = []
         section.topLevel = []
+        section.td_index = None
         for subelem in section_elem:
             if (subelem.tag == "NameObject"):
                 pass  # Items parsed somewhere else
@@ -6044,6 +6545,7 @@ class VCTP(TypeDescListBase):
 
     def parseData(self, section_num=None):
         section = self.getSection(section_num)
+        self.parsePendingData(section_num=section_num)
 
         # Besides the normal parsing, also parse sub-objects
         needTDParse = self.needParseData(section_num=section_num)
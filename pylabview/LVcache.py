@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+""" LabView RSRC file format support.
+
+Cache of extraction results, allowing incremental re-extraction.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import json
+import hashlib
+
+import pylabview.LVxml as ET
+
+
+# Options which influence content of the extracted files
+EXTRACT_CACHE_OPTIONS = ('textcp', 'raw_connectors', 'keep_names', 'typedesc_list_limit',
+    'array_data_limit', 'store_as_data_above',)
+
+def hashFileContent(fname):
+    """ Computes SHA-256 hash of given file content
+    """
+    hsh = hashlib.sha256()
+    with open(fname, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b''):
+            hsh.update(chunk)
+    return hsh.hexdigest()
+
+def listExtractedFiles(xml_fname):
+    """ Lists files created by extraction to given XML, including the XML itself
+
+    All files stored during extraction are referenced by "File" attributes, either
+    within the main XML or within XMLs of sections.
+    """
+    fnames = []
+    pending = [xml_fname]
+    while len(pending) > 0:
+        fname = pending.pop(0)
+        if fname in fnames:
+            continue
+        fnames.append(fname)
+        if os.path.splitext(fname)[1].lower() != '.xml':
+            continue
+        tree = ET.parse(fname)
+        fpath = os.path.dirname(fname)
+        for elem in tree.getroot().iter():
+            ref_fname = elem.get("File")
+            if ref_fname is not None:
+                pending.append(os.path.join(fpath, ref_fname))
+    return fnames
+
+
+class ExtractCacheEntry(object):
+    """ Cache entry for extraction of one RSRC file
+
+    The entry is a JSON manifest within cache directory, keyed by paths of the input
+    RSRC file and the output XML. It stores hash of the input file content, tool version
+    and options, and a list of output files with their sizes and modification times.
+    If all of these still match, output of the previous extraction is up to date.
+    """
+    def __init__(self, cache_dir, po, command, tool_version):
+        self.po = po
+        rsrc_fname = os.path.abspath(po.rsrc)
+        xml_fname = os.path.abspath(po.xml)
+        entry_key = hashlib.sha256("{}\n{}".format(rsrc_fname, xml_fname).encode('utf-8')).hexdigest()
+        self.manifest_fname = os.path.join(cache_dir, entry_key + ".json")
+        self.state = {
+            "Tool": tool_version,
+            "Command": command,
+            "Input": rsrc_fname,
+            "InputHash": hashFileContent(rsrc_fname),
+            "Output": xml_fname,
+            "Options": { name: getattr(po, name, None) for name in EXTRACT_CACHE_OPTIONS },
+        }
+
+    @staticmethod
+    def getFileStat(fname):
+        st = os.stat(fname)
+        return [st.st_size, st.st_mtime_ns]
+
+    def isUpToDate(self):
+        """ Checks whether output files of previous extraction can be kept
+        """
+        try:
+            with open(self.manifest_fname, "r", encoding='utf-8') as manifest_fh:
+                manifest = json.load(manifest_fh)
+        except (OSError, ValueError):
+            return False
+        for key, val in self.state.items():
+            if manifest.get(key) != val:
+                return False
+        # Output files must not be removed or modified since the extraction
+        outputs = manifest.get("Outputs", {})
+        if len(outputs) < 1:
+            return False
+        for fname, fstat in outputs.items():
+            try:
+                if ExtractCacheEntry.getFileStat(fname) != fstat:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def store(self):
+        """ Stores manifest after successful extraction
+        """
+        manifest = self.state.copy()
+        manifest["Outputs"] = { fname: ExtractCacheEntry.getFileStat(fname)
+            for fname in listExtractedFiles(self.state["Output"]) }
+        os.makedirs(os.path.dirname(self.manifest_fname), exist_ok=True)
+        # Write to temporary file first, so that interrupted write will not leave broken entry
+        tmp_fname = self.manifest_fname + ".tmp{:d}".format(os.getpid())
+        with open(tmp_fname, "w", encoding='utf-8') as manifest_fh:
+            json.dump(manifest, manifest_fh, indent=1)
+        os.replace(tmp_fname, self.manifest_fname)
@@ -13,7 +13,9 @@
 
 import enum
 import struct
+import array
 import math
+import sys
 import os
 
 from hashlib import md5
@@ -24,8 +26,16 @@ from ctypes import *
 from pylabview.LVmisc import *
 import pylabview.LVxml as ET
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class DataFill:
+    __slots__ = ('vi', 'blockref', 'po', 'tdType', 'tdSubType', 'expectContentKind', 'index', 'tm_flags',
+      'td', 'value',)
+
     def __init__(self, vi, blockref, tdType, tdSubType, po):
         """ Creates new DataFill object, capable of handling generic data.
         """
@@ -169,6 +179,8 @@ class DataFill:
 
 
 class DataFillVoid(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         self.value = None
 
@@ -188,6 +200,8 @@ class DataFillVoid(DataFill):
 
 
 class DataFillInt(DataFill):
+    __slots__ = ('base', 'size', 'signed',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.base = 10
@@ -248,6 +262,8 @@ class DataFillInt(DataFill):
 
 
 class DataFillFloat(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         from pylabview.LVdatatype import TD_FULL_TYPE
         if self.tdType in (TD_FULL_TYPE.NumFloat32,TD_FULL_TYPE.UnitFloat32,):
@@ -302,6 +318,8 @@ class DataFillFloat(DataFill):
 
 
 class DataFillComplex(DataFill):
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = (None,None,)
@@ -385,6 +403,8 @@ class DataFillComplex(DataFill):
 
 
 class DataFillBool(DataFill):
+    __slots__ = ('size',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.size = None
@@ -432,8 +452,10 @@ class DataFillBool(DataFill):
 
 
 class DataFillString(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
-        strlen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        strlen = bldata.readU32()
         #if self.td.prop1 != 0xffffffff: # in such case part of the value might be irrelevant, as only
         # part to the size (self.td.prop1 & 0x7fffffff) is used; but the length stored is still valid
         self.value = bldata.read(strlen)
@@ -463,6 +485,8 @@ class DataFillString(DataFill):
 
 
 class DataFillPath(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         from pylabview.LVclasses import LVPath0, LVPath1
         startPos = bldata.tell()
@@ -509,9 +533,11 @@ class DataFillPath(DataFill):
 
 
 class DataFillCString(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         # No idea why sonething which looks like string type stores 32-bit value instead
-        self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.value = bldata.readU32()
 
     def prepareRSRCData(self, avoid_recompute=False):
         data_buf = b''
@@ -532,13 +558,19 @@ class DataFillCString(DataFill):
 
 
 class DataFillArray(DataFill):
+    __slots__ = ('dimensions', 'typed_value',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = []
         self.dimensions = []
+        # Numeric items stored within one typed array, instead of list of Data Fills
+        self.typed_value = None
 
     def prepareDict(self):
         d = super().prepareDict()
+        if self.typed_value is not None:
+            d.update( { 'value': self.typed_value } )
         d.update( { 'dimensions': self.dimensions } )
         return d
 
@@ -602,8 +634,9 @@ class DataFillArray(DataFill):
 
     def initWithRSRCParse(self, bldata):
         self.dimensions = []
+        self.typed_value = None
         for dim in self.td.dimensions:
-            val = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            val = bldata.readU32()
             self.dimensions.append(val)
         if len(self.td.clients) < 1:
             raise RuntimeError("TD {} used for DataFill before being initialized".format(enumOrIntToName(self.td.fullType())))
@@ -628,7 +661,17 @@ class DataFillArray(DataFill):
                 raise RuntimeError("Fill for TD {} claims to contain {} fields, expected below {}; pos within block 0x{:x}"\
                   .format(self.getXMLTagName(), repeatRealCount, clientsLimit, bldata.tell()))
         smartContentKind = self.smartContentUsed()
-        if smartContentKind in ("RSRC","Data",):
+        item_fmt = None
+        if self.po.typed_arrays and smartContentKind != "RSRC":
+            item_fmt = typedArrayItemFormat(self.vi, sub_td)
+        if item_fmt is not None:
+            data_len = repeatRealCount * typedArrayItemSize(item_fmt)
+            data_buf = bldata.read(data_len)
+            if len(data_buf) != data_len:
+                raise RuntimeError("Fill for TD {} claims to contain {} fields, but data ends after {} bytes"\
+                  .format(self.getXMLTagName(), repeatRealCount, len(data_buf)))
+            self.typed_value = typedArrayFromBytes(data_buf, item_fmt)
+        elif smartContentKind in ("RSRC","Data",):
             from pylabview.LVdatatype import TD_FULL_TYPE, newTDObject
             smart_td = newTDObject(self.vi, self.blockref, -1, 0, TD_FULL_TYPE.Block, self.po)
             smart_td.blkSize = repeatRealCount * sub_td.constantSizeFill()
@@ -653,6 +696,8 @@ class DataFillArray(DataFill):
         data_buf = b''
         for dim in self.dimensions:
             data_buf += int(dim).to_bytes(4, byteorder='big', signed=False)
+        if self.typed_value is not None:
+            data_buf += typedArrayToBytes(self.typed_value)
         for sub_df in self.value:
             data_buf += sub_df.prepareRSRCData(avoid_recompute=avoid_recompute)
         return data_buf
@@ -660,6 +705,8 @@ class DataFillArray(DataFill):
     def expectedRSRCSize(self):
         exp_whole_len = 0
         exp_whole_len += 4 * len(self.dimensions)
+        if self.typed_value is not None:
+            exp_whole_len += len(self.typed_value) * self.typed_value.itemsize
         for sub_df in self.value:
             sub_len = sub_df.expectedRSRCSize()
             if sub_len is None:
@@ -670,6 +717,7 @@ class DataFillArray(DataFill):
     def initWithXML(self, df_elem):
         self.dimensions = []
         self.value = []
+        self.typed_value = None
         for i, subelem in enumerate(df_elem):
             if (subelem.tag == 'dim'):
                 val = int(subelem.text, 0)
@@ -689,11 +737,41 @@ class DataFillArray(DataFill):
         for dim in self.dimensions:
             subelem = ET.SubElement(df_elem, 'dim')
             subelem.text = "{:d}".format(dim)
-        for sub_df in self.value:
+        if self.typed_value is not None:
+            sub_dfs = self.typedValueToDataFills()
+        else:
+            sub_dfs = self.value
+        for sub_df in sub_dfs:
             subelem = ET.SubElement(df_elem, sub_df.getXMLTagName())
             sub_df.exportXML(subelem, fname_base)
         pass
 
+    def typedValueToDataFills(self):
+        """ Creates list of Data Fills with items stored in the typed array
+
+        The Data Fills are the same as would be created while parsing the array
+        without typed array storage; this allows export of the same XML.
+        """
+        # We expect exactly one client within Array
+        for cli_idx, td_idx, td_obj, td_flags in self.td.clientsEnumerate():
+            sub_td = td_obj
+            sub_td_idx = td_idx
+        smartContentKind = self.smartContentUsed()
+        if smartContentKind in ("RSRC","Data",):
+            from pylabview.LVdatatype import TD_FULL_TYPE, newTDObject
+            smart_td = newTDObject(self.vi, self.blockref, -1, 0, TD_FULL_TYPE.Block, self.po)
+            sub_df = newDataFillObjectWithTD(self.vi, self.blockref, -1, 0, smart_td, self.po)
+            sub_df.expectContentKind = smartContentKind
+            sub_df.value = typedArrayToBytes(self.typed_value)
+            smart_td.blkSize = len(sub_df.value)
+            return [sub_df]
+        item_fmt = typedArrayItemFormat(self.vi, sub_td)
+        sub_dfs = []
+        for item in typedArrayToList(self.typed_value, item_fmt):
+            sub_df = newDataFillObjectWithTypedItem(self.vi, self.blockref, sub_td_idx, self.tm_flags, sub_td, item_fmt, item, self.po)
+            sub_dfs.append(sub_df)
+        return sub_dfs
+
     def countTotalItems(self):
         """ Get total amount of items stored in this DF
 
@@ -710,8 +788,10 @@ class DataFillArray(DataFill):
 
 
 class DataFillArrayDataPtr(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
-        self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.value = bldata.readU32()
 
     def prepareRSRCData(self, avoid_recompute=False):
         data_buf = b''
@@ -732,6 +812,8 @@ class DataFillArrayDataPtr(DataFill):
 
 
 class DataFillCluster(DataFill):
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = []
@@ -807,6 +889,8 @@ class DataFillCluster(DataFill):
 
 
 class DataFillLVVariant(DataFill):
+    __slots__ = ('useConsolidatedTypes',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.useConsolidatedTypes = True
@@ -851,6 +935,8 @@ class DataFillLVVariant(DataFill):
 
 
 class DataFillMeasureData(DataFill):
+    __slots__ = ('containedTd',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.containedTd = None
@@ -999,6 +1085,8 @@ class DataFillMeasureData(DataFill):
 
 
 class DataFillComplexFixedPt(DataFill):
+    __slots__ = ('vflags',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = 2 * [None]
@@ -1014,9 +1102,9 @@ class DataFillComplexFixedPt(DataFill):
         self.value = 2 * [None]
         self.vflags = 2 * [None]
         for i in range(2):
-            self.value[i] = int.from_bytes(bldata.read(8), byteorder='big', signed=False)
+            self.value[i] = bldata.readU64()
             if self.td.allocOv:
-                self.vflags[i] = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+                self.vflags[i] = bldata.readU8()
         pass
 
     def prepareRSRCData(self, avoid_recompute=False):
@@ -1060,14 +1148,16 @@ class DataFillComplexFixedPt(DataFill):
 
 
 class DataFillFixedPoint(DataFill):
+    __slots__ = ('vflags',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.vflags = None
 
     def initWithRSRCParse(self, bldata):
-        self.value = int.from_bytes(bldata.read(8), byteorder='big', signed=False)
+        self.value = bldata.readU64()
         if self.td.allocOv:
-            self.vflags = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            self.vflags = bldata.readU8()
         else:
             self.vflags = None
 
@@ -1103,6 +1193,8 @@ class DataFillFixedPoint(DataFill):
 
 
 class DataFillBlock(DataFill):
+    __slots__ = ()
+
     def smartContentUsed(self):
         return self.expectContentKind
 
@@ -1232,6 +1324,8 @@ class DataFillBlock(DataFill):
 
 
 class DataFillRepeatedBlock(DataFill):
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = []
@@ -1320,6 +1414,8 @@ class DataFillSimpleRefnum(DataFill):
 
     Used for "normal" ref types, which only contain 4 byte value.
     """
+    __slots__ = ()
+
     def prepareDict(self):
         refName = enumOrIntToName(self.tdSubType)
         d = super().prepareDict()
@@ -1328,7 +1424,7 @@ class DataFillSimpleRefnum(DataFill):
 
     def initWithRSRCParse(self, bldata):
         # The format seem to be different for LV6.0.0 and older, but still 4 bytes
-        self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.value = bldata.readU32()
 
     def prepareRSRCData(self, avoid_recompute=False):
         data_buf = b''
@@ -1353,6 +1449,8 @@ class DataFillIORefnum(DataFill):
 
     Used for ref types which represent IORefnum.
     """
+    __slots__ = ()
+
     def prepareDict(self):
         refName = enumOrIntToName(self.tdSubType)
         d = super().prepareDict()
@@ -1363,12 +1461,12 @@ class DataFillIORefnum(DataFill):
         ver = self.vi.getFileVersion()
         if isGreaterOrEqVersion(ver, 6,0,0):
             if self.isRefnumTag(self.td):
-                strlen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+                strlen = bldata.readU32()
                 self.value = bldata.read(strlen)
             else:
-                self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+                self.value = bldata.readU32()
         else:
-            self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            self.value = bldata.readU32()
 
     def prepareRSRCData(self, avoid_recompute=False):
         data_buf = b''
@@ -1426,6 +1524,8 @@ class DataFillUDRefnum(DataFill):
 
     Used for ref types which represent Non-tag subtypes of UDRefnum.
     """
+    __slots__ = ()
+
     def prepareDict(self):
         refName = enumOrIntToName(self.tdSubType)
         d = super().prepareDict()
@@ -1433,7 +1533,7 @@ class DataFillUDRefnum(DataFill):
         return d
 
     def initWithRSRCParse(self, bldata):
-        self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.value = bldata.readU32()
 
     def prepareRSRCData(self, avoid_recompute=False):
         data_buf = b''
@@ -1458,6 +1558,8 @@ class DataFillUDTagRefnum(DataFill):
 
     Used for ref types which represent Tag subtypes of UDRefnum.
     """
+    __slots__ = ('usrdef1', 'usrdef2', 'usrdef3', 'usrdef4',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.usrdef1 = None
@@ -1478,17 +1580,17 @@ class DataFillUDTagRefnum(DataFill):
         self.usrdef2 = None
         self.usrdef3 = None
         self.usrdef4 = None
-        strlen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        strlen = bldata.readU32()
         self.value = bldata.read(strlen)
         if isGreaterOrEqVersion(ver, 12,0,0,2) and isSmallerVersion(ver, 12,0,0,5):
             bldata.read(1)
         if self.td.refType() in (REFNUM_TYPE.UsrDefTagFlt,):
-            strlen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            strlen = bldata.readU32()
             self.usrdef1 = bldata.read(strlen)
-            strlen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            strlen = bldata.readU32()
             self.usrdef2 = bldata.read(strlen)
-            self.usrdef3 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
-            strlen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            self.usrdef3 = bldata.readU32()
+            strlen = bldata.readU32()
             self.usrdef4 = bldata.read(strlen)
 
     def prepareRSRCData(self, avoid_recompute=False):
@@ -1564,6 +1666,8 @@ class DataFillUDTagRefnum(DataFill):
 class DataFillUDClassInst(DataFill):
     """ Data Fill for UDClassInst Refnum types.
     """
+    __slots__ = ('libName', 'datlist',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.libName = b''
@@ -1576,7 +1680,7 @@ class DataFillUDClassInst(DataFill):
         self.value = []
         self.datlist = []
 
-        numLevels = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        numLevels = bldata.readU32()
 
         if numLevels > self.po.typedesc_list_limit:
             raise RuntimeError("Data type {} claims to contain {} fields, expected below {}"\
@@ -1590,17 +1694,17 @@ class DataFillUDClassInst(DataFill):
             # now read LVLibraryVersionTD instances; that type is defined in 'tdtable.tdr'
             # Basically it's a Cluster of 4x uint16
             libVersion = {}
-            libVersion['major'] = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-            libVersion['minor'] = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-            libVersion['bugfix']   = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-            libVersion['build'] = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+            libVersion['major'] = bldata.readU16()
+            libVersion['minor'] = bldata.readU16()
+            libVersion['bugfix']   = bldata.readU16()
+            libVersion['build'] = bldata.readU16()
             self.value.append(libVersion)
             if numLevels == 1 and libVersion['major'] == 0 and libVersion['minor'] == 0 and \
                     libVersion['bugfix'] == 0 and libVersion['build'] == 0:
                 numDLevels = 0
 
         for i in range(numDLevels):
-            datalen = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            datalen = bldata.readU32()
             libData = bldata.read(datalen)
             self.datlist.append(libData)
         pass
@@ -1688,10 +1792,12 @@ class DataFillUDClassInst(DataFill):
 
 
 class DataFillPtr(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         ver = self.vi.getFileVersion()
         if isSmallerVersion(ver, 8,6,0,1):
-            self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            self.value = bldata.readU32()
         else:
             self.value = None
 
@@ -1722,8 +1828,10 @@ class DataFillPtr(DataFill):
 
 
 class DataFillPtrTo(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
-        self.value = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.value = bldata.readU32()
 
     def prepareRSRCData(self, avoid_recompute=False):
         data_buf = b''
@@ -1744,6 +1852,8 @@ class DataFillPtrTo(DataFill):
 
 
 class DataFillExtData(DataFill):
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         self.value = None # TODO implement reading ExtData
         raise NotImplementedError("ExtData default value read is not implemented")
@@ -1757,6 +1867,8 @@ class DataFillUnexpected(DataFill):
 
     Types which reference this class would cause silently ignored error in LV14.
     """
+    __slots__ = ()
+
     def initWithRSRCParse(self, bldata):
         self.value = None
         eprint("{:s}: Warning: Data fill asks to read default value of {} type, this should never happen."\
@@ -1781,6 +1893,8 @@ class DataFillUnexpected(DataFill):
 
 
 class DataFillTypeDef(DataFill):
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = []
@@ -1853,6 +1967,8 @@ class DataFillTypeDef(DataFill):
 
 
 class SpecialDSTMCluster(DataFillCluster):
+    __slots__ = ()
+
     def getXMLTagName(self):
         return "SpecialDSTMCluster"
 
@@ -2037,3 +2153,230 @@ def newDataFillObjectWithTag(vi, blockref, tagName, po):
         tdSubType = None
     df = newDataFillObject(vi, blockref, tdType, tdSubType, po)
     return df
+
+def newDataFillObjectWithTypedItem(vi, blockref, idx, tm_flags, td, item_fmt, item, po):
+    """ Creates and returns new data fill object with value of given typed array item
+    """
+    df = newDataFillObjectWithTD(vi, blockref, idx, tm_flags, td, po)
+    if isinstance(item_fmt, tuple):
+        df.value = []
+        for (cli_idx, td_idx, sub_td, td_flags), sub_fmt, sub_item in zip(td.clientsEnumerate(), item_fmt, item):
+            sub_df = newDataFillObjectWithTypedItem(vi, blockref, td_idx, tm_flags, sub_td, sub_fmt, sub_item, po)
+            df.value.append(sub_df)
+    elif item_fmt[0] == 'c':
+        df.value = (item.real, item.imag,)
+    else:
+        df.value = item
+        if isinstance(df, DataFillBool):
+            df.initVersion()
+    return df
+
+def typedArrayItemFormat(vi, td):
+    """ Gives format of an item of given TD within typed array, or None
+
+    Only Numbers, Booleans and Clusters of them can be stored within typed array.
+    The format is a numpy type string, without byte order; or a tuple of formats
+    for a Cluster. Returns None if the TD cannot be stored in typed array.
+    """
+    from pylabview.LVdatatype import TD_FULL_TYPE
+    tdType = td.fullType()
+    if tdType == TD_FULL_TYPE.Cluster:
+        item_fmt = tuple(typedArrayItemFormat(vi, sub_td) for cli_idx, td_idx, sub_td, td_flags in td.clientsEnumerate())
+        if len(item_fmt) < 1 or None in item_fmt:
+            return None
+        if numpy is None and typedArrayTypeCode(item_fmt) is None:
+            return None # without numpy, only Clusters of the same numeric type are supported
+        return item_fmt
+    if tdType == TD_FULL_TYPE.Boolean:
+        ver = vi.getFileVersion()
+        if isGreaterOrEqVersion(ver, 4,5,0):
+            return 'u1'
+        return 'u2'
+    return {
+        TD_FULL_TYPE.NumInt8: 'i1',
+        TD_FULL_TYPE.NumInt16: 'i2',
+        TD_FULL_TYPE.NumInt32: 'i4',
+        TD_FULL_TYPE.NumInt64: 'i8',
+        TD_FULL_TYPE.NumUInt8: 'u1',
+        TD_FULL_TYPE.NumUInt16: 'u2',
+        TD_FULL_TYPE.NumUInt32: 'u4',
+        TD_FULL_TYPE.NumUInt64: 'u8',
+        TD_FULL_TYPE.NumFloat32: 'f4',
+        TD_FULL_TYPE.NumFloat64: 'f8',
+        TD_FULL_TYPE.NumComplex64: 'c8',
+        TD_FULL_TYPE.NumComplex128: 'c16',
+        TD_FULL_TYPE.UnitUInt8: 'u1',
+        TD_FULL_TYPE.UnitUInt16: 'u2',
+        TD_FULL_TYPE.UnitUInt32: 'u4',
+        TD_FULL_TYPE.UnitFloat32: 'f4',
+        TD_FULL_TYPE.UnitFloat64: 'f8',
+        TD_FULL_TYPE.UnitComplex64: 'c8',
+        TD_FULL_TYPE.UnitComplex128: 'c16',
+        TD_FULL_TYPE.BooleanU16: 'u2',
+    }.get(tdType, None)
+
+def typedArrayItemSize(item_fmt):
+    """ Gives size of an item with given format, in bytes
+    """
+    if isinstance(item_fmt, tuple):
+        return sum(typedArrayItemSize(sub_fmt) for sub_fmt in item_fmt)
+    return int(item_fmt[1:])
+
+def typedArrayLeafFormats(item_fmt):
+    """ Gives list of formats of scalar values within an item, with Complex split into two floats
+    """
+    if isinstance(item_fmt, tuple):
+        return [leaf_fmt for sub_fmt in item_fmt for leaf_fmt in typedArrayLeafFormats(sub_fmt)]
+    if item_fmt[0] == 'c':
+        leaf_fmt = 'f{:d}'.format(int(item_fmt[1:]) // 2)
+        return [leaf_fmt, leaf_fmt]
+    return [item_fmt]
+
+def typedArrayTypeCode(item_fmt):
+    """ Gives array module type code able to store items of given format, or None
+
+    Items which consist of more than one value are stored as consecutive
+    values of the array, so all values need to be of the same type.
+    """
+    leaf_fmts = set(typedArrayLeafFormats(item_fmt))
+    if len(leaf_fmts) != 1:
+        return None
+    leaf_fmt = leaf_fmts.pop()
+    typecode = {
+        'i1': 'b', 'u1': 'B', 'i2': 'h', 'u2': 'H', 'i4': 'i', 'u4': 'I',
+        'i8': 'q', 'u8': 'Q', 'f4': 'f', 'f8': 'd',
+    }.get(leaf_fmt, None)
+    if typecode is None or array.array(typecode).itemsize != int(leaf_fmt[1:]):
+        return None
+    return typecode
+
+def typedArrayDType(item_fmt):
+    """ Gives numpy dtype of items with given format, in native byte order
+    """
+    if isinstance(item_fmt, tuple):
+        return numpy.dtype([("f{:d}".format(i), typedArrayDType(sub_fmt)) for i, sub_fmt in enumerate(item_fmt)])
+    return numpy.dtype(item_fmt)
+
+def typedArrayFromBytes(data_buf, item_fmt):
+    """ Creates typed array from big endian data of items with given format
+
+    Uses numpy array if numpy is available, otherwise array module is used,
+    and items with more than one value are stored as consecutive values.
+    The values are converted to native byte order.
+    """
+    if numpy is not None:
+        dtype = typedArrayDType(item_fmt)
+        return numpy.frombuffer(data_buf, dtype=dtype.newbyteorder('>')).astype(dtype)
+    typed_value = array.array(typedArrayTypeCode(item_fmt))
+    typed_value.frombytes(data_buf)
+    if sys.byteorder != 'big':
+        typed_value.byteswap()
+    return typed_value
+
+def typedArrayToBytes(typed_value):
+    """ Returns big endian data of all items within typed array
+    """
+    if numpy is not None and isinstance(typed_value, numpy.ndarray):
+        return typed_value.astype(typed_value.dtype.newbyteorder('>')).tobytes()
+    if sys.byteorder != 'big':
+        typed_value = array.array(typed_value.typecode, typed_value)
+        typed_value.byteswap()
+    return typed_value.tobytes()
+
+def typedArrayToList(typed_value, item_fmt):
+    """ Returns list of items within typed array, as Python values
+
+    Items of Clusters are tuples, and items of Complex numbers are complex.
+    """
+    if numpy is not None and isinstance(typed_value, numpy.ndarray):
+        return typed_value.tolist()
+    def makeItem(leaf_iter, item_fmt):
+        if isinstance(item_fmt, tuple):
+            return tuple(makeItem(leaf_iter, sub_fmt) for sub_fmt in item_fmt)
+        if item_fmt[0] == 'c':
+            return complex(next(leaf_iter), next(leaf_iter))
+        return next(leaf_iter)
+    leaves_count = len(typedArrayLeafFormats(item_fmt))
+    leaf_iter = iter(typed_value)
+    return [makeItem(leaf_iter, item_fmt) for i in range(len(typed_value) // leaves_count)]
+
+def dataFillConstantSize(vi, td):
+    """ Gives size of Data Fill of given TD if the size is constant, or None
+
+    Unlike TDObject.constantSizeFill(), this also covers sizes which depend
+    on the file version, and Clusters of constant size types.
+    """
+    from pylabview.LVdatatype import TD_FULL_TYPE
+    tdType = td.fullType()
+    if tdType == TD_FULL_TYPE.Cluster:
+        exp_whole_len = 0
+        for cli_idx, td_idx, sub_td, td_flags in td.clientsEnumerate():
+            sub_len = dataFillConstantSize(vi, sub_td)
+            if sub_len is None:
+                return None
+            exp_whole_len += sub_len
+        return exp_whole_len
+    if tdType in (TD_FULL_TYPE.Void,TD_FULL_TYPE.VoidBlock,TD_FULL_TYPE.AlignmntMarker,):
+        return 0
+    if tdType in (TD_FULL_TYPE.CString,TD_FULL_TYPE.PasString,TD_FULL_TYPE.ArrayDataPtr,):
+        return 4
+    if tdType in (TD_FULL_TYPE.NumFloatExt,TD_FULL_TYPE.UnitFloatExt,):
+        return 16
+    if tdType in (TD_FULL_TYPE.NumComplexExt,TD_FULL_TYPE.UnitComplexExt,):
+        return 32
+    item_fmt = typedArrayItemFormat(vi, td)
+    if item_fmt is None:
+        return None
+    return typedArrayItemSize(item_fmt)
+
+def skipDataFillWithTD(vi, td, bldata, po):
+    """ Moves position within data to after Data Fill of given TD, without parsing it
+
+    Returns False if the kind of TD is not supported by this fast scan; then the
+    position is not valid, and the Data Fill needs to be parsed to get its size.
+    Supports constant size types, and Strings, Arrays, Clusters and Type
+    Definitions of them.
+    """
+    from pylabview.LVdatatype import TD_FULL_TYPE
+    exp_whole_len = dataFillConstantSize(vi, td)
+    if exp_whole_len is not None:
+        bldata.seek(exp_whole_len, 1)
+        return True
+    tdType = td.fullType()
+    if tdType in (TD_FULL_TYPE.String,TD_FULL_TYPE.Picture,TD_FULL_TYPE.Tag,):
+        data_buf = bldata.read(4)
+        if len(data_buf) < 4:
+            return False
+        bldata.seek(int.from_bytes(data_buf, byteorder='big', signed=False), 1)
+        return True
+    if tdType in (TD_FULL_TYPE.Cluster,TD_FULL_TYPE.TypeDef,TD_FULL_TYPE.TypeBlock,):
+        for cli_idx, td_idx, sub_td, td_flags in td.clientsEnumerate():
+            if not skipDataFillWithTD(vi, sub_td, bldata, po):
+                return False
+        return True
+    if tdType in (TD_FULL_TYPE.Array,TD_FULL_TYPE.ArrayInterfc,TD_FULL_TYPE.RepeatedBlock,):
+        sub_td = None
+        for cli_idx, td_idx, td_obj, td_flags in td.clientsEnumerate():
+            sub_td = td_obj
+        if sub_td is None:
+            return False
+        if tdType == TD_FULL_TYPE.RepeatedBlock:
+            repeatCount = td.numRepeats
+        else:
+            repeatCount = 1
+            for dim in td.dimensions:
+                data_buf = bldata.read(4)
+                if len(data_buf) < 4:
+                    return False
+                repeatCount *= int.from_bytes(data_buf, byteorder='big', signed=False) & 0x7fffffff
+        if repeatCount > po.array_data_limit:
+            return False
+        item_len = dataFillConstantSize(vi, sub_td)
+        if item_len is not None:
+            bldata.seek(repeatCount * item_len, 1)
+            return True
+        for i in range(repeatCount):
+            if not skipDataFillWithTD(vi, sub_td, bldata, po):
+                return False
+        return True
+    return False
@@ -21,6 +21,7 @@ from types import SimpleNamespace
 from ctypes import *
 
 from pylabview.LVmisc import *
+import pylabview.LVlookup as LVlookup
 import pylabview.LVxml as ET
 import pylabview.LVheap as LVheap
 import pylabview.LVdatatyperef as LVdatatyperef
@@ -338,9 +339,25 @@ class LV_INTERNAL_MEAS_FLAVOR_NAMES(LVheap.ENUM_TAGS):
     U64Waveform =	MEASURE_DATA_FLAVOR.UInt64Waveform
 
 
+def typeDescClassFullName(cls):
+    """ Gives full name of Type Descriptor class, which is first line of its docstring.
+    """
+    if cls.__doc__:
+        return cls.__doc__.split('\n')[0].strip()
+    return ""
+
+
 class TDObject:
     """ Base class for any Type Descriptor
     """
+    __slots__ = ('vi', 'blockref', 'po', 'index', 'oflags', 'otype', 'topTypeList', 'label', 'purpose', 'size',
+      'raw_data', 'raw_data_updated', 'parsed_data_updated',)
+
+    def __init_subclass__(cls, **kwargs):
+        """ Sets full name of the Type Descriptor class, from first line of its docstring.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.full_name = typeDescClassFullName(cls)
 
     def __init__(self, vi, blockref, idx, obj_flags, obj_type, po):
         """ Creates new Type Descriptor object, capable of handling generic TD data.
@@ -357,11 +374,6 @@ class TDObject:
         self.purpose = ""
         self.size = None
 
-        if self.__doc__:
-            self.full_name = self.__doc__.split('\n')[0].strip()
-        else:
-            self.full_name = ""
-
         self.raw_data = None
         # Whether RAW data has been updated and RSRC parsing is required to update properties
         self.raw_data_updated = False
@@ -382,7 +394,7 @@ class TDObject:
         At the point it is executed, other sections are inaccessible.
         """
         self.size = obj_len
-        self.raw_data = bldata.read(obj_len)
+        self.raw_data = self.vi.typedesc_intern.internData(bldata.read(obj_len))
         self.raw_data_updated = True
 
     def initWithXMLInlineStart(self, td_elem):
@@ -449,9 +461,9 @@ class TDObject:
 
     @staticmethod
     def parseRSRCDataHeader(bldata):
-        obj_len = readVariableSizeFieldU2p2(bldata)
-        obj_flags = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
-        obj_type = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+        obj_len = bldata.readVarU2p2()
+        obj_flags = bldata.readU8()
+        obj_type = bldata.readU8()
         return obj_type, obj_flags, obj_len
 
     def parseRSRCData(self, bldata):
@@ -657,11 +669,11 @@ class TDObject:
         pass
 
     def getData(self):
-        bldata = BytesIO(self.raw_data)
+        bldata = BinaryReader(self.raw_data)
         return bldata
 
     def setData(self, data_buf, incomplete=False):
-        self.raw_data = data_buf
+        self.raw_data = self.vi.typedesc_intern.internData(data_buf)
         self.size = len(self.raw_data)
         if not incomplete:
             self.raw_data_updated = True
@@ -691,9 +703,7 @@ class TDObject:
             return TD_MAIN_TYPE(self.otype >> 4)
 
     def fullType(self):
-        if self.otype not in set(item.value for item in TD_FULL_TYPE):
-            return self.otype
-        return TD_FULL_TYPE(self.otype)
+        return LVlookup.enumOrIntFromValue(TD_FULL_TYPE, self.otype)
 
     def isNumber(self):
         return ( \
@@ -752,8 +762,27 @@ class TDObject:
         out_lists = { 'number': [], 'path': [], 'string': [], 'compound': [], 'other': [] }
         return out_lists
 
+    def structuralKey(self, memo=None):
+        """ Gives hashable key identifying structure of this TD.
+
+        The key is made of RAW data of the TD and keys of its clients; TDs with
+        equal keys are identical, even if they are stored in different lists.
+        The key consists of bytes and integers only, so it can be stored
+        without keeping the TD nor its VI alive.
+        """
+        return (self.otype, bytes(self.raw_data or b''), (),)
+
+    def structurallyEqual(self, td):
+        """ Returns whether given TD is identical to this one.
+        """
+        return self.structuralKey() == td.structuralKey()
+
     def __repr__(self):
-        d = self.__dict__.copy()
+        d = { 'full_name': self.full_name }
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                if hasattr(self, name):
+                    d[name] = getattr(self, name)
         del d['vi']
         del d['po']
         del d['parsed_data_updated']
@@ -766,6 +795,9 @@ class TDObject:
         return type(self).__name__ + pformat(d, indent=0, compact=True, width=512)
 
 
+TDObject.full_name = typeDescClassFullName(TDObject)
+
+
 class TDObjectContainer(TDObject):
     """ Base class for Type Descriptor which contains sub-TDs
 
@@ -773,6 +805,8 @@ class TDObjectContainer(TDObject):
     Container TD, just after container definition. Indexed - are stored in Owning List,
     at given index.
     """
+    __slots__ = ('clients',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.clients = []
@@ -864,6 +898,20 @@ class TDObjectContainer(TDObject):
             out_enum.append( (i, clientTD.index, td, clientTD.flags, ) )
         return out_enum
 
+    def structuralKey(self, memo=None):
+        # Client indexes within RAW data are only valid within the owning list, so keys of clients are included
+        if memo is None:
+            memo = {}
+        key = memo.get(id(self))
+        if key is not None:
+            return key
+        self.parseData() # Make sure the clients list is filled
+        clients_key = tuple((td_flags, td_obj.structuralKey(memo) if td_obj is not None else None,) \
+          for cli_idx, td_idx, td_obj, td_flags in self.clientsEnumerate())
+        key = (self.otype, bytes(self.raw_data or b''), clients_key,)
+        memo[id(self)] = key
+        return key
+
     def clientsRepeatCount(self):
         """ How many times the clients are repeated in this type
 
@@ -941,7 +989,7 @@ class TDObjectContainer(TDObject):
 
     def parseRSRCIndexedTD(self, bldata, tm_flags=0):
         clientTD = SimpleNamespace()
-        clientTD.index = readVariableSizeFieldU2p2(bldata)
+        clientTD.index = bldata.readVarU2p2()
         clientTD.flags = tm_flags
         obj_len = ( 2 if (clientTD.index <= 0x7fff) else 4 )
         return clientTD, obj_len
@@ -1034,6 +1082,8 @@ class TDObjectContainer(TDObject):
 class TDObjectVoid(TDObject):
     """ Type Descriptor with Void data
     """
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
 
@@ -1082,6 +1132,8 @@ class TDObjectBool(TDObjectVoid):
 
     Stores no additional data, so handling is identical to Void TypeDesc.
     """
+    __slots__ = ()
+
     pass
 
 
@@ -1090,6 +1142,8 @@ class TDObjectLVVariant(TDObjectVoid):
 
     Stores no additional data, so handling is identical to Void TypeDesc.
     """
+    __slots__ = ()
+
     pass
 
 
@@ -1099,6 +1153,8 @@ class TDObjectNumber(TDObject):
         The number can be a clear math value, but also can be physical value with
         a specific unit, or may come from an enum with each value having a label.
     """
+    __slots__ = ('values', 'prop1', 'padding1',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.values = []
@@ -1106,12 +1162,12 @@ class TDObjectNumber(TDObject):
         self.padding1 = b''
 
     def parseRSRCEnumAttr(self, bldata):
-        count = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        count = bldata.readU16()
         # Create _separate_ empty namespace for each TypeDesc
         self.values = [SimpleNamespace() for _ in range(count)]
         whole_len = 0
         for i in range(count):
-            label_len = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            label_len = bldata.readU8()
             self.values[i].label = bldata.read(label_len)
             self.values[i].intval1 = None
             self.values[i].intval2 = None
@@ -1121,12 +1177,12 @@ class TDObjectNumber(TDObject):
         pass
 
     def parseRSRCUnitsAttr(self, bldata):
-        count = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        count = bldata.readU16()
         # Create _separate_ empty namespace for each TypeDesc
         self.values = [SimpleNamespace() for _ in range(count)]
         for i in range(count):
-            intval1 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-            intval2 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+            intval1 = bldata.readU16()
+            intval2 = bldata.readU16()
             self.values[i].label = "0x{:02X}:0x{:02X}".format(intval1,intval2)
             self.values[i].intval1 = intval1
             self.values[i].intval2 = intval2
@@ -1147,7 +1203,7 @@ class TDObjectNumber(TDObject):
             self.parseRSRCUnitsAttr(bldata)
 
         if isGreaterOrEqVersion(ver, 8,0,0,1):
-            self.prop1 = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            self.prop1 = bldata.readU8()
         # No more data inside
         self.parseRSRCDataFinish(bldata)
 
@@ -1331,6 +1387,8 @@ class TDObjectCString(TDObjectVoid):
 
     Stores no additional data, so handling is identical to Void TypeDesc.
     """
+    __slots__ = ()
+
     pass
 
 
@@ -1339,12 +1397,16 @@ class TDObjectPasString(TDObjectVoid):
 
     Stores no additional data, so handling is identical to Void TypeDesc.
     """
+    __slots__ = ()
+
     pass
 
 
 class TDObjectTag(TDObject):
     """ Type Descriptor with Tag data
     """
+    __slots__ = ('prop1', 'tagType', 'variobj', 'ident',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.prop1 = 0
@@ -1358,8 +1420,8 @@ class TDObjectTag(TDObject):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        self.prop1 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
-        self.tagType = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.prop1 = bldata.readU32()
+        self.tagType = bldata.readU16()
         if isGreaterOrEqVersion(ver, 8,2,1) and \
           (isSmallerVersion(ver, 8,2,2) or isGreaterOrEqVersion(ver, 8,5,1)):
             obj = LVVariant(0, self.vi, self.blockref, self.po)
@@ -1368,7 +1430,7 @@ class TDObjectTag(TDObject):
 
         if (self.tagType == TAG_TYPE.UserDefined.value) and isGreaterOrEqVersion(ver, 8,1,1):
             # The data start with a string, 1-byte length, padded to mul of 2
-            strlen = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            strlen = bldata.readU8()
             self.ident = bldata.read(strlen)
             if ((strlen+1) % 2) > 0:
                 bldata.read(1) # Padding byte
@@ -1504,6 +1566,8 @@ class TDObjectTag(TDObject):
 class TDObjectBlob(TDObject):
     """ Type Descriptor with generic blob of data
     """
+    __slots__ = ('prop1',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.prop1 = None
@@ -1512,7 +1576,7 @@ class TDObjectBlob(TDObject):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        self.prop1 = int.from_bytes(bldata.read(4), byteorder='big', signed=False) # size of block/blob
+        self.prop1 = bldata.readU32() # size of block/blob
         # No more known data inside
         self.parseRSRCDataFinish(bldata)
 
@@ -1564,41 +1628,55 @@ class TDObjectNumberPtr(TDObjectVoid):
 
     Stores no additional data, so handling is identical to Void TypeDesc.
     """
+    __slots__ = ()
+
     pass
 
 class TDObjectString(TDObjectBlob):
     """ Type Descriptor with String data
     """
+    __slots__ = ()
+
     pass
 
 
 class TDObjectPath(TDObjectBlob):
     """ Type Descriptor with Path Object as data
     """
+    __slots__ = ()
+
     pass
 
 
 class TDObjectPicture(TDObjectBlob):
     """ Type Descriptor with Picture data
     """
+    __slots__ = ()
+
     pass
 
 
 class TDObjectSubString(TDObjectBlob):
     """ Type Descriptor with sub-string data
     """
+    __slots__ = ()
+
     pass
 
 
 class TDObjectPolyVI(TDObjectBlob):
     """ Type Descriptor with PolymorphicVI data
     """
+    __slots__ = ()
+
     pass
 
 
 class TDObjectFunction(TDObjectContainer):
     """ Type Descriptor with Function data
     """
+    __slots__ = ('fflags', 'pattern', 'field6', 'field7', 'hasThrall',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.fflags = 0
@@ -1612,34 +1690,34 @@ class TDObjectFunction(TDObjectContainer):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        count = readVariableSizeFieldU2p2(bldata)
+        count = bldata.readVarU2p2()
         # Create _separate_ empty namespace for each TypeDesc
         self.clients = []
         for i in range(count):
             clientTD, cli_len = self.parseRSRCIndexedTD(bldata)
             self.clients.append(clientTD)
         # end of MultiContainer part
-        self.fflags = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-        self.pattern = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.fflags = bldata.readU16()
+        self.pattern = bldata.readU16()
 
         if isGreaterOrEqVersion(ver, 10,0,0,stage="alpha"):
             for i in range(count):
-                cli_flags = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+                cli_flags = bldata.readU32()
                 self.clients[i].flags = cli_flags
         else:
             for i in range(count):
-                cli_flags = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+                cli_flags = bldata.readU16()
                 self.clients[i].flags = cli_flags
 
         for i in range(count):
             self.clients[i].thrallSources = []
         if isGreaterOrEqVersion(ver, 8,0,0,stage="beta"):
-            self.hasThrall = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+            self.hasThrall = bldata.readU16()
             if self.hasThrall != 0:
                 for i in range(count):
                     thrallSources = []
                     while True:
-                        k = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+                        k = bldata.readU8()
                         if k == 0:
                             break
                         if isGreaterOrEqVersion(ver, 8,2,0,stage="beta"):
@@ -1650,8 +1728,8 @@ class TDObjectFunction(TDObjectContainer):
             self.hasThrall = 0
 
         if (self.fflags & 0x0800) != 0:
-            self.field6 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
-            self.field7 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            self.field6 = bldata.readU32()
+            self.field7 = bldata.readU32()
         if (self.fflags & 0x8000) != 0:
             # If the flag is set, then the last sub-type is special - comes from here, not the standard list
             clientTD, cli_len = self.parseRSRCIndexedTD(bldata)
@@ -1832,6 +1910,8 @@ class TDObjectTypeDef(TDObjectContainer):
     TypeDescs of this type have a special support in LabView code, where type data
     is replaced by the data from nested TD. But we shouldn't need it here.
     """
+    __slots__ = ('flag1', 'labels',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.flag1 = 0
@@ -1842,7 +1922,7 @@ class TDObjectTypeDef(TDObjectContainer):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        self.flag1 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.flag1 = bldata.readU32()
 
         if isGreaterOrEqVersion(ver, 8,0,0,4):
             self.labels = readQualifiedName(bldata, self.po)
@@ -1963,6 +2043,8 @@ class TDObjectTypeDef(TDObjectContainer):
 class TDObjectArray(TDObjectContainer):
     """ Type Descriptor with Multidimentional Array data
     """
+    __slots__ = ('dimensions',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.dimensions = [ ]
@@ -1984,10 +2066,10 @@ class TDObjectArray(TDObjectContainer):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        ndimensions = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        ndimensions = bldata.readU16()
         self.dimensions = [SimpleNamespace() for _ in range(ndimensions)]
         for dim in self.dimensions:
-            flags = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            flags = bldata.readU32()
             dim.flags = flags >> 24
             dim.fixedSize = flags & 0x00FFFFFF
 
@@ -2103,6 +2185,8 @@ class TDObjectBlock(TDObjectContainer):
 
     Inherits from Container only because of further inheriting classes.
     """
+    __slots__ = ('blkSize',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.blkSize = None
@@ -2111,7 +2195,7 @@ class TDObjectBlock(TDObjectContainer):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        self.blkSize = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.blkSize = bldata.readU32()
         # No more known data inside
         self.parseRSRCDataFinish(bldata)
 
@@ -2163,6 +2247,8 @@ class TDObjectBlock(TDObjectContainer):
 class TDObjectAlignedBlock(TDObjectBlock):
     """ Type Descriptor with Aligned Block data
     """
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
 
@@ -2171,7 +2257,7 @@ class TDObjectAlignedBlock(TDObjectBlock):
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
         self.clients = []
-        self.blkSize = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.blkSize = bldata.readU32()
         for i in range(1):
             clientTD, cli_len = self.parseRSRCIndexedTD(bldata)
             self.clients.append(clientTD)
@@ -2224,6 +2310,8 @@ class TDObjectAlignedBlock(TDObjectBlock):
 class TDObjectRepeatedBlock(TDObjectContainer):
     """ Type Descriptor with data consisting of repeated Block
     """
+    __slots__ = ('numRepeats', 'dfComments',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.numRepeats = 0
@@ -2234,7 +2322,7 @@ class TDObjectRepeatedBlock(TDObjectContainer):
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
         self.clients = []
-        self.numRepeats = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.numRepeats = bldata.readU32()
         for i in range(1):
             clientTD, cli_len = self.parseRSRCIndexedTD(bldata)
             self.clients.append(clientTD)
@@ -2312,6 +2400,11 @@ class TDObjectRepeatedBlock(TDObjectContainer):
 class TDObjectRef(TDObjectContainer):
     """ Type Descriptor with Reference data
     """
+    # Properties past 'objects' are set by the ref_obj, depending on reftype
+    __slots__ = ('reftype', 'ref_obj', 'items', 'objects',
+      'assemblyName', 'ctlflags', 'dnTypeName', 'dnflags', 'field0', 'field2', 'field20', 'field24',
+      'firstclient', 'hasitem', 'ident', 'isExternal', 'itmident', 'multiItem', 'ref_flags', 'typeName',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.reftype = int(REFNUM_TYPE.Generic)
@@ -2328,7 +2421,7 @@ class TDObjectRef(TDObjectContainer):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        self.reftype = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.reftype = bldata.readU16()
         self.ref_obj = LVdatatyperef.newTDObjectRef(self.vi, self.blockref, self, self.reftype, self.po)
         if self.ref_obj is not None:
             if (self.po.verbose > 2):
@@ -2470,14 +2563,14 @@ class TDObjectRef(TDObjectContainer):
         return ret
 
     def refType(self):
-        if self.reftype not in set(item.value for item in REFNUM_TYPE):
-            return self.reftype
-        return REFNUM_TYPE(self.reftype)
+        return LVlookup.enumOrIntFromValue(REFNUM_TYPE, self.reftype)
 
 
 class TDObjectCluster(TDObjectContainer):
     """ Type Descriptor which Clusters together other TDs into a struct
     """
+    __slots__ = ('dfComments',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.dfComments = {}
@@ -2486,7 +2579,7 @@ class TDObjectCluster(TDObjectContainer):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        count = readVariableSizeFieldU2p2(bldata)
+        count = bldata.readVarU2p2()
         # Create _separate_ empty namespace for each TypeDesc
         self.clients = []
         for i in range(count):
@@ -2559,6 +2652,8 @@ class TDObjectCluster(TDObjectContainer):
 class TDObjectMeasureData(TDObject):
     """ Type Descriptor with Measurement data
     """
+    __slots__ = ('flavor',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.flavor = None
@@ -2567,7 +2662,7 @@ class TDObjectMeasureData(TDObject):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        self.flavor = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.flavor = bldata.readU16()
         # No more known data inside
         self.parseRSRCDataFinish(bldata)
 
@@ -2613,14 +2708,15 @@ class TDObjectMeasureData(TDObject):
         return ret
 
     def dtFlavor(self):
-        if self.flavor not in set(item.value for item in MEASURE_DATA_FLAVOR):
-            return self.flavor
-        return MEASURE_DATA_FLAVOR(self.flavor)
+        return LVlookup.enumOrIntFromValue(MEASURE_DATA_FLAVOR, self.flavor)
 
 
 class TDObjectFixedPoint(TDObject):
     """ Type Descriptor with Filex Point Number data
     """
+    __slots__ = ('rangeFormat', 'ranges', 'dataVersion', 'dataEncoding', 'dataEndianness', 'dataUnit',
+      'allocOv', 'leftovFlags', 'field1E', 'field20',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.rangeFormat = 0
@@ -2630,9 +2726,9 @@ class TDObjectFixedPoint(TDObject):
         # Fields oflags,otype are set at constructor, but no harm in setting them again
         self.otype, self.oflags, obj_len = TDObject.parseRSRCDataHeader(bldata)
 
-        field1C = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-        field1E = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-        field20 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        field1C = bldata.readU16()
+        field1E = bldata.readU16()
+        field20 = bldata.readU32()
 
         self.dataVersion = (field1C) & 0x0F
         self.rangeFormat = (field1C >> 4) & 0x03
@@ -2654,9 +2750,9 @@ class TDObjectFixedPoint(TDObject):
                 valtup = struct.unpack('>d', bldata.read(8))
             elif self.rangeFormat == 1:
                 if (self.field1E > 0x40) or (self.dataVersion > 0):
-                    rang.prop1 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-                    rang.prop2 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
-                    rang.prop3 = int.from_bytes(bldata.read(4), byteorder='big', signed=True)
+                    rang.prop1 = bldata.readU16()
+                    rang.prop2 = bldata.readU16()
+                    rang.prop3 = bldata.readS32()
                     valtup = struct.unpack('>d', bldata.read(8))
                 else:
                     valtup = struct.unpack('>d', bldata.read(8))
@@ -2794,6 +2890,8 @@ class TDObjectFixedPoint(TDObject):
 class TDObjectSingleContainer(TDObjectContainer):
     """ Type Descriptor which is container for one child TD
     """
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
 
@@ -3146,6 +3244,116 @@ def newOldFloat64WaveformCluster(vi, blockref, idx, obj_flags, po):
     return tdCluster
 
 
+class TypeDescInternTable:
+    """ Interning table for RAW data of Type Descriptors
+
+    Stores single instance of each distinct TD RAW data, so that identical TDs
+    share storage. Only the data is stored, so the table does not keep TDs nor
+    VIs alive. If amount of entries is limited, the table is emptied when
+    the limit is reached; data shared before stays shared.
+    """
+    def __init__(self, max_entries=None):
+        self.data = {}
+        self.max_entries = max_entries
+
+    def internData(self, data_buf):
+        """ Returns stored instance of given RAW data, storing it if not known.
+        """
+        if type(data_buf) is not bytes:
+            return data_buf
+        interned = self.data.get(data_buf)
+        if interned is None:
+            if self.max_entries is not None and len(self.data) >= self.max_entries:
+                self.data.clear()
+            self.data[data_buf] = data_buf
+            interned = data_buf
+        return interned
+
+
+class TypeDescIndex(object):
+    """ Index of Type Descriptors within consolidated list
+
+    Allows finding TDs by main type and full type without checking each entry,
+    and finding Top Level index of a TD from its flat index.
+    """
+    __slots__ = ('content', 'topLevel', 'contentLen', 'topLevelLen', 'mainTypes', 'fullTypes', 'topIndexes',)
+
+    def __init__(self, content, topLevel):
+        self.content = content
+        self.topLevel = topLevel
+        self.contentLen = len(content)
+        self.topLevelLen = len(topLevel)
+        self.mainTypes = {}
+        self.fullTypes = {}
+        self.topIndexes = {}
+        for flatIdx, clientTD in enumerate(content):
+            td = clientTD.nested
+            self.mainTypes.setdefault(td.mainType(), []).append(flatIdx)
+            self.fullTypes.setdefault(td.fullType(), []).append(flatIdx)
+        for i, flatIdx in enumerate(topLevel):
+            # Top Level indexes start at 1; a TD can be there multiple times
+            self.topIndexes.setdefault(flatIdx, []).append(i + 1)
+
+    def isValidFor(self, content, topLevel):
+        """ Returns whether the index was created for given lists, and they were not resized
+        """
+        return self.content is content and self.topLevel is topLevel and \
+          self.contentLen == len(content) and self.topLevelLen == len(topLevel)
+
+    def enumerate(self, mainType=None, fullType=None):
+        """ Gives list of TDs with given main and full type
+
+        Entries of the list are tuples of position within the result, flat index
+        and the TD itself.
+        """
+        if fullType is not None:
+            flatIdxs = self.fullTypes.get(fullType, [])
+            if mainType is not None:
+                flatIdxs = [flatIdx for flatIdx in flatIdxs if self.content[flatIdx].nested.mainType() == mainType]
+        elif mainType is not None:
+            flatIdxs = self.mainTypes.get(mainType, [])
+        else:
+            flatIdxs = range(self.contentLen)
+        return [(i, flatIdx, self.content[flatIdx].nested,) for i, flatIdx in enumerate(flatIdxs)]
+
+    def topIndexOf(self, flatIdx):
+        """ Gives Top Level index of TD at given flat index, or None if it is not on Top Level
+
+        If the TD is on Top Level multiple times, the first index is given.
+        """
+        topIdxs = self.topIndexes.get(flatIdx, None)
+        if topIdxs is None:
+            return None
+        return topIdxs[0]
+
+    def topIndexesOf(self, flatIdx):
+        """ Gives list of all Top Level indexes of TD at given flat index, in ascending order
+        """
+        return list(self.topIndexes.get(flatIdx, []))
+
+
+# Interning table shared by all VIs loaded by the process, or None if each VI has its own
+processTypeDescInternTable = None
+
+def setProcessTypeDescInterning(enable=True, max_entries=65536):
+    """ Enables or disables sharing of the TD interning table between VIs.
+
+    Affects VIs created after the call. The shared table outlives the VIs,
+    so amount of its entries is limited.
+    """
+    global processTypeDescInternTable
+    if not enable:
+        processTypeDescInternTable = None
+    elif processTypeDescInternTable is None:
+        processTypeDescInternTable = TypeDescInternTable(max_entries=max_entries)
+
+def newTypeDescInternTable():
+    """ Gives TD interning table for a new VI.
+    """
+    if processTypeDescInternTable is not None:
+        return processTypeDescInternTable
+    return TypeDescInternTable()
+
 def parseTDSingleObject(vi, blockref, bldata, pos, clients, po):
     bldata.seek(pos)
     obj_type, obj_flags, obj_len = TDObject.parseRSRCDataHeader(bldata)
@@ -3178,11 +3386,11 @@ def parseTDObject(vi, blockref, bldata, ver, po, useConsolidatedTypes=False):
         raise NotImplementedError("Unsupported TD read in ver=0x{:06X} older than LV8.0".format(encodeVersion(ver)))
     elif useConsolidatedTypes and isGreaterOrEqVersion(ver, 8,6,0,1):
         # The TD is given by index instead of directly provided data
-        topType = readVariableSizeFieldU2p2(bldata)
+        topType = bldata.readVarU2p2()
         hasTopType = 1
     else:
         # A list of TDs, with definitions directly in place; then index of top item is provided
-        varcount = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        varcount = bldata.readU32()
         if varcount > po.typedesc_list_limit:
             raise AttributeError("TD sub-types count {:d} exceeds limit"\
               .format(varcount))
@@ -3191,9 +3399,9 @@ def parseTDObject(vi, blockref, bldata, ver, po, useConsolidatedTypes=False):
             obj_idx, obj_len = parseTDSingleObject(vi, blockref, bldata, pos, clients, po)
             pos += obj_len
         bldata.seek(pos)
-        hasTopType = readVariableSizeFieldU2p2(bldata)
+        hasTopType = bldata.readVarU2p2()
         if hasTopType != 0:
-            topType = readVariableSizeFieldU2p2(bldata)
+            topType = bldata.readVarU2p2()
     if hasTopType not in (0,1,):
         raise AttributeError("TypeDesc contains HasTopType with unsupported value 0x{:X}"\
           .format(hasTopType))
@@ -13,15 +13,16 @@
 
 import enum
 import re
+import array
 import struct
 
 from hashlib import md5
-from io import BytesIO
 from types import SimpleNamespace
 from ctypes import *
 
 import pylabview.LVdatafill as LVdatafill
 import pylabview.LVmisc as LVmisc
+import pylabview.LVlookup as LVlookup
 from pylabview.LVmisc import eprint
 import pylabview.LVxml as ET
 
@@ -1454,17 +1455,34 @@ class UNRECOGNIZED_CLASS(PHONY_ENUM):
         self.name = 'Class{:04X}'.format(classId)
 
 
+# Binary layout of coordinates stored within Rect and Point nodes
+HEAP_RECT_STRUCT = struct.Struct('>hhhh')
+HEAP_POINT_STRUCT = struct.Struct('>hh')
+
+# Formats of Heap Nodes content within XML
+HEAP_INT_CONTENT_RE = re.compile(r"^([0-9A-Fx-]+)$")
+HEAP_TYPEID_CONTENT_RE = re.compile(r"^TypeID\(([0-9A-Fx-]+)\)$")
+HEAP_RECT_CONTENT_RE = re.compile(r"^\([ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+)[ ]*\)$")
+HEAP_POINT_CONTENT_RE = re.compile(r"^\([ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+)[ ]*\)$")
+HEAP_STRING_CONTENT_RE = re.compile(r"^\"(.*)\"$", re.MULTILINE|re.DOTALL)
+HEAP_BOOL_CONTENT_RE = re.compile(r"^(True|False)$")
+
+
 class HeapNode(object):
     """ Class for all objects stored in either FP or BD heap
 
     Used directly for nodes with no data inside, and used as base class for nodes
     which do store some data.
+    Heaps may consist of hundreds of thousands of nodes, so the nodes use slots
+    instead of per-instance dict, and reach VI and options via the owning section.
     """
-    def __init__(self, vi, po, parentNode, tagEn, scopeInfo):
+    __slots__ = ('section', 'attribs', 'content', 'format', 'parent', 'tagEn', 'scopeInfo',
+      'childs', 'raw_data', 'size', 'raw_data_updated', 'parsed_data_updated',)
+
+    def __init__(self, section, parentNode, tagEn, scopeInfo):
         """ Creates new Heap Node object.
         """
-        self.vi = vi
-        self.po = po
+        self.section = section
         self.attribs = {}
         self.content = None
         self.format = "inline"
@@ -1478,28 +1496,46 @@ class HeapNode(object):
         # Whether any properties have been updated and preparation of new RAW data is required
         self.parsed_data_updated = False
 
+    @property
+    def vi(self):
+        return self.section.vi
+
+    @property
+    def po(self):
+        return self.section.po
+
     def getScopeInfo(self):
-        if self.scopeInfo not in set(item.value for item in NODE_SCOPE):
-            return self.scopeInfo
-        return NODE_SCOPE(self.scopeInfo)
+        return LVlookup.enumOrIntFromValue(NODE_SCOPE, self.scopeInfo)
+
+    def markUpdated(self):
+        """ Marks the node as modified, requiring its binary data to be re-created
+
+        Needed only if delta update was enabled for the heap block; then binary
+        data of the heap is cached, and on save only nodes marked by this function
+        are re-encoded. Call it after changing attribs, content or value of the node.
+        Also drops the index and compact storage of the heap, as they might no longer
+        represent the node.
+        """
+        self.parsed_data_updated = True
+        self.section.heap_index = None
+        self.section.heap_columns = None
 
     def parseRSRCContent(self):
         pass
 
     def parseRSRCData(self, bldata, hasAttrList, sizeSpec):
-        attribs = {}
+        attribs = []
         if hasAttrList != 0:
-            count = LVmisc.readVariableSizeFieldU124(bldata)
+            count = bldata.readVarU124()
 
             if (self.po.verbose > 2):
                 print("{:s}: Heap Container start tag='{}' scopeInfo={:d} sizeSpec={:d} attrCount={:d}"\
                   .format(self.vi.src_fname, self.tagEn.name, self.scopeInfo, sizeSpec, count))
-            attribs = {}
+            attribs = []
             for i in range(count):
-                atId = LVmisc.readVariableSizeFieldS124(bldata)
-                atIntVal = LVmisc.readVariableSizeFieldS24(bldata)
-                atVal = attributeValueIntToIntOrEn(atId, atIntVal, self)
-                attribs[atId] = atVal
+                atId = bldata.readVarS124()
+                atIntVal = bldata.readVarS24()
+                attribs.append((atId, atIntVal,))
         else:
             if (self.po.verbose > 2):
                 print("{:s}: Heap Container tag='{}' scopeInfo={:d} sizeSpec={:d} noAttr"\
@@ -1512,7 +1548,7 @@ class HeapNode(object):
         elif sizeSpec <= 4:
             contentSize = sizeSpec
         elif sizeSpec == 6:
-            contentSize = LVmisc.readVariableSizeFieldU124(bldata)
+            contentSize = bldata.readVarU124()
         else:
             contentSize = 0
             eprint("{:s}: Warning: Unexpected value of SizeSpec={:d} on heap"\
@@ -1526,7 +1562,14 @@ class HeapNode(object):
         elif sizeSpec == 7:
             content = True
 
-        self.attribs = attribs
+        self.initWithRSRCFields(attribs, content)
+
+    def initWithRSRCFields(self, attribs, content):
+        """ Sets properties of the node from fields read from RSRC data
+
+        The attribs is a list of (id, integer value) pairs.
+        """
+        self.attribs = {atId: attributeValueIntToIntOrEn(atId, atIntVal, self) for atId, atIntVal in attribs}
         self.content = content
 
         try:
@@ -1538,7 +1581,7 @@ class HeapNode(object):
             HeapNode.parseRSRCContent(self)
 
     def getData(self):
-        bldata = BytesIO(self.raw_data)
+        bldata = LVmisc.BinaryReader(self.raw_data)
         return bldata
 
     def setData(self, data_buf, incomplete=False):
@@ -1555,21 +1598,18 @@ class HeapNode(object):
         if avoid_recompute and self.raw_data_updated:
             return # If we have strong raw data, and new one will be weak, then leave the strong buffer
 
-        if self.format == "inline":
-            self.updateContent()
-
-        data_buf = b''
-
-        hasAttrList = 1 if len(self.attribs) > 0 else 0
+        data_buf = LVmisc.BinaryWriter()
+        self.prepareRSRCData(data_buf)
+        self.setData(bytes(data_buf), incomplete=avoid_recompute)
 
-        if hasAttrList != 0:
-            data_buf += LVmisc.prepareVariableSizeFieldU124(len(self.attribs))
-            for atId, atVal in self.attribs.items():
-                if isinstance(atVal, enum.Enum) or isinstance(atVal, PHONY_ENUM):
-                    atVal = atVal.value
-                data_buf += LVmisc.prepareVariableSizeFieldS124(atId)
-                data_buf += LVmisc.prepareVariableSizeFieldS24(atVal)
+    def getRawTagId(self):
+        if (self.tagEn.value + 31) < 1023:
+            rawTagId = self.tagEn.value + 31
+        else:
+            rawTagId = 1023
+        return rawTagId
 
+    def getContentSizeSpec(self):
         if self.content is None:
             sizeSpec = 0
         elif isinstance(self.content, bool):
@@ -1585,29 +1625,67 @@ class HeapNode(object):
         else:
             eprint("{:s}: Warning: Unexpected type of tag content on heap"\
               .format(self.vi.src_fname))
+            sizeSpec = 0
+        return sizeSpec
 
-        if sizeSpec == 6:
-            data_buf += LVmisc.prepareVariableSizeFieldU124(len(self.content))
+    def prepareRSRCData(self, data_buf):
+        """ Appends binary data of this node to given BinaryWriter
 
-        if sizeSpec in [1,2,3,4,6]:
-            data_buf += self.content
+        Allows serializing whole heap into one buffer.
+        """
+        if self.format == "inline":
+            self.updateContent()
+
+        hasAttrList = 1 if len(self.attribs) > 0 else 0
+        sizeSpec = self.getContentSizeSpec()
+        rawTagId = self.getRawTagId()
 
         if (self.po.verbose > 2):
             print("{:s}: Heap Container tag='{}' scopeInfo={:d} sizeSpec={:d} attrCount={:d}"\
               .format(self.vi.src_fname, self.tagEn.name, self.scopeInfo, sizeSpec, len(self.attribs)))
 
-        if (self.tagEn.value + 31) < 1023:
-            rawTagId = self.tagEn.value + 31
-        else:
-            rawTagId = 1023
-
-        data_head = bytearray(2)
-        data_head[0] = ((sizeSpec & 7) << 5) | ((hasAttrList & 1) << 4) | ((self.scopeInfo & 3) << 2) | ((rawTagId >> 8) & 3)
-        data_head[1] = (rawTagId & 0xFF)
+        data_buf.writeU16(((sizeSpec & 7) << 13) | ((hasAttrList & 1) << 12) | ((self.scopeInfo & 3) << 10) | (rawTagId & 0x3FF))
         if rawTagId == 1023:
-            data_head += int(self.tagEn.value).to_bytes(4, byteorder='big', signed=True)
+            data_buf.writeS32(int(self.tagEn.value))
+
+        if hasAttrList != 0:
+            data_buf.writeVarU124(len(self.attribs))
+            for atId, atVal in self.attribs.items():
+                if isinstance(atVal, enum.Enum) or isinstance(atVal, PHONY_ENUM):
+                    atVal = atVal.value
+                data_buf.writeVarS124(atId)
+                data_buf.writeVarS24(atVal)
+
+        if sizeSpec == 6:
+            data_buf.writeVarU124(len(self.content))
 
-        self.setData(data_head+data_buf, incomplete=avoid_recompute)
+        if sizeSpec in [1,2,3,4,6]:
+            data_buf += self.content
+
+    def expectedRSRCSize(self):
+        """ Gives size of binary data of this node, without preparing the data
+
+        Content is used in its current form, without update from properties.
+        """
+        exp_whole_len = 2
+        if self.getRawTagId() == 1023:
+            exp_whole_len += 4
+
+        if len(self.attribs) > 0:
+            exp_whole_len += LVmisc.sizeOfVariableSizeFieldU124(len(self.attribs))
+            for atId, atVal in self.attribs.items():
+                if isinstance(atVal, enum.Enum) or isinstance(atVal, PHONY_ENUM):
+                    atVal = atVal.value
+                exp_whole_len += LVmisc.sizeOfVariableSizeFieldS124(atId)
+                exp_whole_len += LVmisc.sizeOfVariableSizeFieldS24(atVal)
+
+        sizeSpec = self.getContentSizeSpec()
+        if sizeSpec == 6:
+            exp_whole_len += LVmisc.sizeOfVariableSizeFieldU124(len(self.content))
+
+        if sizeSpec in [1,2,3,4,6]:
+            exp_whole_len += len(self.content)
+        return exp_whole_len
 
     def prepareContentXML(self, fname_base):
         tagText = None
@@ -1704,6 +1782,8 @@ class HeapNode(object):
 class HeapNodeStdInt(HeapNode):
     """ Class for Heap Nodes which store standard size integer value
     """
+    __slots__ = ('btlen', 'signed', 'value',)
+
     def __init__(self, *args, btlen=-1, signed=True):
         super().__init__(*args)
         self.btlen = btlen
@@ -1714,20 +1794,16 @@ class HeapNodeStdInt(HeapNode):
         if not isinstance(self.content, (bytes, bytearray,)):
             raise AttributeError("Tag '{}' of Class '{}' has no byte-like content"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
-        bldata = BytesIO(self.content)
         if self.btlen < 0:
-            btlen = len(self.content)
+            content = self.content
         else:
-            btlen = self.btlen
-        self.value = int.from_bytes(bldata.read(btlen), byteorder='big', signed=self.signed)
+            content = self.content[:self.btlen]
+        self.value = int.from_bytes(content, byteorder='big', signed=self.signed)
 
     def updateContent(self):
         if self.btlen < 0:
-            btlen = 1
-            for cklen in range(7,0,-1):
-                if self.value < -(2**(cklen*8-1)) or self.value > (2**(cklen*8-1))-1:
-                    btlen = cklen+1
-                    break
+            # Smallest length which fits the signed value, up to 8 bytes
+            btlen = min(((self.value if self.value >= 0 else ~self.value).bit_length() + 8) // 8, 8)
         else:
             btlen = self.btlen
         self.content = int(self.value).to_bytes(btlen, byteorder='big', signed=self.signed)
@@ -1736,7 +1812,7 @@ class HeapNodeStdInt(HeapNode):
         return "{:d}".format(self.value)
 
     def initContentWithXML(self, tagText):
-        tagParse = re.match("^([0-9A-Fx-]+)$", tagText)
+        tagParse = HEAP_INT_CONTENT_RE.match(tagText)
         if tagParse is None:
             raise AttributeError("Tag '{}' of Class '{}' has content with bad Integer value"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
@@ -1747,6 +1823,8 @@ class HeapNodeStdInt(HeapNode):
 class HeapNodeTypeId(HeapNodeStdInt):
     """ Class for Heap Nodes which store integer representing Heap TypeID
     """
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args, btlen=-1, signed=True)
 
@@ -1754,7 +1832,7 @@ class HeapNodeTypeId(HeapNodeStdInt):
         return "TypeID({:d})".format(self.value)
 
     def initContentWithXML(self, tagText):
-        tagParse = re.match("^TypeID\(([0-9A-Fx-]+)\)$", tagText)
+        tagParse = HEAP_TYPEID_CONTENT_RE.match(tagText)
         if tagParse is None:
             raise AttributeError("Tag '{}' of Class '{}' has content with bad TypeID value"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
@@ -1765,6 +1843,8 @@ class HeapNodeTypeId(HeapNodeStdInt):
 class HeapNodeRect(HeapNode):
     """ Class for Heap Nodes which store rectangle data - four coords
     """
+    __slots__ = ('left', 'top', 'right', 'bottom',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.left = 0
@@ -1773,25 +1853,23 @@ class HeapNodeRect(HeapNode):
         self.bottom = 0
 
     def parseRSRCContent(self):
-        bldata = BytesIO(self.content)
-        self.left = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
-        self.top = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
-        self.right = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
-        self.bottom = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
+        if isinstance(self.content, (bytes, bytearray,)) and len(self.content) == 8:
+            self.left, self.top, self.right, self.bottom = HEAP_RECT_STRUCT.unpack(self.content)
+            return
+        bldata = LVmisc.BinaryReader(self.content)
+        self.left = bldata.readS16()
+        self.top = bldata.readS16()
+        self.right = bldata.readS16()
+        self.bottom = bldata.readS16()
 
     def updateContent(self):
-        content = b''
-        content += int(self.left).to_bytes(2, byteorder='big', signed=True)
-        content += int(self.top).to_bytes(2, byteorder='big', signed=True)
-        content += int(self.right).to_bytes(2, byteorder='big', signed=True)
-        content += int(self.bottom).to_bytes(2, byteorder='big', signed=True)
-        self.content = content
+        self.content = HEAP_RECT_STRUCT.pack(self.left, self.top, self.right, self.bottom)
 
     def prepareContentXML(self, fname_base):
         return "({:d}, {:d}, {:d}, {:d})".format(self.left, self.top, self.right, self.bottom)
 
     def initContentWithXML(self, tagText):
-        tagParse = re.match("^\([ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+)[ ]*\)$", tagText)
+        tagParse = HEAP_RECT_CONTENT_RE.match(tagText)
         if tagParse is None:
             raise AttributeError("Tag '{}' of Class '{}' has content which does not match Rect definition"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
@@ -1805,27 +1883,29 @@ class HeapNodeRect(HeapNode):
 class HeapNodePoint(HeapNode):
     """ Class for Heap Nodes which store point data - two coords
     """
+    __slots__ = ('x', 'y',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.x = 0
         self.y = 0
 
     def parseRSRCContent(self):
-        bldata = BytesIO(self.content)
-        self.x = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
-        self.y = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
+        if isinstance(self.content, (bytes, bytearray,)) and len(self.content) == 4:
+            self.x, self.y = HEAP_POINT_STRUCT.unpack(self.content)
+            return
+        bldata = LVmisc.BinaryReader(self.content)
+        self.x = bldata.readS16()
+        self.y = bldata.readS16()
 
     def updateContent(self):
-        content = b''
-        content += int(self.x).to_bytes(2, byteorder='big', signed=True)
-        content += int(self.y).to_bytes(2, byteorder='big', signed=True)
-        self.content = content
+        self.content = HEAP_POINT_STRUCT.pack(self.x, self.y)
 
     def prepareContentXML(self, fname_base):
         return "({:d}, {:d})".format(self.y, self.x)
 
     def initContentWithXML(self, tagText):
-        tagParse = re.match("^\([ ]*([0-9A-Fx-]+),[ ]*([0-9A-Fx-]+)[ ]*\)$", tagText)
+        tagParse = HEAP_POINT_CONTENT_RE.match(tagText)
         if tagParse is None:
             raise AttributeError("Tag '{}' of Class '{}' has content which does not match Point definition"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
@@ -1837,6 +1917,8 @@ class HeapNodePoint(HeapNode):
 class HeapNodeString(HeapNode):
     """ Class for Heap Nodes which store string data
     """
+    __slots__ = ()
+
     def __init__(self, *args):
         super().__init__(*args)
 
@@ -1848,7 +1930,7 @@ class HeapNodeString(HeapNode):
         return "\"{:s}\"".format(valText)
 
     def initContentWithXML(self, tagText):
-        tagParse = re.match("^\"(.*)\"$", tagText, re.MULTILINE|re.DOTALL)
+        tagParse = HEAP_STRING_CONTENT_RE.match(tagText)
         if tagParse is not None:
             # The text may have been in cdata tag, there is no way to know; so unescape anyway
             valText = ET.unescape_cdata_control_chars(tagParse.group(1))
@@ -1864,6 +1946,8 @@ class HeapNodeString(HeapNode):
 class HeapNodePStrList(HeapNode):
     """ Class for Heap Nodes which store list of strings with one-byte lengths
     """
+    __slots__ = ('values',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.values = []
@@ -1872,7 +1956,7 @@ class HeapNodePStrList(HeapNode):
         if not isinstance(self.content, (bytes, bytearray,)):
             raise AttributeError("Tag '{}' of Class '{}' has no byte-like content"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
-        bldata = BytesIO(self.content)
+        bldata = LVmisc.BinaryReader(self.content)
         values = []
         while (True):
             btcount = bldata.read(1)
@@ -1926,6 +2010,8 @@ class HeapNodePStrList(HeapNode):
 class HeapNodeBool(HeapNode):
     """ Class for Heap Nodes which store boolean value
     """
+    __slots__ = ('value',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = False
@@ -1940,7 +2026,7 @@ class HeapNodeBool(HeapNode):
         return str(self.value)
 
     def initContentWithXML(self, tagText):
-        tagParse = re.match("^(True|False)$", tagText)
+        tagParse = HEAP_BOOL_CONTENT_RE.match(tagText)
         if tagParse is None:
             raise AttributeError("Tag '{}' of Class '{}' has content with bad boolean value"\
               .format(self.tagEn.name, parentTopClassEn(self.parent).name))
@@ -1954,6 +2040,8 @@ class HeapNodeTDDataFill(HeapNode):
     This node gets data before TD is available, so stores it in raw or string form.
     Then, when it becomes possible to parse that data, it is converted to value of proper type.
     """
+    __slots__ = ('td', 'value', 'raw_str',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.td = None
@@ -2003,24 +2091,24 @@ class HeapNodeTDDataFill(HeapNode):
         from pylabview.LVdatatype import TD_FULL_TYPE
         # Signed integer values are sign-extended automatically and no further processing is needed
         if tdType in (TD_FULL_TYPE.NumInt8,):
-            val = int.from_bytes(bldata.read(1), byteorder='big', signed=True)
+            val = bldata.readS8()
         elif tdType in (TD_FULL_TYPE.NumInt16,):
-            val = int.from_bytes(bldata.read(2), byteorder='big', signed=True)
+            val = bldata.readS16()
         elif tdType in (TD_FULL_TYPE.NumInt32,):
-            val = int.from_bytes(bldata.read(4), byteorder='big', signed=True)
+            val = bldata.readS32()
         elif tdType in (TD_FULL_TYPE.NumInt64,):
-            val = int.from_bytes(bldata.read(8), byteorder='big', signed=True)
+            val = bldata.readS64()
         # Unsigned integers need to be sign-extended as well, so pretend they're signed at first
         elif tdType in (TD_FULL_TYPE.NumUInt8,TD_FULL_TYPE.UnitUInt8,):
-            val = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            val = bldata.readU8()
         elif tdType in (TD_FULL_TYPE.NumUInt16,TD_FULL_TYPE.UnitUInt16,):
-            tmpbt = int.from_bytes(bldata.read(2), byteorder='big', signed=True).to_bytes(2, byteorder='big', signed=True)
+            tmpbt = bldata.readS16().to_bytes(2, byteorder='big', signed=True)
             val = int.from_bytes(tmpbt, byteorder='big', signed=False)
         elif tdType in (TD_FULL_TYPE.NumUInt32,TD_FULL_TYPE.UnitUInt32,):
-            tmpbt = int.from_bytes(bldata.read(4), byteorder='big', signed=True).to_bytes(4, byteorder='big', signed=True)
+            tmpbt = bldata.readS32().to_bytes(4, byteorder='big', signed=True)
             val = int.from_bytes(tmpbt, byteorder='big', signed=False)
         elif tdType in (TD_FULL_TYPE.NumUInt64,):
-            tmpbt = int.from_bytes(bldata.read(8), byteorder='big', signed=True).to_bytes(8, byteorder='big', signed=True)
+            tmpbt = bldata.readS64().to_bytes(8, byteorder='big', signed=True)
             val = int.from_bytes(tmpbt, byteorder='big', signed=False)
         # Float values have special reaing routines
         elif tdType in (TD_FULL_TYPE.NumFloat32,TD_FULL_TYPE.UnitFloat32,):
@@ -2109,7 +2197,7 @@ class HeapNodeTDDataFill(HeapNode):
         tdType = self.td.fullType()
         # We have two types of content, depending on TD type: text value directly in current tag, or in children
         if isinstance(self.content, (bytes, bytearray,)):
-            bldata = BytesIO(self.content)
+            bldata = LVmisc.BinaryReader(self.content)
             val = self.parseRSRCContentDirect(bldata, tdType)
             if val is not None:
                 self.value = val
@@ -2201,6 +2289,8 @@ class HeapNodeTDDataFillLeaf(HeapNode):
     This node gets content before TD is available, so stores it in raw or string form.
     Then, when parent node receives the TD reference, the content is converted to value of proper type.
     """
+    __slots__ = ('value', 'raw_str',)
+
     def __init__(self, *args):
         super().__init__(*args)
         self.value = None
@@ -2231,7 +2321,7 @@ class HeapNodeTDDataFillLeaf(HeapNode):
             return
         ret = False
         if isinstance(self.content, (bytes, bytearray,)):
-            bldata = BytesIO(self.content)
+            bldata = LVmisc.BinaryReader(self.content)
             val = self.parseRSRCContentDirect(bldata, self.parent.td.fullType())
             if val is not None:
                 self.value = val
@@ -2598,6 +2688,47 @@ NODE_DTFILLEAF_TAGS_LIST = (
     OBJ_COMPLEX_SCALAR_TAGS.OF__imaginary,
 )
 
+# Tags for which type of the Heap Node depends on parent nodes
+NODE_PARENT_DEPENDENT_TAGS_LIST = (
+    SL_SYSTEM_TAGS.SL__arrayElement,
+    OBJ_FIELD_TAGS.OF__activePlot,
+) + NODE_DTFILLEAF_TAGS_LIST
+
+def prepareNodeFactoryByTag():
+    """ Prepares dict of Heap Node classes for tags which always have the same type
+
+    If a tag is on many lists, the first one is used.
+    """
+    factoryByTag = {}
+    for tagList, nodeFactory in (
+      (NODE_RECT_TAGS_LIST, HeapNodeRect,),
+      (NODE_POINT_TAGS_LIST, HeapNodePoint,),
+      (NODE_STDINT_AUTOLEN_TAGS_LIST, HeapNodeStdInt,),
+      (NODE_STRING_TAGS_LIST, HeapNodeString,),
+      (NODE_TYPEID_TAGS_LIST, HeapNodeTypeId,),
+      (NODE_BOOL_TAGS_LIST, HeapNodeBool,),
+      (NODE_DATAFILL_TAGS_LIST, HeapNodeTDDataFill,),
+      ):
+        for tagEn in tagList:
+            factoryByTag.setdefault(tagEn, nodeFactory)
+    return factoryByTag
+
+NODE_FACTORY_BY_TAG = prepareNodeFactoryByTag()
+
+# Top classes which influence resolution of tags; other classes work the same as no class
+HEAP_RESOLVER_CLASSES = frozenset(list(CLASS_EN_TO_TAG_LIST_MAPPING.keys()) + [SL_CLASS_TAGS.SL__multiLabel])
+
+# Cache of resolveTagId() results
+HEAP_RESOLVER_CACHE = {}
+
+# Cache of resolveTagName() results
+HEAP_NAME_RESOLVER_CACHE = {}
+
+# Names used in XML for tags, attributes and classes unknown to the parser
+HEAP_UNRECOGNIZED_TAG_NAME_RE = re.compile("^Tag([0-9A-F]{4,8})$")
+HEAP_UNRECOGNIZED_ATTRIB_NAME_RE = re.compile("^Prop([0-9A-F]{4,8})$")
+HEAP_UNRECOGNIZED_CLASS_NAME_RE = re.compile("^Class([0-9A-F]{4,8})$")
+
 
 def getFrontPanelHeapIdent(hfmt):
     """ Gives 4-byte heap identifier from HEAP_FORMAT member
@@ -2655,7 +2786,15 @@ def parentTopClassEn(obj, levels=128, start=0):
         obj = obj.parent
     return SL_CLASS_TAGS.SL__oHExt
 
-def tagIdToEnum(tagId, parentNode):
+def nodeTopClassEn(obj, parentClassEn):
+    """ Return classId of top object with class, for children of given object
+
+    Allows to carry the class down while traversing the tree, instead of
+    using parentTopClassEn() for each node.
+    """
+    return obj.attribs.get(SL_SYSTEM_ATTRIB_TAGS.SL__class.value, parentClassEn)
+
+def tagIdToEnum(tagId, parentNode, classEn=None):
     # System level tags are always active; other tags depend
     # on an upper level tag which has 'class' set.
     tagEn = None
@@ -2663,7 +2802,8 @@ def tagIdToEnum(tagId, parentNode):
         tagEn = SL_SYSTEM_TAGS(tagId)
 
     if tagEn is None:
-        classEn = parentTopClassEn(parentNode)
+        if classEn is None:
+            classEn = parentTopClassEn(parentNode)
         if classEn in CLASS_EN_TO_TAG_LIST_MAPPING:
             TAG_LIST = CLASS_EN_TO_TAG_LIST_MAPPING[classEn]
             if TAG_LIST.has_value(tagId):
@@ -2686,14 +2826,15 @@ def tagEnToName(tagEn, parentNode):
         tagName = tagEn.name[4:]
     return tagName
 
-def tagNameToEnum(tagName, parentNode):
+def tagNameToEnum(tagName, parentNode, classEn=None):
     tagEn = None
 
     if SL_SYSTEM_TAGS.has_name(tagName):
         tagEn = SL_SYSTEM_TAGS[tagName]
 
     if tagEn is None:
-        classEn = parentTopClassEn(parentNode)
+        if classEn is None:
+            classEn = parentTopClassEn(parentNode)
         if classEn in CLASS_EN_TO_TAG_LIST_MAPPING:
             TAG_LIST = CLASS_EN_TO_TAG_LIST_MAPPING[classEn]
             if TAG_LIST.has_name("OF__"+tagName):
@@ -2704,15 +2845,16 @@ def tagNameToEnum(tagName, parentNode):
             tagEn = OBJ_FIELD_TAGS["OF__"+tagName]
 
     if tagEn is None:
-        tagParse = re.match("^Tag([0-9A-F]{4,8})$", tagName)
+        tagParse = HEAP_UNRECOGNIZED_TAG_NAME_RE.match(tagName)
         if tagParse is not None:
             tagEn = UNRECOGNIZED_TAG(int(tagParse.group(1), 16))
 
     return tagEn
 
 def attributeIdToName(attrId):
-    if SL_SYSTEM_ATTRIB_TAGS.has_value(attrId):
-        attrName = SL_SYSTEM_ATTRIB_TAGS(attrId).name[4:]
+    attrEn = LVlookup.enumValueTable(SL_SYSTEM_ATTRIB_TAGS).get(attrId, None)
+    if attrEn is not None:
+        attrName = attrEn.name[4:]
     else:
         attrName = 'Prop{:04X}'.format(attrId)
     return attrName
@@ -2721,7 +2863,7 @@ def attributeNameToId(attrName):
     if SL_SYSTEM_ATTRIB_TAGS.has_name("SL__"+attrName):
         attrId = SL_SYSTEM_ATTRIB_TAGS["SL__"+attrName].value
     else:
-        nameParse = re.match("^Prop([0-9A-F]{4,8})$", attrName)
+        nameParse = HEAP_UNRECOGNIZED_ATTRIB_NAME_RE.match(attrName)
         if nameParse is not None:
             attrId = int(nameParse.group(1), 16)
         else:
@@ -2729,10 +2871,13 @@ def attributeNameToId(attrName):
     return attrId
 
 def classIdToEnum(classId, obj):
+    return classIdToEnumForTag(classId, obj.tagEn if obj is not None else None)
+
+def classIdToEnumForTag(classId, tagEn):
+    """ Gives class enum for classId set in a node with given tag
+    """
     classEn = None
-    if parentNodeTagMatches(obj, (
-      OBJ_FIELD_TAGS.OF__baseListboxItemStrings,
-      )):
+    if tagEn == OBJ_FIELD_TAGS.OF__baseListboxItemStrings:
         if SL_MULTI_DIM_CLASS_TAGS.has_value(classId):
             classEn = SL_MULTI_DIM_CLASS_TAGS(classId)
     if classEn is None:
@@ -2756,7 +2901,7 @@ def classNameToEnum(className):
     elif SL_MULTI_DIM_CLASS_TAGS.has_name(className):
         classEn = SL_MULTI_DIM_CLASS_TAGS[className]
     else:
-        classParse = re.match("^Class([0-9A-F]{4,8})$", className)
+        classParse = HEAP_UNRECOGNIZED_CLASS_NAME_RE.match(className)
         if classParse is not None:
             classId = int(classParse.group(1), 16)
             classEn = UNRECOGNIZED_CLASS(classId)
@@ -2783,63 +2928,572 @@ def attributeValueStrToIntOrEn(attrId, attrStr):
         attrVal = int(attrStr, 0)
     return attrVal
 
-def autoScopeInfoFromET(elem):
+def autoScopeInfoFromET(elem, hasChilds=None):
+    """ Gives scopeInfo for Heap Node created from given XML element
+
+    If elem has no children attached, whether it has them in XML can be
+    provided in hasChilds.
+    """
     # If scopeInfo is forced by XML tag, use the one from XML
     scopeStr = elem.get("ScopeInfo")
     if scopeStr is not None:
         scopeInfo = int(scopeStr, 0)
         return NODE_SCOPE(scopeInfo)
-    if len(elem) == 0 and elem.get("elements") is None:
+    if hasChilds is None:
+        hasChilds = (len(elem) > 0)
+    if not hasChilds and elem.get("elements") is None:
         return NODE_SCOPE.TagLeaf
     return NODE_SCOPE.TagOpen
 
-def createObjectNode(vi, po, parentNode, tagEn, scopeInfo):
-    """ create new Heap Node
+def createObjectNodeFromParents(section, parentNode, tagEn, scopeInfo):
+    """ create new Heap Node, for tags which type depends on parents
 
-    Acts as a factory which selects object class based on tagEn.
+    Used as factory for tags which cannot be resolved knowing only the tag and top class.
     """
-    # Tags which have always the same type
-    if tagEn in NODE_RECT_TAGS_LIST:
-        obj = HeapNodeRect(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn in NODE_POINT_TAGS_LIST:
-        obj = HeapNodePoint(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn in NODE_STDINT_AUTOLEN_TAGS_LIST:
-        obj = HeapNodeStdInt(vi, po, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
-    elif tagEn in NODE_STRING_TAGS_LIST:
-        obj = HeapNodeString(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn in NODE_TYPEID_TAGS_LIST:
-        obj = HeapNodeTypeId(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn in NODE_BOOL_TAGS_LIST:
-        obj = HeapNodeBool(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn in NODE_DATAFILL_TAGS_LIST:
-        obj = HeapNodeTDDataFill(vi, po, parentNode, tagEn, scopeInfo)
+    obj = None
     # Tags within array
-    elif tagEn == SL_SYSTEM_TAGS.SL__arrayElement and \
-      parentNodeTagMatches(parentNode, NODE_STRING_ARRAY_TAGS_LIST):
-        obj = HeapNodeString(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn == SL_SYSTEM_TAGS.SL__arrayElement and \
-      parentNodeTagMatches(parentNode, NODE_STDINT_AUTOLEN_ARRAY_TAGS_LIST):
-        obj = HeapNodeStdInt(vi, po, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
-    elif tagEn == SL_SYSTEM_TAGS.SL__arrayElement and \
-      parentNodeTagMatches(parentNode, (OBJ_FIELD_TAGS.OF__baseListboxItemStrings,), start=1):
-        if parentNodeTagMatches(parentNode, (OBJ_MULTI_DIM_TAGS.OF__multiDimArrayElems,), start=0):
-            obj = HeapNodeString(vi, po, parentNode, tagEn, scopeInfo)
-        elif parentNodeTagMatches(parentNode, (OBJ_MULTI_DIM_TAGS.OF__multiDimArraySizes,), start=0):
-            obj = HeapNodeStdInt(vi, po, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
+    if tagEn == SL_SYSTEM_TAGS.SL__arrayElement:
+        if parentNodeTagMatches(parentNode, NODE_STRING_ARRAY_TAGS_LIST):
+            obj = HeapNodeString(section, parentNode, tagEn, scopeInfo)
+        elif parentNodeTagMatches(parentNode, NODE_STDINT_AUTOLEN_ARRAY_TAGS_LIST):
+            obj = HeapNodeStdInt(section, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
+        elif parentNodeTagMatches(parentNode, (OBJ_FIELD_TAGS.OF__baseListboxItemStrings,), start=1):
+            if parentNodeTagMatches(parentNode, (OBJ_MULTI_DIM_TAGS.OF__multiDimArrayElems,), start=0):
+                obj = HeapNodeString(section, parentNode, tagEn, scopeInfo)
+            elif parentNodeTagMatches(parentNode, (OBJ_MULTI_DIM_TAGS.OF__multiDimArraySizes,), start=0):
+                obj = HeapNodeStdInt(section, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
     # Special combinations, where tag type depends on parents
-    elif tagEn == OBJ_FIELD_TAGS.OF__buf and \
-      parentTopClassEn(parentNode) in (SL_CLASS_TAGS.SL__multiLabel,):
-        obj = HeapNodePStrList(vi, po, parentNode, tagEn, scopeInfo)
-    elif tagEn == OBJ_FIELD_TAGS.OF__activePlot and \
-      parentNodeTagMatches(parentNode, (OBJ_FIELD_TAGS.OF__ddo,)):
-        obj = HeapNodeStdInt(vi, po, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
-    elif tagEn in NODE_DTFILLEAF_TAGS_LIST and \
-      parentNodeTagMatches(parentNode, NODE_DATAFILL_TAGS_LIST):
-        obj = HeapNodeTDDataFillLeaf(vi, po, parentNode, tagEn, scopeInfo)
-    else:
-        obj = HeapNode(vi, po, parentNode, tagEn, scopeInfo)
+    elif tagEn == OBJ_FIELD_TAGS.OF__activePlot:
+        if parentNodeTagMatches(parentNode, (OBJ_FIELD_TAGS.OF__ddo,)):
+            obj = HeapNodeStdInt(section, parentNode, tagEn, scopeInfo, btlen=-1, signed=True)
+    elif tagEn in NODE_DTFILLEAF_TAGS_LIST:
+        if parentNodeTagMatches(parentNode, NODE_DATAFILL_TAGS_LIST):
+            obj = HeapNodeTDDataFillLeaf(section, parentNode, tagEn, scopeInfo)
+    if obj is None:
+        obj = HeapNode(section, parentNode, tagEn, scopeInfo)
     return obj
 
+def nodeFactoryForTag(tagEn, classEn):
+    """ Gives Heap Node factory for given tag within object of given top class
+
+    The factory is either a HeapNode class, or a function which selects the class
+    by checking parent nodes. Both accept the same arguments.
+    """
+    factory = NODE_FACTORY_BY_TAG.get(tagEn, None)
+    if factory is not None:
+        return factory
+    if tagEn == OBJ_FIELD_TAGS.OF__buf and classEn in (SL_CLASS_TAGS.SL__multiLabel,):
+        return HeapNodePStrList
+    if tagEn in NODE_PARENT_DEPENDENT_TAGS_LIST:
+        return createObjectNodeFromParents
+    return HeapNode
+
+def resolveTagId(tagId, classEn):
+    """ Gives tag enum and Heap Node factory for given tagId within given top class
+
+    Results are cached, so that the resolution is done only once for each combination.
+    Only classes which influence the resolution are distinguished in the cache.
+    """
+    if classEn in HEAP_RESOLVER_CLASSES:
+        cache_key = (classEn, tagId,)
+    else:
+        cache_key = (None, tagId,)
+    resolved = HEAP_RESOLVER_CACHE.get(cache_key, None)
+    if resolved is None:
+        tagEn = tagIdToEnum(tagId, None, classEn=classEn)
+        resolved = (tagEn, nodeFactoryForTag(tagEn, classEn),)
+        HEAP_RESOLVER_CACHE[cache_key] = resolved
+    return resolved
+
+def resolveTagName(tagName, classEn):
+    """ Gives tag enum and Heap Node factory for given XML tag name within given top class
+
+    Works like resolveTagId(), but for names used in XML. If the name is not recognized,
+    gives None as both the enum and the factory.
+    """
+    if classEn in HEAP_RESOLVER_CLASSES:
+        cache_key = (classEn, tagName,)
+    else:
+        cache_key = (None, tagName,)
+    resolved = HEAP_NAME_RESOLVER_CACHE.get(cache_key, None)
+    if resolved is None:
+        tagEn = tagNameToEnum(tagName, None, classEn=classEn)
+        if tagEn is not None:
+            resolved = (tagEn, nodeFactoryForTag(tagEn, classEn),)
+        else:
+            resolved = (None, None,)
+        HEAP_NAME_RESOLVER_CACHE[cache_key] = resolved
+    return resolved
+
+def createObjectNode(section, parentNode, tagEn, scopeInfo, classEn=None):
+    """ create new Heap Node
+
+    Acts as a factory which selects object class based on tagEn.
+    The section is the one which will own the node. The classEn is top class
+    of the parent, as given by parentTopClassEn(); computed if not provided.
+    """
+    if classEn is None:
+        classEn = parentTopClassEn(parentNode)
+    nodeFactory = nodeFactoryForTag(tagEn, classEn)
+    return nodeFactory(section, parentNode, tagEn, scopeInfo)
+
+def prepareHeapRSRCData(objects):
+    """ Prepares binary data of a heap from list of Heap Nodes
+
+    All nodes are written in one pass into a single buffer, which starts
+    with length of the heap content.
+    """
+    data_buf = LVmisc.BinaryWriter(4)
+    for obj in objects:
+        obj.prepareRSRCData(data_buf)
+    data_buf[0:4] = int(len(data_buf) - 4).to_bytes(4, byteorder='big')
+    return bytes(data_buf)
+
+def expectedHeapRSRCSize(objects):
+    """ Gives size of binary data of a heap, as prepared by prepareHeapRSRCData()
+
+    Sizes are computed without serializing the nodes.
+    """
+    exp_whole_len = 4
+    for obj in objects:
+        exp_whole_len += obj.expectedRSRCSize()
+    return exp_whole_len
+
+def prepareHeapDataCache(objects):
+    """ Prepares binary data of a heap, and returns it as HeapDataCache
+
+    Works like prepareHeapRSRCData(), but also stores offsets of the nodes,
+    and clears their modification marks.
+    """
+    data_buf = LVmisc.BinaryWriter(4)
+    offsets = []
+    for obj in objects:
+        offsets.append(len(data_buf))
+        obj.prepareRSRCData(data_buf)
+        obj.parsed_data_updated = False
+    offsets.append(len(data_buf))
+    data_buf[0:4] = int(len(data_buf) - 4).to_bytes(4, byteorder='big')
+    return HeapDataCache(objects, bytes(data_buf), offsets)
+
+class HeapDataCache(object):
+    """ Binary data of a heap section, with offsets of each Heap Node
+
+    Stores the plain (uncompressed) heap data, as last prepared, so that after
+    edits only nodes marked by HeapNode.markUpdated() need to be re-encoded;
+    their new data is spliced between unchanged parts of the buffer.
+    The cache is valid only for the nodes it was created for; if any node in
+    the list was added, removed or replaced, the whole heap has to be prepared again.
+    """
+    __slots__ = ('objects', 'data', 'offsets',)
+
+    def __init__(self, objects, data, offsets):
+        # Copy of the list, so that changes to the original are detected
+        self.objects = list(objects)
+        self.data = data
+        # Start of each node within data, plus end of the last node
+        self.offsets = offsets
+
+    def isValidFor(self, objects):
+        """ Whether the cache can be used for given list of objects
+
+        Nodes are compared by identity, so replacing a node invalidates the cache.
+        """
+        return objects == self.objects
+
+    def updatedIndexes(self):
+        """ Gives positions of nodes marked as modified
+        """
+        return [i for i, obj in enumerate(self.objects) if obj.parsed_data_updated]
+
+    def expectedSize(self):
+        """ Gives size of the heap data after update, without preparing the data
+        """
+        offsets = self.offsets
+        exp_whole_len = len(self.data)
+        for i in self.updatedIndexes():
+            exp_whole_len += self.objects[i].expectedRSRCSize() - (offsets[i+1] - offsets[i])
+        return exp_whole_len
+
+    def update(self):
+        """ Re-encodes modified nodes and splices them into the data
+
+        Returns whether the data has changed; nodes which were marked, but
+        give the same binary data as before, do not count as a change.
+        """
+        updated = self.updatedIndexes()
+        if len(updated) < 1:
+            return False
+        offsets = self.offsets
+        data_view = memoryview(self.data)
+        chunks = []
+        shifts = []
+        pos = 4
+        for i in updated:
+            obj = self.objects[i]
+            start, end = offsets[i], offsets[i+1]
+            data_buf = LVmisc.BinaryWriter()
+            obj.prepareRSRCData(data_buf)
+            obj.parsed_data_updated = False
+            if data_buf == data_view[start:end]:
+                continue
+            chunks.append(data_view[pos:start])
+            chunks.append(data_buf)
+            pos = end
+            if len(data_buf) != end - start:
+                shifts.append((i + 1, len(data_buf) - (end - start),))
+        if len(chunks) < 1:
+            return False
+        chunks.append(data_view[pos:])
+        content = b''.join(chunks)
+        self.data = int(len(content)).to_bytes(4, byteorder='big') + content
+        # Move offsets of nodes after each resized one
+        shift = 0
+        for k, (i, delta) in enumerate(shifts):
+            shift += delta
+            stop = shifts[k+1][0] if k+1 < len(shifts) else len(offsets)
+            offsets[i:stop] = [offs + shift for offs in offsets[i:stop]]
+        return True
+
+class HeapIndex(object):
+    """ Index of Heap Nodes within one heap section
+
+    Allows finding nodes by uid, class and tag without scanning the whole heap.
+    Positions of nodes within the objects list are stored as well, so offsets of
+    parent and children of a node are known without searching.
+    Closing tags are not indexed by tag, as they only mark end of the opening one.
+    """
+    __slots__ = ('objects', 'positions', 'parents', 'uids', 'classes', 'tags',)
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.positions = {}
+        self.parents = []
+        self.uids = {}
+        self.classes = {}
+        self.tags = {}
+        classAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+        uidAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__uid.value
+        scopeTagClose = NODE_SCOPE.TagClose.value
+        for i, obj in enumerate(objects):
+            self.positions[obj] = i
+            self.parents.append(self.positions.get(obj.parent, -1))
+            if obj.scopeInfo == scopeTagClose:
+                continue
+            self.tags.setdefault(obj.tagEn, []).append(obj)
+            if len(obj.attribs) < 1:
+                continue
+            classEn = obj.attribs.get(classAttrId, None)
+            if classEn is not None:
+                self.classes.setdefault(classEn, []).append(obj)
+            uid = obj.attribs.get(uidAttrId, None)
+            if uid is not None and uid not in self.uids:
+                self.uids[uid] = obj
+
+    def isValidFor(self, objects):
+        """ Whether the index can be used for given list of objects
+
+        Only detects replacing the list, or adding and removing nodes in it.
+        """
+        return objects is self.objects and len(objects) == len(self.parents)
+
+    def findByUid(self, uid):
+        """ Gives node with given uid, or None
+
+        If there are more nodes with the same uid, the first one is returned.
+        """
+        return self.uids.get(uid, None)
+
+    def findByClass(self, classEn):
+        """ Gives list of nodes which have given class set
+        """
+        return list(self.classes.get(classEn, []))
+
+    def findByTag(self, tagEn):
+        """ Gives list of nodes with given tag
+        """
+        return list(self.tags.get(tagEn, []))
+
+    def indexOf(self, obj):
+        """ Gives position of the node within objects list
+        """
+        return self.positions[obj]
+
+    def parentIndexOf(self, obj):
+        """ Gives position of parent of the node within objects list, or -1 for root
+        """
+        return self.parents[self.positions[obj]]
+
+    def childIndexesOf(self, obj):
+        """ Gives positions of children of the node within objects list
+        """
+        return [self.positions[child] for child in obj.childs]
+
+class HeapColumns(object):
+    """ Compact storage of Heap Nodes within one heap section
+
+    Instead of one object per node, properties of all nodes are stored in parallel
+    arrays, and content of the nodes is referenced by offsets within the plain
+    heap data, which is kept as one shared bytes object. Tags are stored as raw
+    ids, along with index of top class of the parent, which is required to resolve
+    them; so enums are only resolved when requested.
+    Useful for read-only analysis of heaps; HeapNode objects can be created from
+    the arrays when needed.
+    """
+    __slots__ = ('data', 'node_offsets', 'tag_ids', 'scopes', 'parents', 'contexts',
+      'attr_starts', 'attr_ids', 'attr_vals', 'size_specs', 'content_starts', 'content_ends',
+      'class_table', 'child_starts', 'child_idxs', 'objects',)
+
+    def __init__(self, bldata):
+        """ Creates the arrays by parsing heap from given BinaryReader
+
+        The heap is read from current position, and data starting with heap
+        content length is stored.
+        """
+        data_start = bldata.tell()
+        content_len = bldata.readU32()
+        # Start of each node within data, plus end of the last node
+        self.node_offsets = array.array('I')
+        self.tag_ids = array.array('i')
+        self.scopes = array.array('B')
+        self.parents = array.array('i')
+        # Index of top class of the parent within class_table
+        self.contexts = array.array('H')
+        # Range of attributes of each node within attr_ids and attr_vals
+        self.attr_starts = array.array('I')
+        self.attr_ids = array.array('i')
+        self.attr_vals = array.array('i')
+        self.size_specs = array.array('B')
+        self.content_starts = array.array('I')
+        self.content_ends = array.array('I')
+        self.class_table = [SL_CLASS_TAGS.SL__oHExt]
+        # Range of children of each node within child_idxs; created on first use
+        self.child_starts = None
+        self.child_idxs = None
+        # List of Heap Nodes the arrays were created from, or created by createNodes()
+        self.objects = None
+        class_idx = {(SL_CLASS_TAGS.SL__oHExt, None,): 0}
+
+        classAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+        scopeTagOpen = NODE_SCOPE.TagOpen.value
+        scopeTagClose = NODE_SCOPE.TagClose.value
+        parentStack = [-1]
+        contextStack = [0]
+        data_end = data_start + 4 + content_len
+        i = 0
+        pos = bldata.tell()
+        while pos < data_end:
+            self.node_offsets.append(pos - data_start)
+            cmd = bldata.readU16()
+            sizeSpec = (cmd >> 13) & 7
+            hasAttrList = (cmd >> 12) & 1
+            scopeInfo = (cmd >> 10) & 3
+            rawTagId = cmd & 0x3FF
+            if rawTagId == 1023:
+                tagId = bldata.readS32()
+            else:
+                tagId = rawTagId - 31
+
+            if scopeInfo == scopeTagClose and parentStack[-1] >= 0:
+                parentStack.pop()
+                contextStack.pop()
+
+            self.tag_ids.append(tagId)
+            self.scopes.append(scopeInfo)
+            self.parents.append(parentStack[-1])
+            self.contexts.append(contextStack[-1])
+
+            self.attr_starts.append(len(self.attr_ids))
+            classId = None
+            if hasAttrList != 0:
+                count = bldata.readVarU124()
+                for k in range(count):
+                    atId = bldata.readVarS124()
+                    atIntVal = bldata.readVarS24()
+                    self.attr_ids.append(atId)
+                    self.attr_vals.append(atIntVal)
+                    if atId == classAttrId:
+                        classId = atIntVal
+
+            if sizeSpec in (1,2,3,4,):
+                contentSize = sizeSpec
+            elif sizeSpec == 6:
+                contentSize = bldata.readVarU124()
+            else:
+                contentSize = 0
+            self.size_specs.append(sizeSpec)
+            self.content_starts.append(bldata.tell() - data_start)
+            bldata.seek(contentSize, 1)
+            self.content_ends.append(bldata.tell() - data_start)
+
+            if scopeInfo == scopeTagOpen:
+                context = contextStack[-1]
+                if classId is not None:
+                    tagEn, _ = resolveTagId(tagId, self.class_table[context])
+                    # Class enum depends only on whether the tag is a listbox item
+                    listboxTag = (tagEn == OBJ_FIELD_TAGS.OF__baseListboxItemStrings)
+                    key = (classId, listboxTag,)
+                    context = class_idx.get(key, None)
+                    if context is None:
+                        context = len(self.class_table)
+                        class_idx[key] = context
+                        self.class_table.append(classIdToEnumForTag(classId, tagEn))
+                parentStack.append(i)
+                contextStack.append(context)
+            i += 1
+            pos = bldata.tell()
+        self.node_offsets.append(pos - data_start)
+        self.attr_starts.append(len(self.attr_ids))
+        bldata.seek(data_start)
+        self.data = bldata.read(pos - data_start)
+
+    def __len__(self):
+        return len(self.tag_ids)
+
+    def isValidFor(self, objects):
+        """ Whether the arrays still represent given list of objects
+
+        Only detects replacing the list, or adding and removing nodes in it.
+        """
+        return objects is self.objects and len(objects) == len(self)
+
+    def tagEn(self, i):
+        """ Gives tag enum of node at given position
+        """
+        return resolveTagId(self.tag_ids[i], self.class_table[self.contexts[i]])[0]
+
+    def scopeInfo(self, i):
+        return self.scopes[i]
+
+    def parentIndex(self, i):
+        """ Gives position of parent of the node, or -1 for root
+        """
+        return self.parents[i]
+
+    def attribs(self, i):
+        """ Gives dict of attributes of the node, like in HeapNode.attribs
+        """
+        classAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+        attribs = {}
+        for k in range(self.attr_starts[i], self.attr_starts[i+1]):
+            atId = self.attr_ids[k]
+            if atId == classAttrId:
+                attribs[atId] = self.classEn(i)
+            else:
+                attribs[atId] = self.attr_vals[k]
+        return attribs
+
+    def classEn(self, i):
+        """ Gives class enum set in the node, or None if the node has no class
+        """
+        classAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+        classId = None
+        for k in range(self.attr_starts[i], self.attr_starts[i+1]):
+            if self.attr_ids[k] == classAttrId:
+                classId = self.attr_vals[k]
+        if classId is None:
+            return None
+        return classIdToEnumForTag(classId, self.tagEn(i))
+
+    def content(self, i):
+        """ Gives content of the node, like in HeapNode.content after parsing
+        """
+        sizeSpec = self.size_specs[i]
+        if sizeSpec == 0:
+            return False
+        elif sizeSpec == 7:
+            return True
+        start, end = self.content_starts[i], self.content_ends[i]
+        if start == end:
+            return None
+        return self.data[start:end]
+
+    def rawData(self, i):
+        """ Gives binary data of the node
+        """
+        return self.data[self.node_offsets[i]:self.node_offsets[i+1]]
+
+    def findByTag(self, tagEn):
+        """ Gives list of positions of nodes with given tag
+
+        Closing tags are not included, same as in HeapIndex.
+        """
+        scopeTagClose = NODE_SCOPE.TagClose.value
+        tagId = tagEn.value
+        return [i for i, nodeTagId in enumerate(self.tag_ids)
+          if nodeTagId == tagId and self.scopes[i] != scopeTagClose and self.tagEn(i) is tagEn]
+
+    def findByClass(self, classEn):
+        """ Gives list of positions of nodes which have given class set
+        """
+        classAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+        found = []
+        i = 0
+        for k, atId in enumerate(self.attr_ids):
+            if atId != classAttrId or self.attr_vals[k] != classEn.value:
+                continue
+            while self.attr_starts[i+1] <= k:
+                i += 1
+            nodeClassEn = self.classEn(i)
+            # Unrecognized classes are created for each node, so only their type can be compared
+            if nodeClassEn is classEn or (isinstance(classEn, PHONY_ENUM) and type(nodeClassEn) is type(classEn)):
+                found.append(i)
+        return found
+
+    def findByUid(self, uid):
+        """ Gives position of first node with given uid, or -1
+        """
+        uidAttrId = SL_SYSTEM_ATTRIB_TAGS.SL__uid.value
+        i = 0
+        for k, atId in enumerate(self.attr_ids):
+            if atId != uidAttrId or self.attr_vals[k] != uid:
+                continue
+            while self.attr_starts[i+1] <= k:
+                i += 1
+            if self.scopes[i] != NODE_SCOPE.TagClose.value:
+                return i
+        return -1
+
+    def prepareChildRanges(self):
+        """ Creates arrays with positions of children of each node
+        """
+        count = len(self)
+        child_starts = array.array('I', bytes(4 * (count + 2)))
+        for parent in self.parents:
+            child_starts[parent + 2] += 1
+        for i in range(2, count + 2):
+            child_starts[i] += child_starts[i-1]
+        child_idxs = array.array('I', bytes(4 * count))
+        # Nodes are stored in order, so positions of children are added sorted
+        for k, parent in enumerate(self.parents):
+            child_idxs[child_starts[parent + 1]] = k
+            child_starts[parent + 1] += 1
+        self.child_starts = child_starts
+        self.child_idxs = child_idxs
+
+    def childIndexesOf(self, i):
+        """ Gives positions of children of the node
+        """
+        if self.child_starts is None:
+            self.prepareChildRanges()
+        return self.child_idxs[self.child_starts[i]:self.child_starts[i+1]].tolist()
+
+    def createNodes(self, section):
+        """ Creates list of Heap Nodes from the arrays
+        """
+        objects = []
+        for i in range(len(self)):
+            parent = self.parents[i]
+            parentNode = objects[parent] if parent >= 0 else None
+            tagEn, nodeFactory = resolveTagId(self.tag_ids[i], self.class_table[self.contexts[i]])
+            obj = nodeFactory(section, parentNode, tagEn, self.scopes[i])
+            objects.append(obj)
+            if parentNode is not None:
+                parentNode.childs.append(obj)
+            attr_start, attr_end = self.attr_starts[i], self.attr_starts[i+1]
+            attribs = zip(self.attr_ids[attr_start:attr_end], self.attr_vals[attr_start:attr_end])
+            obj.initWithRSRCFields(attribs, self.content(i))
+        return objects
+
 def addObjectNodeToTree(section, parentIdx, objectIdx):
     """ put object node into tree struct
     """
@@ -138,10 +138,10 @@ class LinkObjBase:
 
         if isGreaterOrEqVersion(ver, 8,5,0,1):
             if isGreaterOrEqVersion(ver, 8,6,0,1):
-                self.linkSaveFlag = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+                self.linkSaveFlag = bldata.readU32()
                 self.appendPrintMapEntry(bldata.tell(), 4, 1, "BasicLinkSaveInfo.Flag")
             else:
-                self.linkSaveFlag = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+                self.linkSaveFlag = bldata.readU8()
                 self.appendPrintMapEntry(bldata.tell(), 1, 1, "BasicLinkSaveInfo.Flag")
         pass
 
@@ -211,7 +211,7 @@ class LinkObjBase:
 
         flagBt = 0xff
         if isGreaterOrEqVersion(ver, 14,0,0,3):
-            flagBt = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            flagBt = bldata.readU8()
             self.appendPrintMapEntry(bldata.tell(), 1, 1, "VILinkRefInfo.FlagBt")
         if flagBt != 0xff:
             self.viLinkFieldA = flagBt & 1
@@ -219,9 +219,9 @@ class LinkObjBase:
             self.viLinkField4 = flagBt >> 6
         else:
             if isGreaterOrEqVersion(ver, 8,0,0,3):
-                self.viLinkField4 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+                self.viLinkField4 = bldata.readU32()
                 self.appendPrintMapEntry(bldata.tell(), 4, 1, "VILinkRefInfo.Field4")
-                self.viLinkLibVersion = int.from_bytes(bldata.read(8), byteorder='big', signed=False)
+                self.viLinkLibVersion = bldata.readU64()
                 self.appendPrintMapEntry(bldata.tell(), 8, 1, "VILinkRefInfo.LibVersion")
             else:
                 self.viLinkField4 = 1
@@ -231,7 +231,7 @@ class LinkObjBase:
                 self.appendPrintMapEntry(bldata.tell(), 4, 1, "VILinkRefInfo.FieldB")
                 self.viLinkFieldC = bldata.read(4)
                 self.appendPrintMapEntry(bldata.tell(), 4, 1, "VILinkRefInfo.FieldC")
-                self.viLinkFieldD = int.from_bytes(bldata.read(4), byteorder='big', signed=True)
+                self.viLinkFieldD = bldata.readS32()
                 self.appendPrintMapEntry(bldata.tell(), 4, 1, "VILinkRefInfo.FieldD")
         pass
 
@@ -314,7 +314,7 @@ class LinkObjBase:
 
             start_pos = bldata.tell()
             clientTD = SimpleNamespace()
-            clientTD.index = readVariableSizeFieldU2p2(bldata)
+            clientTD.index = bldata.readVarU2p2()
             clientTD.flags = 0 # Only Type Mapped entries have it non-zero
             self.typedLinkTD = clientTD
             self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, "TypedLinkSaveInfo.TD_TypeID")
@@ -322,7 +322,7 @@ class LinkObjBase:
             self.parseVILinkRefInfo(bldata)
 
             if isGreaterOrEqVersion(ver, 12,0,0,3):
-                self.typedLinkFlags = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+                self.typedLinkFlags = bldata.readU32()
                 self.appendPrintMapEntry(bldata.tell(), 4, 1, "TypedLinkSaveInfo.Flags")
         else:
             # We cannot use parseBasicLinkSaveInfo(), but lets try keeping variables similar
@@ -453,14 +453,14 @@ class LinkObjBase:
         lnkobj_elem.set("TypedLinkFlags", "{:d}".format(self.typedLinkFlags))
 
     def parseLinkOffsetList(self, bldata):
-        count = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        count = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, "LinkOffsetList.Count")
         if count > self.po.typedesc_list_limit:
             raise RuntimeError("{:s} {} Offset List length {} exceeds limit"\
               .format(type(self).__name__, self.ident, count))
         offsetList = []
         for i in range(count):
-            offs = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            offs = bldata.readU32()
             self.appendPrintMapEntry(bldata.tell(), 4, 1, "LinkOffsetList.Offset[{}]".format(i))
             offsetList.append(offs)
         return offsetList
@@ -597,24 +597,24 @@ class LinkObjBase:
             bldata.read(4 - (bldata.tell() % 4)) # Padding bytes
 
         if isGreaterOrEqVersion(ver, 8,0,0,1):
-            self.apiLinkLibVersion = int.from_bytes(bldata.read(8), byteorder='big', signed=False)
+            self.apiLinkLibVersion = bldata.readU64()
             self.appendPrintMapEntry(bldata.tell(), 8, 1, "UDClassAPILinkCache.LibVersion")
         else:
-            self.apiLinkLibVersion = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            self.apiLinkLibVersion = bldata.readU32()
             self.appendPrintMapEntry(bldata.tell(), 4, 1, "UDClassAPILinkCache.LibVersion")
 
         if isSmallerVersion(ver, 8,0,0,4):
             bldata.read(4)
             self.appendPrintMapEntry(bldata.tell(), 4, 1, "UDClassAPILinkCache.Padding")
 
-        self.apiLinkIsInternal = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+        self.apiLinkIsInternal = bldata.readU8()
         self.appendPrintMapEntry(bldata.tell(), 1, 1, "UDClassAPILinkCache.IsInternal")
         if isGreaterOrEqVersion(ver, 8,1,0,2):
-            self.apiLinkBool2 = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            self.apiLinkBool2 = bldata.readU8()
             self.appendPrintMapEntry(bldata.tell(), 1, 1, "UDClassAPILinkCache.Bool2")
 
         if isGreaterOrEqVersion(ver, 9,0,0,2):
-            self.apiLinkCallParentNodes = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            self.apiLinkCallParentNodes = bldata.readU8()
             self.appendPrintMapEntry(bldata.tell(), 1, 1, "UDClassAPILinkCache.CallParentNodes")
         else:
             self.apiLinkCallParentNodes = 0
@@ -810,15 +810,15 @@ class LinkObjBase:
 
     def parseGILinkInfo(self, bldata):
         self.clearGILinkInfo()
-        self.giLinkProp1 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.giLinkProp1 = bldata.readU16()
         self.appendPrintMapEntry(bldata.tell(), 2, 1, "GILinkInfo.Prop1")
-        self.giLinkProp2 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.giLinkProp2 = bldata.readU16()
         self.appendPrintMapEntry(bldata.tell(), 2, 1, "GILinkInfo.Prop2")
-        self.giLinkProp3 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.giLinkProp3 = bldata.readU16()
         self.appendPrintMapEntry(bldata.tell(), 2, 1, "GILinkInfo.Prop3")
-        self.giLinkProp4 = int.from_bytes(bldata.read(2), byteorder='big', signed=False)
+        self.giLinkProp4 = bldata.readU16()
         self.appendPrintMapEntry(bldata.tell(), 2, 1, "GILinkInfo.Prop4")
-        self.giLinkProp5 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.giLinkProp5 = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, "GILinkInfo.Prop5")
 
     def prepareGILinkInfo(self, start_offs):
@@ -939,9 +939,9 @@ class LinkObjBase:
 
             self.extFuncStr = readPStr(bldata, 2, self.po)
             self.appendPrintMapEntry(bldata.tell(), 1+len(self.extFuncStr), 2, "ExtFuncLinkSaveInfo.Str")
-            self.extFuncProp3 = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            self.extFuncProp3 = bldata.readU8()
             self.appendPrintMapEntry(bldata.tell(), 1, 2, "ExtFuncLinkSaveInfo.Prop3")
-            self.extFuncProp4 = int.from_bytes(bldata.read(1), byteorder='big', signed=False)
+            self.extFuncProp4 = bldata.readU8()
             self.appendPrintMapEntry(bldata.tell(), 1, 2, "ExtFuncLinkSaveInfo.Prop4")
             if isGreaterOrEqVersion(ver, 11,0,0,3):
                 start_pos = bldata.tell()
@@ -1172,7 +1172,7 @@ class LinkObjBase:
             bldata.read(4 - (bldata.tell() % 4)) # Padding bytes
         self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, "HeapToFileSaveInfo.Str")
 
-        self.fileSaveProp3 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.fileSaveProp3 = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, "HeapToFileSaveInfo.Prop3")
 
         start_pos = bldata.tell()
@@ -1630,7 +1630,7 @@ class LinkObjVIToFileLink(LinkObjBase):
         self.appendPrintMapEntry(bldata.tell(), 4+len(self.fileLinkContent), 4, \
           "{}.Content".format(type(self).__name__))
 
-        self.fileLinkProp1 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.fileLinkProp1 = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, "{}.Prop1".format(type(self).__name__))
         pass
 
@@ -1898,7 +1898,7 @@ class LinkObjVIToMSLink(LinkObjBase):
         self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, \
           "{}.BasicLinkSaveInfo".format(type(self).__name__))
 
-        self.msLinkProp1 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.msLinkProp1 = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, "{}.Prop1".format(type(self).__name__))
 
         start_pos = bldata.tell()
@@ -2773,7 +2773,7 @@ class LinkObjVIToStaticVILink(LinkObjBase):
         self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, \
           "{}.TypedLinkSaveInfo".format(type(self).__name__))
 
-        self.viLinkProp2 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        self.viLinkProp2 = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, \
           "{}.Prop2".format(type(self).__name__))
 
@@ -3047,7 +3047,7 @@ class LinkObjNonVINonHeapToTypedefLink(LinkObjBase):
         if True:
             start_pos = bldata.tell()
             clientTD = SimpleNamespace()
-            clientTD.index = readVariableSizeFieldU2p2(bldata)
+            clientTD.index = bldata.readVarU2p2()
             clientTD.flags = 0 # Only Type Mapped entries have it non-zero
             self.typedLinkTD = clientTD
             self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, \
@@ -3427,13 +3427,13 @@ class LinkObjHeapToRCFileLink(LinkObjBase):
         self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, \
           "{}.HeapToFileSaveInfo".format(type(self).__name__))
 
-        count = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+        count = bldata.readU32()
         self.appendPrintMapEntry(bldata.tell(), 4, 1, "{}.Count".format(type(self).__name__))
         for i in range(count):
             start_pos = bldata.tell()
             tditem = SimpleNamespace()
             tditem.clients, tditem.topType = LVdatatype.parseTDObject(self.vi, self.blockref, bldata, ver, self.po)
-            tditem.prop2 = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
+            tditem.prop2 = bldata.readU32()
             self.content.append(tditem)
             self.appendPrintMapEntry(bldata.tell(), bldata.tell()-start_pos, 1, \
               "{}.TD[{}]".format(type(self).__name__,i))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+""" LabView RSRC file format support.
+
+Frozen lookup tables for enums, shared by code on hot paths.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+from types import MappingProxyType
+
+
+# Tables of enum classes which were already prepared
+ENUM_VALUE_TABLES = {}
+ENUM_LOWER_NAME_TABLES = {}
+
+def enumValueTable(EnumClass):
+    """ Gives read-only mapping from values to members of given enum
+
+    The table is prepared on first use and then shared, so that membership tests
+    do not need to iterate through the enum. Aliases map to the canonical member,
+    the same as when calling the enum with the value.
+    """
+    table = ENUM_VALUE_TABLES.get(EnumClass, None)
+    if table is None:
+        table = MappingProxyType({item.value: item for item in EnumClass})
+        ENUM_VALUE_TABLES[EnumClass] = table
+    return table
+
+def enumLowerNameTable(EnumClass):
+    """ Gives read-only mapping from lowercase names to members of given enum
+    """
+    table = ENUM_LOWER_NAME_TABLES.get(EnumClass, None)
+    if table is None:
+        # Iterate in reverse, so that first member wins if names differ only by case
+        table = MappingProxyType({item.name.lower(): item for item in reversed(list(EnumClass))})
+        ENUM_LOWER_NAME_TABLES[EnumClass] = table
+    return table
+
+def enumHasValue(EnumClass, value):
+    """ Checks whether given value is a value of any member of the enum
+    """
+    return value in enumValueTable(EnumClass)
+
+def enumOrIntFromValue(EnumClass, value):
+    """ Gives enum member for given value, or the value itself if it is not in the enum
+    """
+    return enumValueTable(EnumClass).get(value, value)
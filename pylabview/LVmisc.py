@@ -11,14 +11,27 @@ Miscellaneous generic utilities.
 # This work is licensed under the terms of the MIT license.
 # For a copy, see <https://opensource.org/licenses/MIT>.
 
+import io
 import re
 import sys
 import enum
 import math
+import time
+import json
+import struct
+import operator
+import itertools
 
 from ctypes import BigEndianStructure, Array, c_ubyte
 from collections import OrderedDict
 
+from pylabview.LVlookup import enumValueTable, enumLowerNameTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class RSRCStructure(BigEndianStructure):
     _pack_ = 1
@@ -41,6 +54,88 @@ class RSRCStructure(BigEndianStructure):
         return pformat(d, indent=0, width=160)
 
 
+class ProcessingStats(object):
+    """ Statistics of processing phases, for profiling
+
+    Gathers wall time, amount of input and output bytes and amount of processed
+    objects, for each phase and block ident. Times of nested phases are included
+    in the times of phases which contain them.
+    """
+    def __init__(self):
+        # Entries are [count, time, bytes_in, bytes_out], keyed by (phase, ident)
+        self.entries = OrderedDict()
+
+    def add(self, phase, ident, elapsed, bytes_in=0, bytes_out=0, count=1):
+        key = (phase, ident,)
+        entry = self.entries.get(key, None)
+        if entry is None:
+            entry = [0, 0.0, 0, 0]
+            self.entries[key] = entry
+        entry[0] += count
+        entry[1] += elapsed
+        entry[2] += bytes_in
+        entry[3] += bytes_out
+
+    def merge(self, other):
+        """ Adds entries from another stats object, ie. one gathered in different process
+        """
+        for (phase, ident), entry in other.entries.items():
+            self.add(phase, ident, entry[1], bytes_in=entry[2], bytes_out=entry[3], count=entry[0])
+
+    def exportList(self):
+        """ Gives list of dicts with the entries, ordered by phase and time
+        """
+        phases_order = {}
+        for phase, ident in self.entries.keys():
+            phases_order.setdefault(phase, len(phases_order))
+        stats_list = []
+        for (phase, ident), entry in sorted(self.entries.items(),
+              key=lambda itm: (phases_order[itm[0][0]], -itm[1][1],)):
+            if ident is not None:
+                ident = getPrettyStrFromRsrcType(ident)
+            stats_list.append(OrderedDict([("phase", phase), ("ident", ident), ("count", entry[0]),
+              ("time", entry[1]), ("bytes_in", entry[2]), ("bytes_out", entry[3])]))
+        return stats_list
+
+    def exportJSON(self):
+        return json.dumps(self.exportList(), indent=1)
+
+    def exportTable(self):
+        lines = ["{:24s}\t{:6s}\t{:>8s}\t{:>10s}\t{:>12s}\t{:>12s}"\
+          .format("phase","ident","count","time [s]","bytes in","bytes out")]
+        for itm in self.exportList():
+            lines.append("{:24s}\t{:6s}\t{:8d}\t{:10.4f}\t{:12d}\t{:12d}"\
+              .format(itm["phase"], itm["ident"] or "-", itm["count"], itm["time"], itm["bytes_in"], itm["bytes_out"]))
+        return "\n".join(lines)
+
+
+class StatsPhase(object):
+    """ Context manager which measures one execution of a processing phase
+
+    Does nothing if stats object is None. Bytes and objects counts can be
+    updated within the context, before the measurement is stored.
+    """
+    def __init__(self, stats, phase, ident=None, bytes_in=0):
+        self.stats = stats
+        self.phase = phase
+        self.ident = ident
+        self.bytes_in = bytes_in
+        self.bytes_out = 0
+        self.count = 1
+        self.start_time = None
+
+    def __enter__(self):
+        if self.stats is not None:
+            self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.stats is not None:
+            self.stats.add(self.phase, self.ident, time.perf_counter() - self.start_time,
+              bytes_in=self.bytes_in, bytes_out=self.bytes_out, count=self.count)
+        return False
+
+
 class LABVIEW_VERSION_STAGE(enum.Enum):
     """ Development stage fields in LabView version
     """
@@ -256,15 +351,15 @@ def isSmallerVersion(ver, *args, **kwargs):
     return not isGreaterOrEqVersion(ver, *args, **kwargs)
 
 def stringFromValEnumOrInt(EnumClass, value):
-    for en in EnumClass:
-        if value == en.value:
-            return en.name
+    en = enumValueTable(EnumClass).get(value, None)
+    if en is not None:
+        return en.name
     return str(value)
 
 def valFromEnumOrIntString(EnumClass, strval):
-    for en in EnumClass:
-        if str(strval).lower() == en.name.lower():
-            return en.value
+    en = enumLowerNameTable(EnumClass).get(str(strval).lower(), None)
+    if en is not None:
+        return en.value
     return int(strval, 0)
 
 def getFirstSetBitPos(n):
@@ -303,7 +398,7 @@ def _rol(val, l_bits, max_bits):
     return ((val & ((1 << max_bits-l_bits)-1)) << l_bits) | \
         (val >> (max_bits-l_bits) & ((1 << max_bits)-1))
 
-def crypto_xor8320_decrypt(data):
+def crypto_xor8320_decrypt_bitwise(data):
     out = bytearray(data)
     key = 0xEDB88320
     for i in range(len(out)):
@@ -312,7 +407,7 @@ def crypto_xor8320_decrypt(data):
         key = nval ^ _rol(key, 1, 32)
     return out
 
-def crypto_xor8320_encrypt(data):
+def crypto_xor8320_encrypt_bitwise(data):
     out = bytearray(data)
     key = 0xEDB88320
     for i in range(len(out)):
@@ -321,7 +416,95 @@ def crypto_xor8320_encrypt(data):
         key = nval ^ _rol(key, 1, 32)
     return out
 
-def zcomp_zeromsk8_decompress(data, usize):
+# Initial key value of XOR8320 cipher
+XOR8320_KEY_INIT = 0xEDB88320
+
+# Lowest byte of the initial key rotated by each amount, for key schedule of every 32 positions
+XOR8320_KEY_INIT_ROL_LOW = bytes(_rol(XOR8320_KEY_INIT, r, 32) & 0xff for r in range(32))
+
+# For each rotation which moves any bit of a byte into the lowest byte, table of resulting lowest byte
+XOR8320_BYTE_ROL_LOW = { r: bytes(_rol(val, r, 32) & 0xff for val in range(256))
+    for r in range(32) if any(_rol(val, r, 32) & 0xff for val in range(256)) }
+
+def crypto_xor8320_decrypt_table(data):
+    # Key depends on decrypted data, so this can only be done byte by byte; rotation is inlined
+    out = bytearray(len(data))
+    key = XOR8320_KEY_INIT
+    i = 0
+    for cval in data:
+        nval = (key ^ cval) & 0xff
+        out[i] = nval
+        i += 1
+        key = nval ^ (((key << 1) & 0xFFFFFFFF) | (key >> 31))
+    return out
+
+def crypto_xor8320_encrypt_table(data):
+    # Key at position n is the initial key rotated n times, XORed with every previous plain
+    # byte at position i rotated (n-1-i) times; since rotation repeats every 32 positions,
+    # plain bytes can be XORed within 32 lanes first, and then added to key with lookup tables
+    dataLen = len(data)
+    data = bytes(data)
+    lanesXor = bytearray(dataLen)
+    for lane in range(32):
+        lanesXor[lane::32] = bytes(itertools.accumulate(data[lane::32], operator.xor))
+    lanesXor = bytes(lanesXor)
+    key = int.from_bytes((XOR8320_KEY_INIT_ROL_LOW * ((dataLen >> 5) + 1))[:dataLen], byteorder='little')
+    for r, rolTab in XOR8320_BYTE_ROL_LOW.items():
+        if dataLen <= r + 1:
+            continue
+        rolVals = (bytes(r + 1) + lanesXor[:dataLen-r-1]).translate(rolTab)
+        key ^= int.from_bytes(rolVals, byteorder='little')
+    out = key ^ int.from_bytes(data, byteorder='little')
+    return bytearray(out.to_bytes(dataLen, byteorder='little'))
+
+def crypto_xor8320_encrypt_numpy(data):
+    # Same algorithm as the table engine, but with the lanes and lookups vectorized
+    dataLen = len(data)
+    vals = np.frombuffer(data, dtype=np.uint8)
+    lanesXor = np.zeros(((dataLen + 31) >> 5) << 5, dtype=np.uint8)
+    lanesXor[:dataLen] = vals
+    lanesXor = np.bitwise_xor.accumulate(lanesXor.reshape(-1, 32), axis=0).reshape(-1)
+    key = np.resize(np.frombuffer(XOR8320_KEY_INIT_ROL_LOW, dtype=np.uint8), dataLen)
+    for r, rolTab in XOR8320_BYTE_ROL_LOW.items():
+        if dataLen <= r + 1:
+            continue
+        key[r+1:] ^= np.frombuffer(rolTab, dtype=np.uint8)[lanesXor[:dataLen-r-1]]
+    key ^= vals
+    return bytearray(key.tobytes())
+
+# Engines for XOR8320 cipher; decryption cannot be vectorized, so NumPy engine only speeds up encryption
+XOR8320_ENGINES = {
+    'bitwise': (crypto_xor8320_decrypt_bitwise, crypto_xor8320_encrypt_bitwise,),
+    'table': (crypto_xor8320_decrypt_table, crypto_xor8320_encrypt_table,),
+}
+if np is not None:
+    XOR8320_ENGINES['numpy'] = (crypto_xor8320_decrypt_table, crypto_xor8320_encrypt_numpy,)
+
+# Below this size, NumPy call overhead exceeds the gain from vectorization
+XOR8320_NUMPY_MIN_SIZE = 1024
+
+def crypto_xor8320_select_engine(size, engine=None):
+    """ Gives name of XOR8320 engine to use for data of given size
+
+    If engine name is provided, verifies that it is available.
+    """
+    if engine is not None:
+        if engine not in XOR8320_ENGINES:
+            raise ValueError("XOR8320 cipher engine '{}' is not available".format(engine))
+        return engine
+    if 'numpy' in XOR8320_ENGINES and size >= XOR8320_NUMPY_MIN_SIZE:
+        return 'numpy'
+    return 'table'
+
+def crypto_xor8320_decrypt(data, engine=None):
+    engine = crypto_xor8320_select_engine(len(data), engine)
+    return XOR8320_ENGINES[engine][0](data)
+
+def crypto_xor8320_encrypt(data, engine=None):
+    engine = crypto_xor8320_select_engine(len(data), engine)
+    return XOR8320_ENGINES[engine][1](data)
+
+def zcomp_zeromsk8_decompress_bitwise(data, usize):
     blocksCount = usize >> 3
     remain = usize - (blocksCount << 3)
     out = bytearray()
@@ -345,7 +528,7 @@ def zcomp_zeromsk8_decompress(data, usize):
     # If size does not divide by 8, remove a few bytes at end
     return out
 
-def zcomp_zeromsk8_compress(data):
+def zcomp_zeromsk8_compress_bitwise(data):
     blocksCount = len(data) >> 3
     remain = len(data) - (blocksCount << 3)
     masks = bytearray()
@@ -369,6 +552,103 @@ def zcomp_zeromsk8_compress(data):
         masks.append(mask)
     return masks + out
 
+# Amount of set bits for each mask value
+ZEROMSK8_MASK_BITS_COUNT = bytes(bin(mask).count('1') for mask in range(256))
+
+# For each bit position, amount of set bits below that position for each mask value
+ZEROMSK8_MASK_LOWER_BITS_COUNT = tuple(bytes(bin(mask & ((1 << bit) - 1)).count('1') for mask in range(256))
+    for bit in range(8))
+
+# For each bit position, translation table which gives 0xFF for masks with the bit set, 0 otherwise
+ZEROMSK8_MASK_BIT_FILL = tuple(bytes(0xFF * ((mask >> bit) & 1) for mask in range(256))
+    for bit in range(8))
+
+# Translation table which converts every non-zero byte to 1
+ZEROMSK8_NONZERO_TRANS = bytes([0] + [1] * 255)
+
+# Mask value for each group of up to 8 bytes, after the group went through ZEROMSK8_NONZERO_TRANS
+ZEROMSK8_GROUP_MASKS = { bytes((mask >> bit) & 1 for bit in range(glen)): mask
+    for glen in range(1, 9) for mask in range(1 << glen) }
+
+def zcomp_zeromsk8_decompress_table(data, usize):
+    blocksCount = (usize + 7) >> 3
+    if blocksCount < 2:
+        return zcomp_zeromsk8_decompress_bitwise(data, usize)
+    masks = bytearray(data[:blocksCount])
+    remain = usize & 7
+    if remain > 0: # Bits beyond data size are ignored
+        masks[-1] &= (1 << remain) - 1
+    masks = bytes(masks)
+    # Position of the first non-zero value of each 8-byte group within input data
+    groupPos = list(itertools.accumulate(itertools.chain((blocksCount,), masks.translate(ZEROMSK8_MASK_BITS_COUNT))))
+    if groupPos[-1] > len(data):
+        raise IndexError("Compressed data ends before expected size")
+    src = bytes(data[:groupPos[-1]]) + bytes(8)
+    # Fill every 8th byte at once, for each position within the group
+    out = bytearray(blocksCount << 3)
+    for bit in range(8):
+        valsPos = map(operator.add, groupPos, masks.translate(ZEROMSK8_MASK_LOWER_BITS_COUNT[bit]))
+        vals = int.from_bytes(bytes(operator.itemgetter(*valsPos)(src)), byteorder='little')
+        vals &= int.from_bytes(masks.translate(ZEROMSK8_MASK_BIT_FILL[bit]), byteorder='little')
+        out[bit::8] = vals.to_bytes(blocksCount, byteorder='little')
+    del out[usize:]
+    return out
+
+def zcomp_zeromsk8_compress_table(data):
+    data = bytes(data)
+    nonzero = data.translate(ZEROMSK8_NONZERO_TRANS)
+    masks = bytearray(ZEROMSK8_GROUP_MASKS[nonzero[i:i+8]] for i in range(0, len(nonzero), 8))
+    return masks + data.replace(b'\0', b'')
+
+def zcomp_zeromsk8_decompress_numpy(data, usize):
+    blocksCount = (usize + 7) >> 3
+    masks = np.frombuffer(data, dtype=np.uint8, count=blocksCount)
+    present = np.unpackbits(masks, bitorder='little', count=usize).view(np.bool_)
+    valsCount = int(np.count_nonzero(present))
+    if blocksCount + valsCount > len(data):
+        raise IndexError("Compressed data ends before expected size")
+    out = np.zeros(usize, dtype=np.uint8)
+    out[present] = np.frombuffer(data, dtype=np.uint8, count=valsCount, offset=blocksCount)
+    return bytearray(out.tobytes())
+
+def zcomp_zeromsk8_compress_numpy(data):
+    vals = np.frombuffer(data, dtype=np.uint8)
+    present = (vals != 0)
+    masks = np.packbits(present, bitorder='little')
+    return bytearray(masks.tobytes()) + vals[present].tobytes()
+
+# Engines for ZeroMask8 compression; NumPy one is only available if the module is installed
+ZEROMSK8_ENGINES = {
+    'bitwise': (zcomp_zeromsk8_decompress_bitwise, zcomp_zeromsk8_compress_bitwise,),
+    'table': (zcomp_zeromsk8_decompress_table, zcomp_zeromsk8_compress_table,),
+}
+if np is not None:
+    ZEROMSK8_ENGINES['numpy'] = (zcomp_zeromsk8_decompress_numpy, zcomp_zeromsk8_compress_numpy,)
+
+# Below this size, NumPy call overhead exceeds the gain from vectorization
+ZEROMSK8_NUMPY_MIN_SIZE = 4096
+
+def zcomp_zeromsk8_select_engine(size, engine=None):
+    """ Gives name of ZeroMask8 engine to use for data of given size
+
+    If engine name is provided, verifies that it is available.
+    """
+    if engine is not None:
+        if engine not in ZEROMSK8_ENGINES:
+            raise ValueError("ZeroMask8 compression engine '{}' is not available".format(engine))
+        return engine
+    if 'numpy' in ZEROMSK8_ENGINES and size >= ZEROMSK8_NUMPY_MIN_SIZE:
+        return 'numpy'
+    return 'table'
+
+def zcomp_zeromsk8_decompress(data, usize, engine=None):
+    engine = zcomp_zeromsk8_select_engine(usize, engine)
+    return ZEROMSK8_ENGINES[engine][0](data, usize)
+
+def zcomp_zeromsk8_compress(data, engine=None):
+    engine = zcomp_zeromsk8_select_engine(len(data), engine)
+    return ZEROMSK8_ENGINES[engine][1](data)
+
 def readVariableSizeFieldU2p2(bldata):
     """ Reads VI field which is either 16-bit or 32-bit, depending on first bit
 
@@ -398,6 +678,13 @@ def readVariableSizeFieldS24(bldata):
         val = int.from_bytes(bldata.read(4), byteorder='big', signed=True)
     return val
 
+def sizeOfVariableSizeFieldS24(val):
+    """ Gives size of VI field prepared by prepareVariableSizeFieldS24()
+    """
+    if val >= 0x7FFF or val < -0x8000:
+        return 6
+    return 2
+
 def prepareVariableSizeFieldS24(val):
     """ Prepares data for VI field which is either 16-bit or 16+32-bit signed int, depending on value
 
@@ -420,6 +707,15 @@ def readVariableSizeFieldS124(bldata):
         val = int.from_bytes(bldata.read(4), byteorder='big', signed=True)
     return val
 
+def sizeOfVariableSizeFieldS124(val):
+    """ Gives size of VI field prepared by prepareVariableSizeFieldS124()
+    """
+    if val > 0x7FFF or val < -0x8000:
+        return 5
+    elif val > 127 or val <= -127:
+        return 3
+    return 1
+
 def prepareVariableSizeFieldS124(val):
     """ Prepares data for VI field which is either 8, 8+16 or 8+32-bit signed int, depending on value
     """
@@ -441,6 +737,15 @@ def readVariableSizeFieldU124(bldata):
         val = int.from_bytes(bldata.read(4), byteorder='big', signed=False)
     return val
 
+def sizeOfVariableSizeFieldU124(val):
+    """ Gives size of VI field prepared by prepareVariableSizeFieldU124()
+    """
+    if val >= 0xFFFF:
+        return 5
+    elif val >= 0xFE:
+        return 3
+    return 1
+
 def prepareVariableSizeFieldU124(val):
     """ Prepares data for VI field which is either 8, 8+16 or 8+32-bit unsigned int, depending on value
     """
@@ -452,6 +757,244 @@ def prepareVariableSizeFieldU124(val):
         return int(val).to_bytes(1, byteorder='big', signed=False)
     pass
 
+# Pre-compiled big endian codecs of fixed size values
+STRUCT_BE_U8 = struct.Struct('>B')
+STRUCT_BE_S8 = struct.Struct('>b')
+STRUCT_BE_U16 = struct.Struct('>H')
+STRUCT_BE_S16 = struct.Struct('>h')
+STRUCT_BE_U32 = struct.Struct('>I')
+STRUCT_BE_S32 = struct.Struct('>i')
+STRUCT_BE_U64 = struct.Struct('>Q')
+STRUCT_BE_S64 = struct.Struct('>q')
+STRUCT_BE_F32 = struct.Struct('>f')
+STRUCT_BE_F64 = struct.Struct('>d')
+
+class BinaryReader(io.BytesIO):
+    """ Cursor-based reader of binary data, compatible with BytesIO
+
+    Accepts bytes, bytearray or memoryview (ie. a slice of mmapped file), and
+    can be used in place of BytesIO wherever RSRC data is parsed. The cursor
+    is kept by BytesIO, so that plain read(), seek() and tell() stay native.
+    In addition, it provides readers of big endian values and of variable size
+    fields, which decode with pre-compiled structs instead of int.from_bytes().
+
+    When reading past end of data, integer readers return what int.from_bytes()
+    would, same as the generic readVariableSizeField*() functions; only float
+    readers raise an exception, as struct.unpack() does.
+    """
+
+    def readStruct(self, st):
+        """ Reads values described by given pre-compiled struct.Struct
+        """
+        return st.unpack(self.read(st.size))
+
+    def readU8(self):
+        buf = self.read(1)
+        try:
+            return buf[0]
+        except IndexError:
+            return 0
+
+    def readS8(self):
+        buf = self.read(1)
+        try:
+            return STRUCT_BE_S8.unpack(buf)[0]
+        except struct.error:
+            return 0
+
+    def readU16(self):
+        buf = self.read(2)
+        try:
+            return STRUCT_BE_U16.unpack(buf)[0]
+        except struct.error:
+            return int.from_bytes(buf, byteorder='big', signed=False)
+
+    def readS16(self):
+        buf = self.read(2)
+        try:
+            return STRUCT_BE_S16.unpack(buf)[0]
+        except struct.error:
+            return int.from_bytes(buf, byteorder='big', signed=True)
+
+    def readU32(self):
+        buf = self.read(4)
+        try:
+            return STRUCT_BE_U32.unpack(buf)[0]
+        except struct.error:
+            return int.from_bytes(buf, byteorder='big', signed=False)
+
+    def readS32(self):
+        buf = self.read(4)
+        try:
+            return STRUCT_BE_S32.unpack(buf)[0]
+        except struct.error:
+            return int.from_bytes(buf, byteorder='big', signed=True)
+
+    def readU64(self):
+        buf = self.read(8)
+        try:
+            return STRUCT_BE_U64.unpack(buf)[0]
+        except struct.error:
+            return int.from_bytes(buf, byteorder='big', signed=False)
+
+    def readS64(self):
+        buf = self.read(8)
+        try:
+            return STRUCT_BE_S64.unpack(buf)[0]
+        except struct.error:
+            return int.from_bytes(buf, byteorder='big', signed=True)
+
+    def readF32(self):
+        return STRUCT_BE_F32.unpack(self.read(4))[0]
+
+    def readF64(self):
+        return STRUCT_BE_F64.unpack(self.read(8))[0]
+
+    def readVarU2p2(self):
+        """ Same as readVariableSizeFieldU2p2()
+        """
+        pos = self.tell()
+        try:
+            val = STRUCT_BE_U16.unpack(self.read(2))[0]
+            if (val & 0x8000) != 0:  # 32-bit length
+                val = ((val & 0x7FFF) << 16) | STRUCT_BE_U16.unpack(self.read(2))[0]
+            return val
+        except (struct.error, IndexError):
+            # Truncated data; decode the remains the same way as the generic function
+            self.seek(pos)
+            return readVariableSizeFieldU2p2(self)
+
+    def readVarS24(self):
+        """ Same as readVariableSizeFieldS24()
+        """
+        pos = self.tell()
+        try:
+            val = STRUCT_BE_S16.unpack(self.read(2))[0]
+            if val == -0x8000:
+                val = STRUCT_BE_S32.unpack(self.read(4))[0]
+            return val
+        except (struct.error, IndexError):
+            # Truncated data; decode the remains the same way as the generic function
+            self.seek(pos)
+            return readVariableSizeFieldS24(self)
+
+    def readVarS124(self):
+        """ Same as readVariableSizeFieldS124()
+        """
+        pos = self.tell()
+        try:
+            val = self.read(1)[0]
+            if val < 0x80:
+                return val
+            if val == 0x80:
+                return STRUCT_BE_S16.unpack(self.read(2))[0]
+            if val == 0x81:
+                return STRUCT_BE_S32.unpack(self.read(4))[0]
+            return val - 0x100
+        except (struct.error, IndexError):
+            # Truncated data; decode the remains the same way as the generic function
+            self.seek(pos)
+            return readVariableSizeFieldS124(self)
+
+    def readVarU124(self):
+        """ Same as readVariableSizeFieldU124()
+        """
+        pos = self.tell()
+        try:
+            val = self.read(1)[0]
+            if val < 254:
+                return val
+            if val == 255:
+                return STRUCT_BE_U16.unpack(self.read(2))[0]
+            return STRUCT_BE_U32.unpack(self.read(4))[0]
+        except (struct.error, IndexError):
+            # Truncated data; decode the remains the same way as the generic function
+            self.seek(pos)
+            return readVariableSizeFieldU124(self)
+
+
+class BinaryWriter(bytearray):
+    """ Writer of binary data, appending to itself
+
+    Counterpart of BinaryReader; as a bytearray, it can be extended with
+    plain `+=`, and then converted to bytes once the whole buffer is ready.
+    """
+    __slots__ = ()
+
+    def writeStruct(self, st, *vals):
+        self += st.pack(*vals)
+
+    def writeU8(self, val):
+        self.append(val)
+
+    def writeS8(self, val):
+        self += STRUCT_BE_S8.pack(val)
+
+    def writeU16(self, val):
+        self += STRUCT_BE_U16.pack(val)
+
+    def writeS16(self, val):
+        self += STRUCT_BE_S16.pack(val)
+
+    def writeU32(self, val):
+        self += STRUCT_BE_U32.pack(val)
+
+    def writeS32(self, val):
+        self += STRUCT_BE_S32.pack(val)
+
+    def writeU64(self, val):
+        self += STRUCT_BE_U64.pack(val)
+
+    def writeS64(self, val):
+        self += STRUCT_BE_S64.pack(val)
+
+    def writeF32(self, val):
+        self += STRUCT_BE_F32.pack(val)
+
+    def writeF64(self, val):
+        self += STRUCT_BE_F64.pack(val)
+
+    def writeVarU2p2(self, val):
+        """ Same as prepareVariableSizeFieldU2p2()
+        """
+        if val <= 0x7FFF:
+            self += STRUCT_BE_U16.pack(val)
+        else:
+            self += STRUCT_BE_U32.pack(val | 0x80000000)
+
+    def writeVarS24(self, val):
+        """ Same as prepareVariableSizeFieldS24()
+        """
+        if val >= 0x7FFF or val < -0x8000:
+            self += b'\x80\x00'
+            self += STRUCT_BE_S32.pack(val)
+        else:
+            self += STRUCT_BE_S16.pack(val)
+
+    def writeVarS124(self, val):
+        """ Same as prepareVariableSizeFieldS124()
+        """
+        if val > 0x7FFF or val < -0x8000:
+            self.append(0x80)
+            self += STRUCT_BE_S32.pack(val)
+        elif val > 127 or val <= -127:
+            self.append(0x81)
+            self += STRUCT_BE_S16.pack(val)
+        else:
+            self.append(val & 0xFF)
+
+    def writeVarU124(self, val):
+        """ Same as prepareVariableSizeFieldU124()
+        """
+        if val >= 0xFFFF:
+            self.append(254)
+            self += STRUCT_BE_U32.pack(val)
+        elif val >= 0xFE:
+            self.append(255)
+            self += STRUCT_BE_U16.pack(val)
+        else:
+            self.append(val)
+
 def readQuadFloat(bldata):
     """ Read quad precision float value (aka FloatExt)
 
@@ -15,6 +15,7 @@ import enum
 from ctypes import *
 
 import pylabview.LVmisc as LVmisc
+import pylabview.LVlookup as LVlookup
 
 class PARTID(enum.IntEnum):
     """ Part identifiers
@@ -163,9 +164,7 @@ class PARTID(enum.IntEnum):
     GRAPH_PLOT_LEGEND	= 8019
 
 def partIdToEnum(partId):
-    if partId not in set(item.value for item in PARTID):
-        return partId
-    return PARTID(partId)
+    return LVlookup.enumOrIntFromValue(PARTID, partId)
 
 class OBJ_FLAGS(enum.IntEnum):
     """ Part ObjFlags bits
@@ -329,9 +328,7 @@ class DSINIT(enum.IntEnum):
     lRetryPCOffset	= 50
 
 def dsInitIdToEnum(dsInitId):
-    if dsInitId not in set(item.value for item in DSINIT):
-        return dsInitId
-    return DSINIT(dsInitId)
+    return LVlookup.enumOrIntFromValue(DSINIT, dsInitId)
 
 
 class DCO(LVmisc.RSRCStructure):
@@ -15,12 +15,15 @@
 import sys
 import re
 import os
+import io
 import enum
+import mmap
 import binascii
 from ctypes import *
 from hashlib import md5
 
 import pylabview.LVblock as LVblock
+import pylabview.LVdatatype as LVdatatype
 import pylabview.LVxml as ET
 from pylabview.LVmisc import *
 
@@ -217,8 +220,127 @@ def getExistingRSRCFileWithBase(filebase):
             return fname
     return ""
 
+class RSRCMappedFile(object):
+    """ Memory-mapped, read-only access to RSRC file
+
+    Provides the subset of file object interface which is used while reading
+    RSRC file, so it can replace the file handle. Additionally, readview()
+    gives a slice of the mapped file without copying the data.
+    """
+    def __init__(self, fh):
+        self.name = fh.name
+        self.mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mmap)
+        self.pos = 0
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self.pos
+        elif whence == io.SEEK_END:
+            pos += len(self.view)
+        if pos < 0:
+            raise ValueError("Negative seek position {:d}".format(pos))
+        self.pos = pos
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def readview(self, size=-1):
+        """ Read up to given amount of bytes, returning memoryview slice of the mapped file
+        """
+        start = min(self.pos, len(self.view))
+        if size is None or size < 0:
+            end = len(self.view)
+        else:
+            end = min(start + size, len(self.view))
+        self.pos = end
+        return self.view[start:end]
+
+    def read(self, size=-1):
+        return bytes(self.readview(size))
+
+    def readinto(self, b):
+        dest = memoryview(b).cast('B')
+        data = self.readview(len(dest))
+        dest[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        """ Release the mapping
+
+        Fails if any slices of the mapped file are still referenced.
+        """
+        self.view.release()
+        self.mmap.close()
+
+
+class RSRCChunkedOutput(object):
+    """ Write-only stream which keeps RSRC file as a list of buffers
+
+    Provides the subset of file object interface which is used while saving
+    RSRC file. Written buffers are referenced rather than copied, and a chunk
+    can be replaced by seeking to its start and writing data of the same size.
+    This allows updating headers after all data was prepared, and then sending
+    the file to any output stream in one forward pass.
+    """
+    def __init__(self):
+        self.chunks = []
+        self.chunk_at = {}
+        self.size = 0
+        self.pos = 0
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self.pos
+        elif whence == io.SEEK_END:
+            pos += self.size
+        if pos < 0:
+            raise ValueError("Negative seek position {:d}".format(pos))
+        self.pos = pos
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def write(self, b):
+        size = memoryview(b).nbytes
+        if self.pos == self.size:
+            self.chunk_at[self.pos] = len(self.chunks)
+            self.chunks.append(b)
+            self.size += size
+        else:
+            idx = self.chunk_at.get(self.pos, None)
+            if idx is None or memoryview(self.chunks[idx]).nbytes != size:
+                raise IOError("Re-writing data at 0x{:04X} which does not match previously written chunk".format(self.pos))
+            self.chunks[idx] = b
+        self.pos += size
+        return size
+
+    def writeTo(self, fh):
+        """ Write all chunks to given output stream, in order
+        """
+        for chunk in self.chunks:
+            fh.write(chunk)
+
+    def getvalue(self):
+        return b''.join(self.chunks)
+
+
+# Processing options which callers preparing options on their own may not have set
+VI_OPTION_DEFAULTS = (
+    ("stats", None),
+    ("mmap", False),
+    ("lazy", False),
+    ("compact_heap", False),
+    ("typed_arrays", False),
+)
+
+
 class VI():
     def __init__(self, po, rsrc_fh=None, xml_root=None, text_encoding='utf-8'):
+        for name, default in VI_OPTION_DEFAULTS:
+            setattr(po, name, getattr(po, name, default))
         self.rsrc_fh = None
         self.src_fname = ""
         self.xml_root = None
@@ -230,6 +352,7 @@ class VI():
         self.blocks = None
         self.rsrc_map = []
         self.order_names = None
+        self.typedesc_intern = LVdatatype.newTypeDescInternTable()
 
         if rsrc_fh is not None:
             self.dataSource = "rsrc"
@@ -357,6 +480,10 @@ class VI():
             else:
                 block = LVblock.Block(self, self.po)
             block.initWithRSRCEarly(block_head)
+            if self.po.lazy:
+                # Leave parsing until the block content is accessed
+                for section in block.sections.values():
+                    section.parse_pending = True
             blocks_arr.append(block)
 
         # Create Array of Block Data
@@ -369,26 +496,47 @@ class VI():
         for block in self.blocks.values():
             block.initWithRSRCLate()
 
+        if self.po.lazy and not isinstance(fh, RSRCMappedFile):
+            # Only parsing is deferred; read the data now, so that the VI can be used after the file is closed
+            for block in self.blocks.values():
+                block.readRawDataSections(section_count=0xffffffff)
+
         # Now when everything is ready, parse the blocks data
-        for block in self.blocks.values():
-            block.parseData()
+        if not self.po.lazy:
+            for block in self.blocks.values():
+                block.parseData()
 
         self.rememberRSRCNamesOrder()
 
         # Do final integrations which establish dependencies betweebn blocks
-        for block in self.blocks.values():
-            block.integrateData()
+        if not self.po.lazy:
+            for block in self.blocks.values():
+                with StatsPhase(self.po.stats, "integrateData", block.ident):
+                    block.integrateData()
 
         return (len(blocks) > 0)
 
     def readRSRC(self, fh):
-        self.rsrc_fh = fh
         self.src_fname = fh.name
+        if self.po.mmap:
+            try:
+                fh = RSRCMappedFile(fh)
+            except (io.UnsupportedOperation, ValueError, OSError) as e:
+                if (self.po.verbose > 0):
+                    print("{:s}: Memory mapping not possible, using regular reads: {}".format(self.src_fname,str(e)))
+        self.rsrc_fh = fh
         self.rsrc_map = []
-        self.readRSRCList(fh)
-        block_headers = self.readRSRCBlockInfo(fh)
-        self.readRSRCBlockData(fh, block_headers)
-        self.checkSanity()
+        with StatsPhase(self.po.stats, "readRSRCList"):
+            self.readRSRCList(fh)
+        with StatsPhase(self.po.stats, "readRSRCBlockInfo"):
+            block_headers = self.readRSRCBlockInfo(fh)
+        with StatsPhase(self.po.stats, "readRSRCBlockData") as sp:
+            self.readRSRCBlockData(fh, block_headers)
+            sp.count = len(self.blocks)
+        if not self.po.lazy:
+            # Sanity checks require parsed data; in lazy mode, only parsed blocks would be worth checking
+            with StatsPhase(self.po.stats, "checkSanity"):
+                self.checkSanity()
         pass
 
     def forceCompleteReadRSRC(self):
@@ -400,8 +548,33 @@ class VI():
         """
         for block in self.blocks.values():
             block.readRawDataSections(section_count=0xffffffff)
+        # The input file may be overwritten after this call, so it cannot stay mapped
+        self.close()
         pass
 
+    def close(self):
+        """ Releases memory mapping of the input RSRC file, if it was used
+
+        Raw data of sections which are slices of the mapped file is copied first,
+        so the VI remains usable. Without memory mapping, there is nothing to release,
+        as the input file handle is owned by the caller. Called at exit from `with`
+        statement on the VI.
+        """
+        if not isinstance(self.rsrc_fh, RSRCMappedFile):
+            return
+        for block in self.blocks.values():
+            for section in block.sections.values():
+                if isinstance(section.raw_data, memoryview):
+                    section.raw_data = section.raw_data.tobytes()
+        self.rsrc_fh.close()
+        self.rsrc_fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def rememberRSRCNamesOrder(self):
         """ Remembers information on section names order, if it is needed
 
@@ -470,7 +643,8 @@ class VI():
 
         # Do final integrations which establish dependencies betweebn blocks
         for block in self.blocks.values():
-            block.integrateData()
+            with StatsPhase(self.po.stats, "integrateData", block.ident):
+                block.integrateData()
 
         return (len(blocks) > 0)
 
@@ -729,14 +903,39 @@ class VI():
         fh.write((c_ubyte * sizeof(rsrchead)).from_buffer_copy(rsrchead))
         pass
 
+    def prepareRSRC(self):
+        """ Prepare content of the RSRC file, with all offsets and sizes computed
+
+        Returns RSRCChunkedOutput, which references raw data of the sections
+        instead of copying it.
+        """
+        with StatsPhase(self.po.stats, "updateRSRCData"):
+            self.updateRSRCData()
+        with StatsPhase(self.po.stats, "saveRSRC") as sp:
+            out = RSRCChunkedOutput()
+            all_blocks, section_names = self.saveRSRCData(out)
+            self.saveRSRCInfo(out, all_blocks, section_names)
+            self.resaveRSRCHeaders(out)
+            sp.bytes_out = out.size
+        return out
+
     def saveRSRC(self, fh):
-        self.src_fname = fh.name
-        self.updateRSRCData()
-        all_blocks, section_names = self.saveRSRCData(fh)
-        self.saveRSRCInfo(fh, all_blocks, section_names)
-        self.resaveRSRCHeaders(fh)
+        """ Save the RSRC file to given output stream
+
+        The stream is written in one forward pass, so it does not have to support
+        seeking; pipes, sockets and archive members can be used as well.
+        """
+        if hasattr(fh, 'name') and isinstance(fh.name, str):
+            self.src_fname = fh.name
+        out = self.prepareRSRC()
+        out.writeTo(fh)
         pass
 
+    def saveRSRCToBytes(self):
+        """ Save the RSRC file, returning the content as bytes object
+        """
+        return self.prepareRSRC().getvalue()
+
     def exportXMLRoot(self):
         """ Creates root of the XML export tree
         """
@@ -790,10 +989,12 @@ class VI():
         for ident, block in self.blocks.items():
             if (self.po.verbose > 0):
                 print("{}: Writing BIN block {}".format(self.src_fname,ident))
-            subelem = block.exportXMLTree(simple_bin=True)
+            with StatsPhase(self.po.stats, "exportBinBlocksXMLTree", ident):
+                subelem = block.exportXMLTree(simple_bin=True)
             elem.append(subelem)
 
-        ET.pretty_element_tree_heap(elem)
+        with StatsPhase(self.po.stats, "prettyXMLTree"):
+            ET.pretty_element_tree_heap(elem)
         return elem
 
     def exportXMLTree(self):
@@ -804,11 +1005,13 @@ class VI():
         for ident, block in self.blocks.items():
             if (self.po.verbose > 0):
                 print("{}: Writing block {}".format(self.src_fname,ident))
-            subelem = block.exportXMLTree()
+            with StatsPhase(self.po.stats, "exportXMLTree", ident):
+                subelem = block.exportXMLTree()
             elem.append(subelem)
 
         self.exportXMLOrder(elem)
-        ET.pretty_element_tree_heap(elem)
+        with StatsPhase(self.po.stats, "prettyXMLTree"):
+            ET.pretty_element_tree_heap(elem)
         return elem
 
     def checkSanity(self):
@@ -860,15 +1063,13 @@ class VI():
 
     def consolidatedTDEnumerate(self, mainType=None, fullType=None):
         VCTP = self.get_or_raise('VCTP')
-        typeList = VCTP.getContent()
-        out_list = []
-        for conn_idx, clientTD in enumerate(typeList):
-            if mainType is not None and clientTD.nested.mainType() != mainType:
-                continue
-            if fullType is not None and clientTD.nested.fullType() != fullType:
-                continue
-            out_list.append( (len(out_list), conn_idx, clientTD.nested,) )
-        return out_list
+        return VCTP.getTypeDescIndex().enumerate(mainType=mainType, fullType=fullType)
+
+    def consolidatedTDTopIndex(self, flatIdx):
+        """ Gives Top Level index of consolidated TD at given flat index, or None
+        """
+        VCTP = self.get_or_raise('VCTP')
+        return VCTP.getTypeDescIndex().topIndexOf(flatIdx)
 
     def getHeapTD(self, heapTypeId):
         DTHP = self.get('DTHP')
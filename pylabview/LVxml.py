@@ -11,7 +11,7 @@ XML input/output support. Wrapped Python libraries, with any neccessary changes.
 # For a copy, see <https://opensource.org/licenses/MIT>.
 
 import xml.etree.ElementTree as ET
-from xml.etree.ElementTree import ElementTree,Element,Comment,SubElement,XMLParser
+from xml.etree.ElementTree import ElementTree,Element,Comment,SubElement,XMLParser,ParseError
 
 class BinCompatTreeBuilder:
     """Generic element structure builder.
@@ -165,6 +165,94 @@ class CommentedTreeBuilder(BinCompatTreeBuilder):
         super().data(unescape_cdata_control_chars(data))
 
 
+class BinCompatEventBuilder(BinCompatTreeBuilder):
+    """Element builder which gives parse events instead of a tree.
+
+    Works like BinCompatTreeBuilder, including un-escaping of binary characters,
+    but elements are not attached to their parents. Once an element is processed
+    and dropped by the receiver of the events, it is released.
+    Events are ("start", elem) and ("end", elem) tuples; at the "start" event,
+    text of the element is not known yet - it is set before next event.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._events = [] # events not read yet
+
+    def close(self):
+        """Flush builder buffers."""
+        assert len(self._elem) == 0, "missing end tags"
+        assert self._last is not None, "missing toplevel element"
+        return None
+
+    def start(self, tag, attrs):
+        """Open new element and return it."""
+        self._flush()
+        self._last = elem = self._factory(tag, attrs)
+        self._elem.append(elem)
+        self._tail = 0
+        self._events.append(("start", elem,))
+        return elem
+
+    def end(self, tag):
+        """Close and return current Element."""
+        self._flush()
+        self._last = self._elem.pop()
+        assert self._last.tag == tag,\
+               "end tag mismatch (expected %s, got %s)" % (
+                   self._last.tag, tag)
+        self._tail = 1
+        self._events.append(("end", self._last,))
+        return self._last
+
+    def read_events(self):
+        """Return events gathered since last call, and forget them."""
+        events = self._events
+        self._events = []
+        return events
+
+def iterparse(source, chunk_size=65536):
+    """Incrementally parse XML document, giving start and end events.
+
+    *source* is a filename or file object containing XML data.
+
+    Unlike ElementTree.iterparse(), uses BinCompatEventBuilder, so binary
+    characters are un-escaped the same way as in parse(). Elements do not
+    have children attached.
+    """
+    close_source = False
+    if not hasattr(source, "read"):
+        source = open(source, "rb")
+        close_source = True
+    try:
+        builder = BinCompatEventBuilder()
+        parser = XMLParser(target=builder)
+        while True:
+            data = source.read(chunk_size)
+            if not data:
+                break
+            parser.feed(data)
+            yield from builder.read_events()
+        parser.close()
+        yield from builder.read_events()
+    finally:
+        if close_source:
+            source.close()
+
+def iterwalk(elem):
+    """Walk through element tree, giving the same events as iterparse().
+    """
+    yield ("start", elem,)
+    stack = [(elem, iter(elem),)]
+    while len(stack) > 0:
+        parent, subelems = stack[-1]
+        subelem = next(subelems, None)
+        if subelem is None:
+            stack.pop()
+            yield ("end", parent,)
+            continue
+        yield ("start", subelem,)
+        stack.append((subelem, iter(subelem),))
+
 def parse(source, parser=None):
     """Parse XML document into element tree.
 
@@ -217,8 +305,8 @@ def unescape_cdata_custom_chars(text, ccList):
     """ un-escape character data
     """
     try:
-        if True:
-            import string
+        # All escaped chars start the same way; most texts have none
+        if "&#x" in text:
             for i in ccList:
                 text = text.replace("&#x{:02X};".format(i), chr(i))
         return text
@@ -334,6 +422,66 @@ def pretty_element_tree_heap(elem, level=0):
         pretty_element_tree_heap(subelem, level+1)
     pass
 
+class HeapXMLWriter:
+    """ Incremental writer of LV Heap XML data.
+
+    Writes elements one by one, as they are provided, so that the whole tree
+    never has to be in memory. Elements given to this writer should not have
+    sub-elements; their children are provided by next calls instead.
+    Output is the same as from ElementTree.write() of a tree prettied by
+    pretty_element_tree_heap().
+    """
+    def __init__(self, fh, encoding='utf-8', flush_len=4096):
+        self.fh = fh
+        self.encoding = encoding
+        self.flush_len = flush_len
+        self._data = []
+
+    def write(self, text):
+        self._data.append(text)
+        if len(self._data) >= self.flush_len:
+            self.flush()
+
+    def flush(self):
+        self.fh.write("".join(self._data).encode(self.encoding, "xmlcharrefreplace"))
+        self._data = []
+
+    def writeDeclaration(self):
+        self.write("<?xml version='1.0' encoding='{:s}'?>\n".format(self.encoding))
+
+    def writeStartTag(self, elem):
+        self.write("<" + elem.tag)
+        for k, v in elem.items():
+            self.write(" {:s}=\"{:s}\"".format(k, _escape_attrib(v)))
+
+    def writeLeaf(self, elem, level):
+        """ Writes element which has no children
+        """
+        self.writeStartTag(elem)
+        if elem.text:
+            self.write(">")
+            self.write(_escape_cdata(elem.text))
+            self.write("</" + elem.tag + ">")
+        else:
+            self.write(" />")
+        self.write("\n" + "  " * level)
+
+    def startElement(self, elem, level):
+        """ Writes opening of an element which has children
+        """
+        self.writeStartTag(elem)
+        self.write(">")
+        if elem.text is None:
+            self.write("\n" + "  " * (level+1))
+        elif elem.text:
+            self.write(_escape_cdata(elem.text))
+
+    def endElement(self, tag, level):
+        """ Writes closing of an element which has children
+        """
+        self.write("</" + tag + ">")
+        self.write("\n" + "  " * level)
+
 def safe_store_element_text(elem, text):
     elem.text = text
 
@@ -22,6 +22,7 @@ import os
 import argparse
 import enum
 import copy
+import weakref
 from types import SimpleNamespace
 from PIL import Image
 
@@ -2020,6 +2021,38 @@ def TypeDesc_equivalent(RSRC, fo, po, TypeDesc1, TypeDesc2, FlatTypeDescList, sa
     #TODO support more types
     return True
 
+def TypeDesc_key(RSRC, fo, po, TypeDesc, FlatTypeDescList, sameLabels=False, keyCache=None):
+    """ Gives hashable key of type description, for finding equivalent ones
+
+    Equivalent type descriptions, as compared by TypeDesc_equivalent(), always
+    get equal keys. Keys of Flat TDs referenced by the TD are stored in
+    keyCache dict, if provided.
+    """
+    if TypeDesc is None:
+        return None
+    tdType = TypeDesc.get("Type")
+    tdKey = [tdType]
+    if sameLabels:
+        tdKey.append(TypeDesc.get("Label"))
+    if tdType in ("Cluster","Array",):
+        for tdSubTDMap in TypeDesc.findall("./TypeDesc"):
+            tdSubTypeDesc, _, _ = getTypeDescFromMapUsingList(FlatTypeDescList, tdSubTDMap, po)
+            if keyCache is not None and tdSubTypeDesc in keyCache:
+                tdSubKey = keyCache[tdSubTypeDesc]
+            else:
+                tdSubKey = TypeDesc_key(RSRC, fo, po, tdSubTypeDesc, FlatTypeDescList, sameLabels=sameLabels, keyCache=keyCache)
+                if keyCache is not None and tdSubTypeDesc is not None:
+                    keyCache[tdSubTypeDesc] = tdSubKey
+            tdKey.append(tdSubKey)
+    elif tdType in ("TypeDef",):
+        tdSubTypeDesc = TypeDesc.find("./TypeDesc")
+        tdKey.append(TypeDesc_key(RSRC, fo, po, tdSubTypeDesc, FlatTypeDescList, sameLabels=sameLabels, keyCache=keyCache))
+    elif tdType == "Refnum":
+        # Items are equivalent if attributes of one are included in the other, so only the count can be used
+        tdKey.append(TypeDesc.get("RefType"))
+        tdKey.append(len(TypeDesc.findall("./Item")))
+    return tuple(tdKey)
+
 def TypeDesc_find_unused_ranges(RSRC, fo, po, skipRm=[], VCTP_TypeDescList=None, VCTP_FlatTypeDescList=None):
     """ Searches through all TDs, looking for unused items
 
@@ -2330,14 +2363,57 @@ def VCTP_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=None):
     VCTP.insert(proper_flatPos,dstTypeDesc)
     return dstTypeDesc, len(VCTP_FlatTypeDescList)
 
+# Indexes of Flat TDs within VCTP sections, kept between calls to VCTP_find_or_add_TypeDesc_copy()
+VCTP_TypeDesc_indexes = weakref.WeakKeyDictionary()
+
+def VCTP_get_TypeDesc_index(RSRC, fo, po, VCTP, VCTP_FlatTypeDescList):
+    """ Gives index of Flat TDs within VCTP, by TypeDesc_key() with same labels
+
+    Returns namespace with the indexed flat list, keys cache, and buckets of
+    FlatTypeIDs for each key. Index from previous call is extended if TDs were
+    only added at end of the flat list; otherwise, it is re-created. Changes
+    within TDs which are already listed are not detected; functions making
+    such changes must call VCTP_drop_TypeDesc_index().
+    """
+    tdIndex = VCTP_TypeDesc_indexes.get(VCTP)
+    if tdIndex is not None:
+        # Elements are compared by identity
+        if tdIndex.flatList != VCTP_FlatTypeDescList[:len(tdIndex.flatList)]:
+            tdIndex = None
+    if tdIndex is None:
+        tdIndex = SimpleNamespace(flatList=[], keyCache={}, buckets={})
+        VCTP_TypeDesc_indexes[VCTP] = tdIndex
+    for flatTypeID in range(len(tdIndex.flatList), len(VCTP_FlatTypeDescList)):
+        flatTypeDesc = VCTP_FlatTypeDescList[flatTypeID]
+        tdKey = tdIndex.keyCache.get(flatTypeDesc)
+        if tdKey is None:
+            tdKey = TypeDesc_key(RSRC, fo, po, flatTypeDesc, VCTP_FlatTypeDescList, sameLabels=True, keyCache=tdIndex.keyCache)
+            tdIndex.keyCache[flatTypeDesc] = tdKey
+        tdIndex.buckets.setdefault(tdKey, []).append(flatTypeID)
+        tdIndex.flatList.append(flatTypeDesc)
+    return tdIndex
+
+def VCTP_drop_TypeDesc_index(VCTP):
+    """ Drops index of Flat TDs within VCTP, after listed TDs were modified
+    """
+    VCTP_TypeDesc_indexes.pop(VCTP, None)
+
 def VCTP_find_or_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=None):
+    """ Finds TD equivalent to given one in VCTP Flat Types List, or adds a copy
+
+    Returns the TD from VCTP, and its FlatTypeID. Candidates are found by
+    TypeDesc_key(), then verified with TypeDesc_equivalent().
+    """
     if VCTP is None:
         VCTP = RSRC.find("./VCTP/Section")
     if VCTP is None:
         return None, None
     dstTypeDesc, dstTypeID = None, None
     VCTP_FlatTypeDescList = VCTP.findall("./TypeDesc")
-    for cmpTypeID, cmpTypeDesc in enumerate(VCTP_FlatTypeDescList):
+    tdIndex = VCTP_get_TypeDesc_index(RSRC, fo, po, VCTP, VCTP_FlatTypeDescList)
+    srcKey = TypeDesc_key(RSRC, fo, po, srcTypeDesc, VCTP_FlatTypeDescList, sameLabels=True, keyCache=tdIndex.keyCache)
+    for cmpTypeID in tdIndex.buckets.get(srcKey, []):
+        cmpTypeDesc = VCTP_FlatTypeDescList[cmpTypeID]
         if (TypeDesc_equivalent(RSRC, fo, po, cmpTypeDesc, srcTypeDesc, VCTP_FlatTypeDescList, sameLabels=True)):
             dstTypeDesc, dstTypeID = cmpTypeDesc, cmpTypeID
             break
@@ -7034,6 +7110,8 @@ def CPC2_Fix(RSRC, CPC2, ver, fo, po):
             elem = ET.SubElement(TypeDesc_elem, "TypeDesc")
             elem.set("TypeID","{:d}".format(FlatTypeID))
             elem.set("Flags","0x{:04x}".format(FlatTDFlags & ~0x0401)) # checked on one example only
+        # Clients were added to TD which is already on the flat list
+        VCTP_drop_TypeDesc_index(VCTP)
         # Now add a top type which references our new flat type
         VCTP_TopLevel = VCTP.find("./TopLevel")
         proper_typeID = getMaxIndexFromList(VCTP_TypeDescList, fo, po) + 1
@@ -19,7 +19,12 @@ __license__ = "MIT"
 import sys
 import re
 import os
+import io
+import copy
+import time
 import argparse
+import contextlib
+import concurrent.futures
 
 if __name__ == "__main__":
     # allow execution from CWD, without package install
@@ -27,78 +32,13 @@ if __name__ == "__main__":
 
 import pylabview.LVxml as ET
 from pylabview.LVrsrcontainer import *
-from pylabview.LVmisc import eprint
+from pylabview.LVcache import ExtractCacheEntry
+from pylabview.LVmisc import eprint, ProcessingStats
 
 
-def main():
-    """ Main executable function.
-
-    Its task is to parse command line options and call a function which performs requested command.
+def setFileBase(po):
+    """ Sets base name of the processed file, without path and extension.
     """
-    # Parse command line options
-
-    parser = argparse.ArgumentParser(description=__doc__)
-
-    parser.add_argument('-i', '--rsrc', '--vi', default="", type=str,
-            help="name of the LabView RSRC file, VI or other")
-
-    parser.add_argument('-m', '--xml', default="", type=str,
-            help="name of the main XML file of extracted VI dataset;" \
-            "default is RSRC file name with extension changed to xml")
-
-    parser.add_argument('-v', '--verbose', action='count', default=0,
-            help="increases verbosity level; max level is set by -vvv")
-
-    parser.add_argument('-t', '--textcp', default="mac_roman", type=str,
-            help="Text encoding used while loading VI file (default is \"%(default)s\")")
-
-    parser.add_argument('--raw-connectors', action='store_true',
-            help="extract all connectors into raw binary files instead of pure XML" \
-            " (works only with --extract command)")
-
-    parser.add_argument('--print-map', choices=["RSRC","DFDS","LIbd","LIds","LIfp","LIvi","VCTP","VICD","VITS"],
-            help="print map for whole file (RSRC) or section (given ident);" \
-            " the map contains offsets at which things are within the file;" \
-            " for sections which are compressed within RSRC file, specific" \
-            " offsets can only be assigned after dumping it to bin")
-
-    parser.add_argument('--keep-names', action='store_true',
-            help="extract files to names indicated by RSRC content" \
-            " (works with --extract and --dump commands; useful for LLBs)")
-
-    subparser = parser.add_mutually_exclusive_group(required=True)
-
-    subparser.add_argument('-l', '--list', action='store_true',
-            help="list content of RSRC file")
-
-    subparser.add_argument('-d', '--dump', action='store_true',
-            help="dump items from RSRC file into XML and BINs, with minimal" \
-            " parsing of the data inside")
-
-    subparser.add_argument('-x', '--extract', action='store_true',
-            help="extract content of RSRC file into XMLs, parsing all blocks" \
-            " which structure is known")
-
-    subparser.add_argument('-c', '--create', action='store_true',
-            help="create RSRC file using information from XMLs")
-
-    subparser.add_argument('-n', '--info', action='store_true',
-            help="print general information about RSRC file")
-
-    subparser.add_argument('-p', '--password', default=None, type=str,
-            help="change password and re-compute checksums within RSRC file;" \
-            " save changes in-place, to the RSRC file")
-
-    subparser.add_argument('--version', action='version', version="%(prog)s {version} by {author}"
-              .format(version=__version__,author=__author__),
-            help="display version information and exit")
-
-    po = parser.parse_args()
-
-    po.typedesc_list_limit = 4095
-    po.array_data_limit = (2**28) - 1
-    po.store_as_data_above = 4095
-
     # Store base name - without path and extension
     if len(po.xml) > 0:
         po.filebase = os.path.splitext(os.path.basename(po.xml))[0]
@@ -107,6 +47,10 @@ def main():
     else:
         raise FileNotFoundError("Input file was not provided neither as RSRC or XML.")
 
+
+def processCommand(po):
+    """ Performs the command requested in options, on a single file.
+    """
     if po.list:
 
         if len(po.rsrc) == 0:
@@ -114,13 +58,12 @@ def main():
 
         if (po.verbose > 0):
             print("{}: Starting file parse for RSRC listing".format(po.rsrc))
-        with open(po.rsrc, "rb") as rsrc_fh:
-            vi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
-
-        print("{}\t{}".format("ident","content"))
-        for ident, block in vi.blocks.items():
-            pretty_ident = block.ident.decode(encoding='UTF-8')
-            print("{}\t{}".format(pretty_ident,str(block)))
+        with open(po.rsrc, "rb") as rsrc_fh, VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp) as vi:
+            # Listing reads block data, so the file must still be open
+            print("{}\t{}".format("ident","content"))
+            for ident, block in vi.blocks.items():
+                pretty_ident = block.ident.decode(encoding='UTF-8')
+                print("{}\t{}".format(pretty_ident,str(block)))
 
     elif po.dump:
 
@@ -131,11 +74,17 @@ def main():
         if len(po.rsrc) == 0:
             raise FileNotFoundError("No supported RSRC file was found despite checking all extensions.")
 
+        cache_entry = None
+        if po.cache is not None and po.print_map is None:
+            cache_entry = ExtractCacheEntry(po.cache, po, "dump", __version__)
+            if cache_entry.isUpToDate():
+                if (po.verbose > 0):
+                    print("{}: Output of previous dumping is up to date, skipping".format(po.rsrc))
+                return
+
         if (po.verbose > 0):
             print("{}: Starting file parse for RSRC dumping".format(po.rsrc))
-        with open(po.rsrc, "rb") as rsrc_fh:
-            vi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
-
+        with open(po.rsrc, "rb") as rsrc_fh, VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp) as vi:
             root = vi.exportBinBlocksXMLTree()
 
             if po.print_map is not None:
@@ -147,6 +96,9 @@ def main():
         with open(po.xml, "wb") as xml_fh:
             tree.write(xml_fh, encoding='utf-8', xml_declaration=True)
 
+        if cache_entry is not None:
+            cache_entry.store()
+
     elif po.extract:
 
         if len(po.xml) == 0:
@@ -156,11 +108,17 @@ def main():
         if len(po.rsrc) == 0:
             raise FileNotFoundError("No supported RSRC file was found despite checking all extensions.")
 
+        cache_entry = None
+        if po.cache is not None and po.print_map is None:
+            cache_entry = ExtractCacheEntry(po.cache, po, "extract", __version__)
+            if cache_entry.isUpToDate():
+                if (po.verbose > 0):
+                    print("{}: Output of previous extraction is up to date, skipping".format(po.rsrc))
+                return
+
         if (po.verbose > 0):
             print("{}: Starting file parse for RSRC extraction".format(po.rsrc))
-        with open(po.rsrc, "rb") as rsrc_fh:
-            vi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
-
+        with open(po.rsrc, "rb") as rsrc_fh, VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp) as vi:
             root = vi.exportXMLTree()
 
             if po.print_map is not None:
@@ -172,6 +130,9 @@ def main():
         with open(po.xml, "wb") as xml_fh:
             tree.write(xml_fh, encoding='utf-8', xml_declaration=True)
 
+        if cache_entry is not None:
+            cache_entry.store()
+
     elif po.create:
 
         if len(po.xml) == 0:
@@ -183,7 +144,7 @@ def main():
         vi = VI(po, xml_root=tree.getroot(), text_encoding=po.textcp)
 
         if len(po.rsrc) == 0:
-            po.rsrc = po.filebase + "." + getFileExtByType(vi.ftype)
+            po.rsrc = os.path.join(po.outdir, po.filebase + "." + getFileExtByType(vi.ftype))
 
         with open(po.rsrc, "wb") as rsrc_fh:
             vi.saveRSRC(rsrc_fh)
@@ -221,9 +182,266 @@ def main():
 
         raise NotImplementedError('Unsupported command.')
 
+
+def printStats(po):
+    """ Prints gathered processing statistics in requested format.
+    """
+    if po.profile == "json":
+        print(po.stats.exportJSON())
+    else:
+        print(po.stats.exportTable())
+
+
+def listBatchFiles(po):
+    """ Lists input files for batch processing, with output directory for each.
+
+    RSRC files are recognized by all the extensions known for RSRC types; for
+    creation, main XML files of extracted RSRC files are searched for instead.
+    """
+    rsrc_exts = set('.' + getFileExtByType(ftype) for ftype in FILE_FMT_TYPE)
+    batch_files = []
+    for dirpath, dirnames, filenames in os.walk(po.batch):
+        dirnames.sort()
+        out_path = os.path.join(po.batch_out, os.path.relpath(dirpath, po.batch))
+        for fname in sorted(filenames):
+            fpath = os.path.join(dirpath, fname)
+            fext = os.path.splitext(fname)[1].lower()
+            if po.create:
+                if fext != '.xml':
+                    continue
+                # Only main XML files have RSRC root element
+                with open(fpath, "rb") as xml_fh:
+                    if b'<RSRC' not in xml_fh.read(512):
+                        continue
+            elif fext not in rsrc_exts:
+                continue
+            batch_files.append((fpath, os.path.normpath(out_path),))
+    return batch_files
+
+
+def processBatchFile(po):
+    """ Performs the command on a single file of the batch.
+
+    Executed within a worker process. Any exception is caught, so that failure
+    of one file does not affect others. Console output is captured and returned,
+    to avoid mixing output of concurrently processed files.
+    """
+    start_time = time.time()
+    fname = po.xml if po.create else po.rsrc
+    if po.stats is not None:
+        # Statistics are gathered separately for each file, and merged by the caller
+        po.stats = ProcessingStats()
+    out_buf = io.StringIO()
+    error = None
+    try:
+        with contextlib.redirect_stdout(out_buf), contextlib.redirect_stderr(out_buf):
+            setFileBase(po)
+            processCommand(po)
+    except Exception as ex:
+        error = "{}: {}".format(type(ex).__name__, str(ex))
+    return fname, error, out_buf.getvalue(), time.time() - start_time, po.stats
+
+
+def processBatch(po):
+    """ Performs the command on all matching files within the batch directory.
+
+    Files are processed in a pool of worker processes. Returns amount of failed files.
+    """
+    if not os.path.isdir(po.batch):
+        raise FileNotFoundError("Batch input directory '{}' does not exist.".format(po.batch))
+    if po.password is not None:
+        raise NotImplementedError("Password change is not supported in batch mode.")
+    start_time = time.time()
+
+    batch_po_list = []
+    for fpath, out_path in listBatchFiles(po):
+        file_po = copy.copy(po)
+        file_po.batch = None
+        fbase = os.path.splitext(os.path.basename(fpath))[0]
+        if po.create:
+            file_po.xml = fpath
+            file_po.rsrc = ""
+            file_po.outdir = out_path
+        else:
+            file_po.rsrc = fpath
+            file_po.xml = os.path.join(out_path, fbase + ".xml")
+        if not po.list:
+            os.makedirs(out_path, exist_ok=True)
+        batch_po_list.append(file_po)
+
+    if (po.verbose > 0):
+        print("{}: Found {:d} files for batch processing".format(po.batch, len(batch_po_list)))
+
+    failed = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=po.jobs) as executor:
+        futures = [(file_po, executor.submit(processBatchFile, file_po),) for file_po in batch_po_list]
+        # Reporting in submission order keeps the output stable between runs
+        for file_po, future in futures:
+            try:
+                fname, error, output, elapsed, file_stats = future.result()
+            except Exception as ex:
+                # The worker process itself failed
+                fname = file_po.xml if po.create else file_po.rsrc
+                error, output, elapsed = "{}: {}".format(type(ex).__name__, str(ex)), "", 0.0
+                file_stats = None
+            if file_stats is not None:
+                po.stats.merge(file_stats)
+            if len(output) > 0:
+                print(output, end='')
+            if error is not None:
+                failed.append((fname, error,))
+                eprint("{}: Batch item failed: {}".format(fname, error))
+            elif (po.verbose > 0):
+                print("{}: Batch item done in {:.2f} s".format(fname, elapsed))
+
+    print("Batch summary: {:d} files processed, {:d} succeeded, {:d} failed, in {:.2f} s"\
+      .format(len(batch_po_list), len(batch_po_list) - len(failed), len(failed), time.time() - start_time))
+    for fname, error in failed:
+        print("  {}: {}".format(fname, error))
+    return len(failed)
+
+
+def prepareArgParser():
+    """ Creates parser of command line options.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument('-i', '--rsrc', '--vi', default="", type=str,
+            help="name of the LabView RSRC file, VI or other")
+
+    parser.add_argument('-m', '--xml', default="", type=str,
+            help="name of the main XML file of extracted VI dataset;" \
+            "default is RSRC file name with extension changed to xml")
+
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+            help="increases verbosity level; max level is set by -vvv")
+
+    parser.add_argument('-t', '--textcp', default="mac_roman", type=str,
+            help="Text encoding used while loading VI file (default is \"%(default)s\")")
+
+    parser.add_argument('--raw-connectors', action='store_true',
+            help="extract all connectors into raw binary files instead of pure XML" \
+            " (works only with --extract command)")
+
+    parser.add_argument('--print-map', choices=["RSRC","DFDS","LIbd","LIds","LIfp","LIvi","VCTP","VICD","VITS"],
+            help="print map for whole file (RSRC) or section (given ident);" \
+            " the map contains offsets at which things are within the file;" \
+            " for sections which are compressed within RSRC file, specific" \
+            " offsets can only be assigned after dumping it to bin")
+
+    parser.add_argument('--keep-names', action='store_true',
+            help="extract files to names indicated by RSRC content" \
+            " (works with --extract and --dump commands; useful for LLBs)")
+
+    parser.add_argument('--mmap', action='store_true',
+            help="access RSRC file through memory mapping while reading;" \
+            " sections data is then referenced within the mapping rather" \
+            " than copied, which lowers memory use on large files")
+
+    parser.add_argument('--lazy', action='store_true',
+            help="parse blocks only when their content is accessed, instead" \
+            " of parsing all blocks while reading the RSRC file; default data" \
+            " of each type is also parsed on first access; speeds up" \
+            " commands which do not need all the data, like --list")
+
+    parser.add_argument('--compact-heap', action='store_true',
+            help="store FP and BD heaps in compact arrays instead of one object per" \
+            " node; node objects are only created when needed, which lowers memory" \
+            " use for commands which do not process the heap, like --list")
+
+    parser.add_argument('--typed-arrays', action='store_true',
+            help="store default data of numeric arrays as single typed array" \
+            " (numpy array if available), instead of one object per item;" \
+            " lowers memory use and speeds up loading of large arrays")
+
+    parser.add_argument('--profile', nargs='?', const="table", default=None, choices=["table","json"],
+            help="measure time and amount of data processed in each phase and for each" \
+            " block type, and print the statistics at end in given format (default is table)")
+
+    parser.add_argument('--cache', default=None, type=str, metavar='DIR',
+            help="directory with cache of previous extractions; if the RSRC file," \
+            " options and output files did not change since the last --extract" \
+            " or --dump, the file is skipped (useful with --batch)")
+
+    parser.add_argument('--batch', default=None, type=str, metavar='DIR',
+            help="perform the command on all matching files within given directory" \
+            " and its subdirectories, using a pool of worker processes; RSRC files" \
+            " are matched for all commands except --create, which uses main XMLs")
+
+    parser.add_argument('--batch-out', default=".", type=str, metavar='DIR',
+            help="directory to store output of --batch processing in; the structure of" \
+            " subdirectories within input directory is replicated (default is \"%(default)s\")")
+
+    parser.add_argument('-j', '--jobs', default=None, type=int,
+            help="amount of worker processes for --batch processing;" \
+            " default is the number of processors")
+
+    subparser = parser.add_mutually_exclusive_group(required=True)
+
+    subparser.add_argument('-l', '--list', action='store_true',
+            help="list content of RSRC file")
+
+    subparser.add_argument('-d', '--dump', action='store_true',
+            help="dump items from RSRC file into XML and BINs, with minimal" \
+            " parsing of the data inside")
+
+    subparser.add_argument('-x', '--extract', action='store_true',
+            help="extract content of RSRC file into XMLs, parsing all blocks" \
+            " which structure is known")
+
+    subparser.add_argument('-c', '--create', action='store_true',
+            help="create RSRC file using information from XMLs")
+
+    subparser.add_argument('-n', '--info', action='store_true',
+            help="print general information about RSRC file")
+
+    subparser.add_argument('-p', '--password', default=None, type=str,
+            help="change password and re-compute checksums within RSRC file;" \
+            " save changes in-place, to the RSRC file")
+
+    subparser.add_argument('--version', action='version', version="%(prog)s {version} by {author}"
+              .format(version=__version__,author=__author__),
+            help="display version information and exit")
+
+    return parser
+
+
+def setInternalOptions(po):
+    """ Sets options which cannot be changed from command line.
+    """
+    po.typedesc_list_limit = 4095
+    po.array_data_limit = (2**28) - 1
+    po.store_as_data_above = 4095
+    po.outdir = ""
+    po.stats = ProcessingStats() if po.profile is not None else None
+
+
+def main():
+    """ Main executable function.
+
+    Its task is to parse command line options and call a function which performs requested command.
+    """
+    # Parse command line options
+    po = prepareArgParser().parse_args()
+    setInternalOptions(po)
+
+    if po.batch is not None:
+        failed_count = processBatch(po)
+    else:
+        failed_count = 0
+        setFileBase(po)
+        processCommand(po)
+
+    if po.stats is not None:
+        printStats(po)
+
+    return failed_count
+
 if __name__ == "__main__":
     try:
-        main()
+        if main():
+            # Some items of batch processing have failed
+            sys.exit(1)
     except Exception as ex:
         eprint("Error: "+str(ex))
         raise
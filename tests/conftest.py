@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+""" Fixtures shared by tests of pyLabview project.
+
+    Run the tests using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import pytest
+
+from pylabview.readRSRC import prepareArgParser, setInternalOptions, setFileBase
+from pylabview.LVrsrcontainer import VI
+
+
+@pytest.fixture
+def make_po():
+    """ Gives function which prepares options for loading given RSRC file.
+
+    The options have defaults same as in readRSRC; keyword arguments
+    of the function override them.
+    """
+    def _make_po(rsrc_fname, **kwargs):
+        po = prepareArgParser().parse_args(["--list", "--rsrc", rsrc_fname])
+        setInternalOptions(po)
+        setFileBase(po)
+        for name, value in kwargs.items():
+            setattr(po, name, value)
+        return po
+    return _make_po
+
+
+@pytest.fixture
+def load_vi(make_po):
+    """ Gives function which loads given RSRC file.
+
+    Keyword arguments of the function override default options.
+    """
+    def _load_vi(rsrc_fname, **kwargs):
+        po = make_po(rsrc_fname, **kwargs)
+        with open(rsrc_fname, "rb") as rsrc_fh:
+            vi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
+        return vi
+    return _load_vi
+
+
+@pytest.fixture
+def load_and_save_vi(make_po):
+    """ Gives function which loads given RSRC file, and saves it to bytes before closing.
+
+    Keyword arguments of the function override default options. Returns
+    the loaded VI and the saved data.
+    """
+    def _load_and_save_vi(rsrc_fname, **kwargs):
+        po = make_po(rsrc_fname, **kwargs)
+        with open(rsrc_fname, "rb") as rsrc_fh:
+            vi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
+            rsrc_data = vi.saveRSRCToBytes()
+        return vi, rsrc_data
+    return _load_and_save_vi
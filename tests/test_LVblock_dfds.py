@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, deferred parsing of default data.
+
+    This test checks whether Data Fills parsed on first access are the same
+    as Data Fills parsed while reading the file, and whether access to them
+    does not slow down with their amount.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVmisc as LV
+import pylabview.LVdatafill as LVdatafill
+import pylabview.LVblock as LVblock
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_dfds_deferred_parse(rsrc_inp_fn, load_and_save_vi):
+    """ Test whether Data Fills parsed on access are the same as ones parsed on load.
+    """
+    vi, rsrc_data = load_and_save_vi(rsrc_inp_fn)
+    lvi, lrsrc_data = load_and_save_vi(rsrc_inp_fn, lazy=True)
+    # Saving should not require parsing the Data Fills
+    assert lrsrc_data == rsrc_data
+    DFDS = vi.get_or_raise('DFDS')
+    lDFDS = lvi.get_or_raise('DFDS')
+    section = DFDS.getParsedSection(None)
+    lsection = lDFDS.getParsedSection(None)
+    assert lsection.dataFillsCount() == len(section.content)
+    for df_idx, df in enumerate(section.content):
+        df_data = df.prepareRSRCData()
+        # Skipping the Data Fill should give its size, if skipping is supported
+        bldata = LV.BinaryReader(df_data)
+        if LVdatafill.skipDataFillWithTD(vi, df.td, bldata, vi.po):
+            assert bldata.tell() == len(df_data)
+        # Accessing one Data Fill should only parse that one
+        ldf = lDFDS.getDFForTypeId(df.index)
+        assert ldf is not None
+        assert ldf.index == df.index
+        assert ldf.prepareRSRCData() == df_data
+        assert sum(1 for lcdf in lsection._content if lcdf is not None) <= df_idx + 1
+    assert len(lsection.content) == len(section.content)
+    assert lsection.hasContent()
+    assert lDFDS.prepareRSRCData(lDFDS.active_section_num) == DFDS.prepareRSRCData(DFDS.active_section_num)
+
+
+class CountingList(list):
+    """ List which counts items visited while iterating over it.
+    """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.visits = 0
+
+    def __iter__(self):
+        self.visits += len(self)
+        return super().__iter__()
+
+
+@pytest.mark.parametrize("lazy", (False, True,))
+@pytest.mark.parametrize("count", (1000, 8000,))
+def test_dfds_content_access_scaling(lazy, count):
+    """ Test whether accessing Data Fills does not walk the whole list on each access.
+    """
+    section = LVblock.DFDSSection(None, None)
+    content = CountingList()
+    section.content = content
+    for df_idx in range(count):
+        section.content.append(df_idx)
+    if lazy:
+        # All Data Fills parsed already, but with positions still stored
+        section.df_index = [None] * count
+    for df_idx in range(count):
+        assert section.content[df_idx] == df_idx
+        assert len(section.content) == count
+    # Items should be visited at most once, whatever the amount of Data Fills
+    assert content.visits <= count
+    assert section.df_index is None
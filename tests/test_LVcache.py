@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, extraction cache.
+
+    This test checks whether repeated extraction is skipped while input,
+    options and output files stay unchanged, and re-done otherwise.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import sys
+import shutil
+import pytest
+from unittest.mock import patch
+
+# Import the functions to be tested
+from pylabview.LVcache import ExtractCacheEntry, listExtractedFiles
+from pylabview.readRSRC import main as readRSRC_main, __version__
+
+
+RSRC_INP_FILE = os.path.join("examples", "lv14f1", "empty_vifile.vi")
+
+
+def run_extract(rsrc_fname, xml_fname, cache_path, *options):
+    command = [os.path.join("pylabview", "readRSRC.py"), "-v", "-x", "--cache", cache_path,
+      "-i", rsrc_fname, "-m", xml_fname] + list(options)
+    with patch.object(sys, 'argv', command):
+        readRSRC_main()
+
+
+@pytest.fixture
+def extracted(tmp_path, capsys):
+    """ Extracts a copy of example file with cache enabled; gives paths of input, XML and cache.
+    """
+    rsrc_fname = str(tmp_path / "inp.vi")
+    shutil.copy(RSRC_INP_FILE, rsrc_fname)
+    xml_fname = str(tmp_path / "extr" / "inp.xml")
+    os.makedirs(os.path.dirname(xml_fname))
+    cache_path = str(tmp_path / "cache")
+    run_extract(rsrc_fname, xml_fname, cache_path)
+    assert "up to date" not in capsys.readouterr().out
+    return rsrc_fname, xml_fname, cache_path
+
+
+def test_cache_hit(extracted, capsys, make_po):
+    """ Test whether unchanged extraction is skipped.
+    """
+    rsrc_fname, xml_fname, cache_path = extracted
+    outputs = listExtractedFiles(xml_fname)
+    assert len(outputs) > 1
+    mtimes = [os.stat(fname).st_mtime_ns for fname in outputs]
+    run_extract(rsrc_fname, xml_fname, cache_path)
+    assert "Output of previous extraction is up to date" in capsys.readouterr().out
+    assert [os.stat(fname).st_mtime_ns for fname in outputs] == mtimes
+    po = make_po(rsrc_fname, xml=xml_fname)
+    assert ExtractCacheEntry(cache_path, po, "extract", __version__).isUpToDate()
+
+
+def test_cache_miss(extracted, make_po):
+    """ Test whether entry does not match for different command, options or output.
+    """
+    rsrc_fname, xml_fname, cache_path = extracted
+    po = make_po(rsrc_fname, xml=xml_fname)
+    assert not ExtractCacheEntry(cache_path, po, "dump", __version__).isUpToDate()
+    assert not ExtractCacheEntry(cache_path, po, "extract", __version__ + "x").isUpToDate()
+    po = make_po(rsrc_fname, xml=xml_fname, raw_connectors=True)
+    assert not ExtractCacheEntry(cache_path, po, "extract", __version__).isUpToDate()
+    po = make_po(rsrc_fname, xml=os.path.join(os.path.dirname(xml_fname), "other.xml"))
+    assert not ExtractCacheEntry(cache_path, po, "extract", __version__).isUpToDate()
+
+
+@pytest.mark.parametrize("change", ["input", "output_modified", "output_removed", "manifest_broken"])
+def test_cache_invalidation(extracted, capsys, make_po, change):
+    """ Test whether extraction is re-done after input, output or the cache entry changes.
+    """
+    rsrc_fname, xml_fname, cache_path = extracted
+    outputs = listExtractedFiles(xml_fname)
+    po = make_po(rsrc_fname, xml=xml_fname)
+    cache_entry = ExtractCacheEntry(cache_path, po, "extract", __version__)
+    if change == "input":
+        # Same size and modification time, different content
+        st = os.stat(rsrc_fname)
+        with open(rsrc_fname, "r+b") as rsrc_fh:
+            rsrc_fh.seek(st.st_size - 1)
+            last_byte = rsrc_fh.read(1)
+            rsrc_fh.seek(st.st_size - 1)
+            rsrc_fh.write(bytes([last_byte[0] ^ 0xFF]))
+        os.utime(rsrc_fname, ns=(st.st_atime_ns, st.st_mtime_ns))
+    elif change == "output_modified":
+        with open(outputs[-1], "ab") as out_fh:
+            out_fh.write(b'\n')
+    elif change == "output_removed":
+        os.remove(outputs[-1])
+    elif change == "manifest_broken":
+        with open(cache_entry.manifest_fname, "w") as manifest_fh:
+            manifest_fh.write("{")
+    assert not ExtractCacheEntry(cache_path, po, "extract", __version__).isUpToDate()
+    if change == "input":
+        # Changed file may not be extractable; the entry mismatch is enough
+        return
+    run_extract(rsrc_fname, xml_fname, cache_path)
+    assert "up to date" not in capsys.readouterr().out
+    assert ExtractCacheEntry(cache_path, po, "extract", __version__).isUpToDate()
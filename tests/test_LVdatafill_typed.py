@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, typed arrays of data fill.
+
+    This test checks whether numeric array items stored in typed array
+    give back the same binary data, and the same values as struct module.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import struct
+import random
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVdatafill as LVdatafill
+
+
+def struct_format(item_fmt):
+    if isinstance(item_fmt, tuple):
+        return "".join(struct_format(sub_fmt) for sub_fmt in item_fmt)
+    return {
+        'i1': 'b', 'u1': 'B', 'i2': 'h', 'u2': 'H', 'i4': 'i', 'u4': 'I',
+        'i8': 'q', 'u8': 'Q', 'f4': 'f', 'f8': 'd', 'c8': 'ff', 'c16': 'dd',
+    }[item_fmt]
+
+
+def struct_item(values, item_fmt):
+    """ Converts flat tuple from struct into nested item, like typedArrayToList() gives
+    """
+    values = iter(values)
+    def make_item(item_fmt):
+        if isinstance(item_fmt, tuple):
+            return tuple(make_item(sub_fmt) for sub_fmt in item_fmt)
+        if item_fmt[0] == 'c':
+            return complex(next(values), next(values))
+        return next(values)
+    return make_item(item_fmt)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+@pytest.mark.parametrize("item_fmt", ['i1', 'u1', 'i2', 'u2', 'i4', 'u4', 'i8', 'u8', 'f4', 'f8',
+  'c8', 'c16', ('i4', 'i4', 'i4',), (('f8', 'f8',), 'c16',), ('u1', 'f8', ('i2', 'c8',),)])
+def test_typed_array_roundtrip(item_fmt, use_numpy, monkeypatch):
+    """ Test conversion of binary data to typed array and back.
+    """
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(LVdatafill, "numpy", None)
+    if not use_numpy and LVdatafill.typedArrayTypeCode(item_fmt) is None:
+        pytest.skip("format requires numpy")
+    item_size = LVdatafill.typedArrayItemSize(item_fmt)
+    st_fmt = '>' + struct_format(item_fmt)
+    assert struct.calcsize(st_fmt) == item_size
+    rnd = random.Random(8320)
+    data_buf = bytes(rnd.getrandbits(8) for i in range(item_size * 257))
+    # NaN values would not compare equal; replace them by zeros
+    items = []
+    for values in struct.iter_unpack(st_fmt, data_buf):
+        values = tuple(0 if val != val else val for val in values)
+        items.append(values)
+    data_buf = b''.join(struct.pack(st_fmt, *values) for values in items)
+    typed_value = LVdatafill.typedArrayFromBytes(data_buf, item_fmt)
+    assert len(typed_value) * typed_value.itemsize == len(data_buf)
+    assert LVdatafill.typedArrayToBytes(typed_value) == data_buf
+    assert LVdatafill.typedArrayToList(typed_value, item_fmt) == \
+      [struct_item(values, item_fmt) for values in items]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, index of consolidated Type Descriptors.
+
+    This test checks whether queries to the index of consolidated TDs
+    give the same entries as linear scan of VCTP.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import pytest
+
+
+def enumerate_linear(typeList, mainType=None, fullType=None):
+    out_list = []
+    for conn_idx, clientTD in enumerate(typeList):
+        if mainType is not None and clientTD.nested.mainType() != mainType:
+            continue
+        if fullType is not None and clientTD.nested.fullType() != fullType:
+            continue
+        out_list.append( (len(out_list), conn_idx, clientTD.nested,) )
+    return out_list
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_consolidated_td_index_queries(rsrc_inp_fn, load_vi):
+    """ Test whether TD index gives the same results as linear scan.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    VCTP = vi.get_or_raise('VCTP')
+    typeList = VCTP.getContent()
+    assert vi.consolidatedTDEnumerate() == enumerate_linear(typeList)
+    for clientTD in typeList:
+        td = clientTD.nested
+        assert vi.consolidatedTDEnumerate(mainType=td.mainType()) == \
+          enumerate_linear(typeList, mainType=td.mainType())
+        assert vi.consolidatedTDEnumerate(fullType=td.fullType()) == \
+          enumerate_linear(typeList, fullType=td.fullType())
+        assert vi.consolidatedTDEnumerate(mainType=td.mainType(), fullType=td.fullType()) == \
+          enumerate_linear(typeList, mainType=td.mainType(), fullType=td.fullType())
+    topLevel = VCTP.getSection().topLevel
+    for flatIdx in range(len(typeList)):
+        topIdx = vi.consolidatedTDTopIndex(flatIdx)
+        if flatIdx in topLevel:
+            assert topIdx == topLevel.index(flatIdx) + 1
+            assert VCTP.getTopType(topIdx) is VCTP.getFlatType(flatIdx)
+        else:
+            assert topIdx is None
+    # All Top Level positions of a TD should be given, if it is there multiple times
+    if len(topLevel) > 0:
+        topLevel.append(topLevel[0])
+        tdIndex = VCTP.getTypeDescIndex()
+        assert tdIndex.topIndexesOf(topLevel[0]) == \
+          [topIdx + 1 for topIdx, flatIdx in enumerate(topLevel) if flatIdx == topLevel[0]]
+        assert tdIndex.topIndexOf(topLevel[0]) == 1
+        topLevel.pop()
+    # Index is kept until the list changes
+    tdIndex = VCTP.getTypeDescIndex()
+    assert VCTP.getTypeDescIndex() is tdIndex
+    removedTD = typeList.pop()
+    assert VCTP.getTypeDescIndex() is not tdIndex
+    assert vi.consolidatedTDEnumerate() == enumerate_linear(typeList)
+    typeList.append(removedTD)
+    assert vi.consolidatedTDEnumerate() == enumerate_linear(typeList)
+    # Index is dropped when the data is updated, so changes in place are reflected
+    if len(topLevel) > 1 and topLevel[0] != topLevel[-1]:
+        topLevel[0], topLevel[-1] = topLevel[-1], topLevel[0]
+        VCTP.prepareRSRCData(VCTP.active_section_num)
+        topLevel = VCTP.getSection().topLevel
+        assert vi.consolidatedTDTopIndex(topLevel[-1]) == topLevel.index(topLevel[-1]) + 1
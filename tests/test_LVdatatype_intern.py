@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, interning of Type Descriptors.
+
+    This test checks whether identical RAW data of Type Descriptors is shared,
+    whether structural keys of Type Descriptors match their content, and whether hash lookup of equivalent TDs gives the same result as
+    comparing with each TD.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import argparse
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVdatatype as LVdatatype
+import pylabview.LVxml as ET
+import pylabview.modRSRC as modRSRC
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_typedesc_raw_data_interning(rsrc_inp_fn, load_vi):
+    """ Test whether TDs with identical RAW data share it.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    VCTP = vi.get_or_raise('VCTP')
+    typeList = VCTP.getContent()
+    raw_datas = {}
+    for clientTD in typeList:
+        td = clientTD.nested
+        # Identical RAW data is stored only once
+        assert td.raw_data is vi.typedesc_intern.internData(bytes(td.raw_data))
+        assert raw_datas.setdefault(td.raw_data, td.raw_data) is td.raw_data
+
+
+def key_items(key):
+    """ Gives all non-tuple items within the key
+    """
+    for itm in key:
+        if type(itm) is tuple:
+            yield from key_items(itm)
+        else:
+            yield itm
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_typedesc_structural_keys(rsrc_inp_fn, load_vi):
+    """ Test whether TDs with equal structural keys are identical, also between VIs.
+    """
+    vi1 = load_vi(rsrc_inp_fn)
+    vi2 = load_vi(rsrc_inp_fn)
+    typeList1 = vi1.get_or_raise('VCTP').getContent()
+    typeList2 = vi2.get_or_raise('VCTP').getContent()
+    keyed_tds = {}
+    for clientTD1, clientTD2 in zip(typeList1, typeList2):
+        td1, td2 = clientTD1.nested, clientTD2.nested
+        assert td1.structurallyEqual(td2)
+        key = td1.structuralKey()
+        hash(key)
+        # The key does not reference TDs nor VIs
+        assert all(type(itm) in (bytes, int, type(None),) for itm in key_items(key))
+        ktd = keyed_tds.setdefault(key, td1)
+        assert ktd.fullType() == td1.fullType()
+        assert ktd.raw_data == td1.raw_data
+
+
+def test_typedesc_intern_table_limit():
+    """ Test whether interning table with limited size is emptied when full.
+    """
+    intern = LVdatatype.TypeDescInternTable(max_entries=2)
+    data1 = intern.internData(b"\x00\x04\x01\x00")
+    assert intern.internData(bytes(bytearray(data1))) is data1
+    intern.internData(b"\x00\x04\x02\x00")
+    assert len(intern.data) == 2
+    intern.internData(b"\x00\x04\x03\x00")
+    assert len(intern.data) == 1
+    # The first data was dropped while emptying the table
+    assert intern.internData(bytes(bytearray(data1))) is not data1
+
+
+def test_typedesc_process_interning(load_vi):
+    """ Test whether VIs share the interning table when enabled.
+    """
+    rsrc_inp_fn = sorted(glob.glob('./examples/**/*.vi', recursive=True))[0]
+    LVdatatype.setProcessTypeDescInterning(True)
+    try:
+        vi1 = load_vi(rsrc_inp_fn)
+        vi2 = load_vi(rsrc_inp_fn)
+    finally:
+        LVdatatype.setProcessTypeDescInterning(False)
+    assert vi1.typedesc_intern is vi2.typedesc_intern
+    typeList1 = vi1.get_or_raise('VCTP').getContent()
+    typeList2 = vi2.get_or_raise('VCTP').getContent()
+    for clientTD1, clientTD2 in zip(typeList1, typeList2):
+        assert clientTD1.nested.raw_data is clientTD2.nested.raw_data
+    vi3 = load_vi(rsrc_inp_fn)
+    assert vi3.typedesc_intern is not vi1.typedesc_intern
+
+
+def add_flat_td(VCTP, tdType, label=None, clientIDs=()):
+    typeDesc = ET.SubElement(VCTP, "TypeDesc")
+    typeDesc.set("Type", tdType)
+    if label is not None:
+        typeDesc.set("Label", label)
+    for flatTypeID in clientIDs:
+        subTypeDesc = ET.SubElement(typeDesc, "TypeDesc")
+        subTypeDesc.set("TypeID", str(flatTypeID))
+    return typeDesc
+
+
+def test_vctp_find_or_add_typedesc():
+    """ Test whether indexed search finds the same TD as comparing with each TD.
+    """
+    po = argparse.Namespace(xml="test.xml", verbose=0)
+    fo = []
+    RSRC = ET.Element("RSRC")
+    VCTP = ET.SubElement(ET.SubElement(RSRC, "VCTP"), "Section")
+    add_flat_td(VCTP, "NumInt32")
+    add_flat_td(VCTP, "NumInt32", label="code")
+    add_flat_td(VCTP, "String", label="source")
+    add_flat_td(VCTP, "Boolean", label="status")
+    add_flat_td(VCTP, "Cluster", label="error", clientIDs=(3,1,2,))
+    add_flat_td(VCTP, "Cluster", label="error", clientIDs=(3,0,2,))
+    add_flat_td(VCTP, "Array", clientIDs=(4,))
+    ET.SubElement(VCTP, "TopLevel")
+
+    srcTypeDescs = [
+      add_flat_td(ET.Element("VCTP"), "NumInt32", label="code"),
+      add_flat_td(ET.Element("VCTP"), "Cluster", label="error", clientIDs=(3,0,2,)),
+      add_flat_td(ET.Element("VCTP"), "Array", clientIDs=(4,)),
+      add_flat_td(ET.Element("VCTP"), "Array", clientIDs=(5,)),
+      add_flat_td(ET.Element("VCTP"), "Array", clientIDs=(5,)),
+      add_flat_td(ET.Element("VCTP"), "Boolean"),
+    ]
+    for srcTypeDesc in srcTypeDescs:
+        flatTypeDescList = VCTP.findall("./TypeDesc")
+        expTypeID = len(flatTypeDescList)
+        for cmpTypeID, cmpTypeDesc in enumerate(flatTypeDescList):
+            if modRSRC.TypeDesc_equivalent(RSRC, fo, po, cmpTypeDesc, srcTypeDesc, flatTypeDescList, sameLabels=True):
+                expTypeID = cmpTypeID
+                break
+        dstTypeDesc, dstTypeID = modRSRC.VCTP_find_or_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=VCTP)
+        assert dstTypeID == expTypeID
+        assert VCTP.findall("./TypeDesc")[dstTypeID] is dstTypeDesc
+    # Two TDs were added, the other searches found existing ones
+    assert len(VCTP.findall("./TypeDesc")) == 9
+
+
+def test_vctp_find_typedesc_after_change():
+    """ Test whether indexed search finds TD changed in place, once the index is dropped.
+    """
+    po = argparse.Namespace(xml="test.xml", verbose=0)
+    fo = []
+    RSRC = ET.Element("RSRC")
+    VCTP = ET.SubElement(ET.SubElement(RSRC, "VCTP"), "Section")
+    add_flat_td(VCTP, "NumInt32", label="code")
+    add_flat_td(VCTP, "Boolean", label="status")
+    add_flat_td(VCTP, "Cluster", label="error", clientIDs=(1,0,))
+    ET.SubElement(VCTP, "TopLevel")
+    srcTypeDesc = add_flat_td(ET.Element("VCTP"), "Cluster", label="error", clientIDs=(1,0,))
+    _, dstTypeID = modRSRC.VCTP_find_or_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=VCTP)
+    assert dstTypeID == 2
+    # Change label of a client of the indexed cluster
+    VCTP.findall("./TypeDesc")[0].set("Label", "count")
+    modRSRC.VCTP_drop_TypeDesc_index(VCTP)
+    _, dstTypeID = modRSRC.VCTP_find_or_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=VCTP)
+    assert dstTypeID == 2
+    srcTypeDesc = add_flat_td(ET.Element("VCTP"), "NumInt32", label="count")
+    _, dstTypeID = modRSRC.VCTP_find_or_add_TypeDesc_copy(RSRC, fo, po, srcTypeDesc, VCTP=VCTP)
+    assert dstTypeID == 0
+    assert len(VCTP.findall("./TypeDesc")) == 3
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, compact storage of TDs and Data Fills.
+
+    This test checks whether Type Descriptor and Data Fill classes store
+    their properties in slots, without per-instance dict.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import inspect
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVdatatype as LVdatatype
+import pylabview.LVdatafill as LVdatafill
+
+
+def module_subclasses(module, base):
+    return [cls for _, cls in inspect.getmembers(module, inspect.isclass) if issubclass(cls, base)]
+
+
+@pytest.mark.parametrize("cls", module_subclasses(LVdatatype, LVdatatype.TDObject) +
+  module_subclasses(LVdatafill, LVdatafill.DataFill), ids=lambda cls: cls.__name__)
+def test_class_has_no_instance_dict(cls):
+    """ Test whether instances of the class have no dict.
+    """
+    assert cls.__dictoffset__ == 0
+    if issubclass(cls, LVdatatype.TDObject):
+        assert cls.full_name == (cls.__doc__ or "").split('\n')[0].strip()
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_typedesc_and_datafill_repr(rsrc_inp_fn, load_vi):
+    """ Test whether TDs and Data Fills loaded from file can be represented as text.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    typeList = vi.get_or_raise('VCTP').getContent()
+    for clientTD in typeList:
+        td = clientTD.nested
+        assert repr(td).startswith(type(td).__name__)
+        assert "full_name" in repr(td)
+        # All TDs within the list share one block reference
+        assert td.blockref is typeList[0].nested.blockref
+    DFDS = vi.get_or_raise('DFDS')
+    for df in DFDS.getParsedSection(None).content:
+        assert repr(df).startswith(type(df).__name__)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, compact storage of heap.
+
+    This test checks whether heap stored in compact arrays gives the same
+    nodes as heap parsed into list of Heap Node objects.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVheap as LVheap
+from pylabview.LVblock import HeapVerb
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_heap_columns(rsrc_inp_fn, load_and_save_vi):
+    """ Test whether compact heap storage gives the same nodes as regular one.
+    """
+    vi, rsrc_data = load_and_save_vi(rsrc_inp_fn)
+    cvi, crsrc_data = load_and_save_vi(rsrc_inp_fn, compact_heap=True)
+    # Saving should not require creating the nodes
+    assert crsrc_data == rsrc_data
+    heap_blocks = [block for block in vi.blocks.values() if isinstance(block, HeapVerb)]
+    for block in heap_blocks:
+        cblock = cvi.blocks[block.ident]
+        for snum, section in block.sections.items():
+            csection = cblock.sections[snum]
+            assert not csection.hasObjects()
+            heap_columns = cblock.getHeapColumns(snum)
+            heap_index = block.getHeapIndex(snum)
+            assert len(heap_columns) == len(section.objects)
+            for i, obj in enumerate(section.objects):
+                assert heap_columns.tagEn(i) is obj.tagEn
+                assert heap_columns.scopeInfo(i) == obj.scopeInfo
+                assert heap_columns.parentIndex(i) == heap_index.parentIndexOf(obj)
+                assert heap_columns.attribs(i) == obj.attribs or \
+                  any(isinstance(atVal, LVheap.PHONY_ENUM) for atVal in obj.attribs.values())
+                assert heap_columns.content(i) == obj.content or obj.format != "inline"
+                assert heap_columns.childIndexesOf(i) == heap_index.childIndexesOf(obj)
+                if obj.scopeInfo == LVheap.NODE_SCOPE.TagClose.value:
+                    continue
+                assert heap_columns.findByTag(obj.tagEn) == \
+                  [heap_index.indexOf(o) for o in heap_index.findByTag(obj.tagEn)]
+                classEn = obj.attribs.get(LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__class.value, None)
+                if classEn is not None and not isinstance(classEn, LVheap.PHONY_ENUM):
+                    assert heap_columns.findByClass(classEn) == \
+                      [heap_index.indexOf(o) for o in heap_index.findByClass(classEn)]
+                uid = obj.attribs.get(LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__uid.value, None)
+                if uid is not None:
+                    assert heap_columns.findByUid(uid) == heap_index.indexOf(heap_index.findByUid(uid))
+                    assert cblock.findNodeByUid(uid, snum) == heap_columns.findByUid(uid)
+                assert cblock.findNodesByTag(obj.tagEn, snum) == heap_columns.findByTag(obj.tagEn)
+            # Searching should not require creating the nodes
+            assert cblock.findNodeByUid(-12345, snum) is None
+            assert not csection.hasObjects()
+            # Nodes created from the columns should give the same binary data
+            assert LVheap.prepareHeapRSRCData(csection.objects) == LVheap.prepareHeapRSRCData(section.objects)
+            assert csection.hasObjects()
+            # Columns prepared from nodes should be shared with their data
+            assert cblock.getHeapColumns(snum) is heap_columns
+            assert block.getHeapColumns(snum).data == heap_columns.data
+            assert block.getHeapColumns(snum) is block.getHeapColumns(snum)
+            # Marking a node as modified should lead to re-creating the columns
+            csection.objects[0].markUpdated()
+            assert cblock.getHeapColumns(snum) is not heap_columns
+            assert cblock.getHeapColumns(snum).data == heap_columns.data
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, delta re-serialization of heap.
+
+    This test checks whether re-encoding only modified heap nodes gives
+    the same binary data as preparing the whole heap again.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVheap as LVheap
+from pylabview.LVrsrcontainer import VI
+from pylabview.LVblock import HeapVerb
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_heap_delta_update(rsrc_inp_fn, load_vi):
+    """ Test whether updating modified nodes gives the same data as full preparation.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    uidAttrId = LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__uid.value
+    heap_blocks = [block for block in vi.blocks.values() if isinstance(block, HeapVerb)]
+    for block in heap_blocks:
+        for snum, section in block.sections.items():
+            block.enableDeltaUpdate(snum)
+            # Without modifications, raw data should be left untouched
+            raw_data = block.getRawData(snum)
+            block.updateSectionData(snum)
+            assert block.getRawData(snum) is raw_data
+            # Marking a node without changing it should not count as a change
+            section.objects[0].markUpdated()
+            block.updateSectionData(snum)
+            assert block.getRawData(snum) is raw_data
+            # Modify a few nodes, some with change of data size
+            modified = [obj for obj in section.objects if uidAttrId in obj.attribs][::7]
+            for k, obj in enumerate(modified):
+                obj.attribs[uidAttrId] += 1 if k % 2 == 0 else 0x12345
+                obj.markUpdated()
+            exp_len = block.expectedRSRCSize(snum)
+            delta_data = block.prepareRSRCData(snum)
+            assert len(delta_data) == exp_len
+            heap_cache = section.heap_cache
+            full_cache = LVheap.prepareHeapDataCache(section.objects)
+            assert delta_data == full_cache.data
+            assert heap_cache.offsets == full_cache.offsets
+            # Replacing a node in the list should invalidate the cache
+            obj = section.objects[1]
+            new_obj = type(obj)(section, obj.parent, obj.tagEn, obj.scopeInfo)
+            new_obj.attribs = dict(obj.attribs)
+            new_obj.attribs[uidAttrId] = 0x7654
+            new_obj.content = obj.content
+            new_obj.parseRSRCContent()
+            section.objects[1] = new_obj
+            assert block.getHeapDataCache(section) is None
+            assert block.prepareRSRCData(snum) == LVheap.prepareHeapRSRCData(section.objects)
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", ["./examples/lv14f1/empty_vifile.vi"])
+def test_heap_edit_saved_without_marking(rsrc_inp_fn, tmp_path, make_po, load_vi):
+    """ Test whether node modified without marking is saved, if delta update is not enabled.
+    """
+    uidAttrId = LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__uid.value
+    with open(rsrc_inp_fn, "rb") as rsrc_fh:
+        po = make_po(rsrc_inp_fn)
+        vi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
+        section = vi.get_or_raise('FPHb').getSection()
+        modified = [obj for obj in section.objects if uidAttrId in obj.attribs]
+        expected = [obj.attribs[uidAttrId] + 1000 for obj in modified]
+        for obj in modified:
+            obj.attribs[uidAttrId] += 1000
+        rsrc_data = vi.saveRSRCToBytes()
+    rsrc_out_fn = tmp_path / "edited.vi"
+    rsrc_out_fn.write_bytes(rsrc_data)
+    vi = load_vi(str(rsrc_out_fn))
+    section = vi.get_or_raise('FPHb').getSection()
+    assert [obj.attribs[uidAttrId] for obj in section.objects if uidAttrId in obj.attribs] == expected
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, index of heap nodes.
+
+    This test checks whether queries to heap index give the same nodes
+    as linear scan of the heap.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVheap as LVheap
+from pylabview.LVblock import HeapVerb
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_heap_index_queries(rsrc_inp_fn, load_vi):
+    """ Test whether heap index gives the same results as linear scan.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    classAttrId = LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__class.value
+    uidAttrId = LVheap.SL_SYSTEM_ATTRIB_TAGS.SL__uid.value
+    heap_blocks = [block for block in vi.blocks.values() if isinstance(block, HeapVerb)]
+    for block in heap_blocks:
+        for snum, section in block.sections.items():
+            # The index should only be created on first use
+            assert section.heap_index is None
+            heap_index = block.getHeapIndex(snum)
+            for i, obj in enumerate(section.objects):
+                assert heap_index.indexOf(obj) == i
+                if obj.parent is None:
+                    assert heap_index.parentIndexOf(obj) == -1
+                else:
+                    assert section.objects[heap_index.parentIndexOf(obj)] is obj.parent
+                assert [section.objects[k] for k in heap_index.childIndexesOf(obj)] == obj.childs
+                if obj.scopeInfo == LVheap.NODE_SCOPE.TagClose.value:
+                    continue
+                assert obj in block.findNodesByTag(obj.tagEn, snum)
+                if classAttrId in obj.attribs:
+                    classEn = obj.attribs[classAttrId]
+                    assert block.findNodesByClass(classEn, snum) == \
+                      [o for o in section.objects if o.attribs.get(classAttrId, None) is classEn]
+                if uidAttrId in obj.attribs:
+                    uid = obj.attribs[uidAttrId]
+                    assert block.findNodeByUid(uid, snum) is \
+                      next(o for o in section.objects if o.attribs.get(uidAttrId, None) == uid)
+            assert block.findNodeByUid(-12345, snum) is None
+            # Modifying returned lists should not affect the index
+            tagEn = section.objects[0].tagEn
+            block.findNodesByTag(tagEn, snum).clear()
+            assert section.objects[0] in block.findNodesByTag(tagEn, snum)
+            # Changing uid of a marked node should be reflected in the index
+            uid_nodes = [obj for obj in section.objects if uidAttrId in obj.attribs]
+            if len(uid_nodes) > 0:
+                uid_nodes[-1].attribs[uidAttrId] = -12345
+                uid_nodes[-1].markUpdated()
+                assert block.findNodeByUid(-12345, snum) is uid_nodes[-1]
+            # Adding a node should lead to re-creating the index
+            obj = section.objects[-1]
+            section.objects.append(type(obj)(section, obj.parent, obj.tagEn, obj.scopeInfo))
+            assert block.getHeapIndex(snum).indexOf(section.objects[-1]) == len(section.objects) - 1
+            # Replacing the objects list should lead to re-creating the index
+            section.objects = section.objects[:1]
+            assert block.getHeapIndex(snum).findByTag(section.objects[0].tagEn) == section.objects
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, streaming export and import of heap XML.
+
+    This test checks whether heap written to XML file element by element
+    is the same as heap written from complete XML tree, and whether heap
+    loaded while parsing XML file is the same as one loaded from XML tree.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import io
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVxml as ET
+import pylabview.LVheap as LVheap
+from pylabview.LVblock import CompleteBlock, HeapVerb
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_heap_xml_streaming_export(rsrc_inp_fn, tmp_path, load_vi):
+    """ Test whether streaming heap export gives the same XML as export of whole tree.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    fname_base = str(tmp_path / "heap")
+    heap_blocks = [block for block in vi.blocks.values() if isinstance(block, HeapVerb)]
+    for block in heap_blocks:
+        for snum, section in block.sections.items():
+            tree_fh = io.BytesIO()
+            CompleteBlock.exportXMLSectionFile(block, tree_fh, snum, section, fname_base)
+            stream_fh = io.BytesIO()
+            block.exportXMLSectionFile(stream_fh, snum, section, fname_base)
+            assert stream_fh.getvalue() == tree_fh.getvalue()
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_heap_xml_streaming_import(rsrc_inp_fn, tmp_path, load_vi):
+    """ Test whether streaming heap import gives the same nodes as import of whole tree.
+    """
+    vi = load_vi(rsrc_inp_fn)
+    fname_base = str(tmp_path / "heap")
+    heap_blocks = [block for block in vi.blocks.values() if isinstance(block, HeapVerb)]
+    for block in heap_blocks:
+        for snum, section in block.sections.items():
+            xml_fname = "{:s}_{:s}{:d}.xml".format(fname_base, block.ident.decode(), snum)
+            with open(xml_fname, "wb") as xml_fh:
+                block.exportXMLSectionFile(xml_fh, snum, section, fname_base)
+            # Events from parser should match events from walking the tree
+            tree_root = ET.parse(xml_fname).getroot()
+            tree_events = [(event, elem.tag, elem.attrib, elem.text,) for event, elem in ET.iterwalk(tree_root)]
+            stream_events = [(event, elem.tag, elem.attrib, elem.text,) for event, elem in ET.iterparse(xml_fname)]
+            assert stream_events == tree_events
+            tree_objects = block.initWithXMLHeap(section, tree_root)
+            stream_objects = block.initWithXMLHeapEvents(section, ET.iterparse(xml_fname))
+            assert [(obj.tagEn, obj.scopeInfo,) for obj in stream_objects] == \
+              [(obj.tagEn, obj.scopeInfo,) for obj in tree_objects]
+            assert LVheap.prepareHeapRSRCData(stream_objects) == LVheap.prepareHeapRSRCData(tree_objects)
+            assert LVheap.prepareHeapRSRCData(stream_objects) == LVheap.prepareHeapRSRCData(section.objects)
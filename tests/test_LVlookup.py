@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, enum lookup tables.
+
+    This test checks whether lookups through shared tables give the same
+    results as direct use of the enums.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVlookup as LVlookup
+import pylabview.LVmisc as LVmisc
+from pylabview.LVheap import NODE_SCOPE
+from pylabview.LVdatatype import TD_FULL_TYPE
+from pylabview.LVdatatyperef import REFNUM_TYPE
+from pylabview.LVparts import PARTID
+
+
+@pytest.mark.parametrize("EnumClass", [NODE_SCOPE, TD_FULL_TYPE, REFNUM_TYPE, PARTID])
+def test_lookup_enum_values(EnumClass):
+    """ Test whether value lookup is equivalent to calling the enum.
+    """
+    values = set(item.value for item in EnumClass)
+    for value in range(-300, 10000):
+        assert LVlookup.enumHasValue(EnumClass, value) == (value in values)
+        if value in values:
+            assert LVlookup.enumOrIntFromValue(EnumClass, value) is EnumClass(value)
+            assert LVmisc.stringFromValEnumOrInt(EnumClass, value) == EnumClass(value).name
+        else:
+            assert LVlookup.enumOrIntFromValue(EnumClass, value) == value
+            assert LVmisc.stringFromValEnumOrInt(EnumClass, value) == str(value)
+    for item in EnumClass:
+        assert LVmisc.valFromEnumOrIntString(EnumClass, item.name.upper()) == item.value
+    assert LVmisc.valFromEnumOrIntString(EnumClass, "0x7FFFFFF0") == 0x7FFFFFF0
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, binary reader and writer.
+
+    This test checks whether BinaryReader and BinaryWriter give the same results
+    as the generic variable size field functions.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import io
+import random
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVmisc as LV
+
+
+def prepare_varfield_samples(minval, maxval):
+    rnd = random.Random(8320)
+    samples = [0, 1, -1, 126, 127, 128, -126, -127, -128, 253, 254, 255, 256,
+      0x7FFE, 0x7FFF, 0x8000, -0x7FFF, -0x8000, -0x8001, 0xFFFE, 0xFFFF, 0x10000,
+      0x7FFFFFFF, -0x80000000]
+    for i in range(1000):
+        samples.append(rnd.randint(-300, 70000))
+        samples.append(rnd.randint(minval, maxval))
+    return [val for val in samples if minval <= val <= maxval]
+
+
+@pytest.mark.parametrize("field,minval,maxval", [
+    ("U2p2", 0, 0x7FFFFFFF),
+    ("S24", -0x80000000, 0x7FFFFFFF),
+    ("S124", -0x80000000, 0x7FFFFFFF),
+    ("U124", 0, 0xFFFFFFFF),
+])
+def test_binary_varfield_equivalence(field, minval, maxval):
+    """ Test whether variable size fields are coded the same as by generic functions.
+    """
+    for val in prepare_varfield_samples(minval, maxval):
+        exp_data = getattr(LV, "prepareVariableSizeField" + field)(val)
+        data_buf = LV.BinaryWriter()
+        getattr(data_buf, "writeVar" + field)(val)
+        assert bytes(data_buf) == exp_data
+        data = exp_data + b'\x5a\xa5\x5a\xa5'
+        ref_bldata = io.BytesIO(data)
+        exp_val = getattr(LV, "readVariableSizeField" + field)(ref_bldata)
+        bldata = LV.BinaryReader(memoryview(data))
+        assert getattr(bldata, "readVar" + field)() == exp_val
+        assert bldata.tell() == ref_bldata.tell()
+
+
+def test_binary_fixed_fields():
+    """ Test reading back fixed size fields, and BytesIO compatibility of the reader.
+    """
+    data_buf = LV.BinaryWriter()
+    data_buf.writeU8(0xFE)
+    data_buf.writeS8(-2)
+    data_buf.writeU16(0xABCD)
+    data_buf.writeS16(-0x1234)
+    data_buf.writeU32(0xDEADBEEF)
+    data_buf.writeS32(-0x12345678)
+    data_buf.writeU64(0x0123456789ABCDEF)
+    data_buf.writeS64(-2)
+    data_buf.writeF32(1.5)
+    data_buf.writeF64(-0.25)
+    data_buf += b'tail'
+    bldata = LV.BinaryReader(bytes(data_buf))
+    assert bldata.readU8() == 0xFE
+    assert bldata.readS8() == -2
+    assert bldata.readU16() == 0xABCD
+    assert bldata.readS16() == -0x1234
+    assert bldata.readU32() == 0xDEADBEEF
+    assert bldata.readS32() == -0x12345678
+    assert bldata.readU64() == 0x0123456789ABCDEF
+    assert bldata.readS64() == -2
+    assert bldata.readF32() == 1.5
+    assert bldata.readF64() == -0.25
+    assert bldata.read() == b'tail'
+    bldata.seek(2)
+    assert bldata.readStruct(LV.STRUCT_BE_U16) == (0xABCD,)
+    with pytest.raises(Exception):
+        bldata.seek(len(data_buf) - 1)
+        bldata.readF32()
+
+
+@pytest.mark.parametrize("field,fixed_size,signed", [
+    ("U2p2", None, False),
+    ("S24", None, True),
+    ("S124", None, True),
+    ("U124", None, False),
+    ("U8", 1, False),
+    ("S8", 1, True),
+    ("U16", 2, False),
+    ("S16", 2, True),
+    ("U32", 4, False),
+    ("S32", 4, True),
+    ("U64", 8, False),
+    ("S64", 8, True),
+])
+def test_binary_truncated_fields(field, fixed_size, signed):
+    """ Test whether integers truncated by end of data are read the same as by int.from_bytes().
+    """
+    samples = [b'', b'\xfe', b'\x80\x00', b'\x81\xff\xfe', b'\xff\x12', b'\xfe\x01\x02\x03',
+      b'\x80\x00\x12\x34\x56', b'\x12\x34\x56\x78\x9a\xbc\xde']
+    for data in samples:
+        if fixed_size is None:
+            ref_bldata = io.BytesIO(data)
+            exp_val = getattr(LV, "readVariableSizeField" + field)(ref_bldata)
+            exp_pos = ref_bldata.tell()
+        else:
+            exp_val = int.from_bytes(data[:fixed_size], byteorder='big', signed=signed)
+            exp_pos = min(len(data), fixed_size)
+        bldata = LV.BinaryReader(memoryview(data))
+        assert getattr(bldata, "read" + ("Var" if fixed_size is None else "") + field)() == exp_val
+        assert bldata.tell() == exp_pos
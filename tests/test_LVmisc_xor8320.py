@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, XOR8320 cipher engines.
+
+    This test checks whether all engines give the same results as the reference
+    bitwise implementation.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import random
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVmisc as LV
+
+
+def prepare_xor8320_samples():
+    rnd = random.Random(8320)
+    samples = [b'', b'\0', b'\xff', b'\0' * 64, b'\xff' * 64, bytes(range(256))]
+    # Sizes around multiples of the key rotation period
+    for size in (1, 2, 9, 31, 32, 33, 63, 64, 65, 1000, 5003):
+        samples.append(bytes(rnd.randint(0, 255) for i in range(size)))
+    return samples
+
+
+@pytest.mark.parametrize("engine", list(LV.XOR8320_ENGINES.keys()))
+def test_xor8320_engines_equivalence(engine):
+    """ Test whether cipher engines give data identical to the bitwise reference.
+    """
+    for data in prepare_xor8320_samples():
+        enc_data = LV.crypto_xor8320_encrypt_bitwise(data)
+        assert LV.crypto_xor8320_encrypt(data, engine=engine) == enc_data
+        assert LV.crypto_xor8320_encrypt(memoryview(data), engine=engine) == enc_data
+        assert LV.crypto_xor8320_decrypt(enc_data, engine=engine) == data
+        assert LV.crypto_xor8320_decrypt(memoryview(enc_data), engine=engine) == data
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, ZeroMask8 compression engines.
+
+    This test checks whether all engines give the same results as the reference
+    bitwise implementation.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import random
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVmisc as LV
+
+
+def prepare_zeromsk8_samples():
+    rnd = random.Random(8320)
+    samples = [b'', b'\0', b'\x01', b'\0' * 8, b'\xff' * 8, bytes(range(16)), b'\0\x01' * 13]
+    for size in (1, 7, 8, 9, 15, 63, 64, 65, 1000, 5003):
+        # Different densities of zeros, as typical for RSRC blocks
+        for zeros_ratio in (0.0, 0.3, 0.7, 1.0):
+            samples.append(bytes(0 if rnd.random() < zeros_ratio else rnd.randint(1, 255) for i in range(size)))
+    return samples
+
+
+@pytest.mark.parametrize("engine", list(LV.ZEROMSK8_ENGINES.keys()))
+def test_zeromsk8_engines_equivalence(engine):
+    """ Test whether compression engines give data identical to the bitwise reference.
+    """
+    for data in prepare_zeromsk8_samples():
+        comp_data = LV.zcomp_zeromsk8_compress_bitwise(data)
+        assert LV.zcomp_zeromsk8_compress(data, engine=engine) == comp_data
+        assert LV.zcomp_zeromsk8_decompress(comp_data, len(data), engine=engine) == data
+        # Decompression with additional data after the compressed stream, or memoryview input
+        assert LV.zcomp_zeromsk8_decompress(comp_data + b'\x55\x55', len(data), engine=engine) == data
+        assert LV.zcomp_zeromsk8_decompress(memoryview(comp_data), len(data), engine=engine) == data
+    # Mask bits beyond the decompressed size should be ignored
+    comp_data = bytes([0xFF, 0x01, 0x02, 0x03])
+    assert LV.zcomp_zeromsk8_decompress(comp_data, 3, engine=engine) == \
+        LV.zcomp_zeromsk8_decompress_bitwise(comp_data, 3)
+
+
+@pytest.mark.parametrize("engine", list(LV.ZEROMSK8_ENGINES.keys()))
+def test_zeromsk8_engines_truncated(engine):
+    """ Test whether decompression engines fail on truncated data, like the reference does.
+    """
+    comp_data = LV.zcomp_zeromsk8_compress_bitwise(bytes(range(1, 40)))
+    with pytest.raises(IndexError):
+        LV.zcomp_zeromsk8_decompress(comp_data[:-1], 39, engine=engine)
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, lazy parsing of blocks.
+
+    This test checks whether VI with parsing deferred until first access
+    gives the same results as VI parsed while reading the file, also after
+    the file is closed.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import io
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVxml as ET
+
+
+def xml_bytes(root):
+    xml_fh = io.BytesIO()
+    ET.ElementTree(root).write(xml_fh, encoding='utf-8')
+    return xml_fh.getvalue()
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_lazy_parse_deferred(rsrc_inp_fn, load_vi):
+    """ Test whether blocks are parsed only on access in lazy mode.
+    """
+    lvi = load_vi(rsrc_inp_fn, lazy=True)
+    # Blocks required to read the file are parsed on load; others should not be
+    assert any(section.parse_pending for block in lvi.blocks.values() for section in block.sections.values())
+    VCTP = lvi.get_or_raise('VCTP')
+    assert len(VCTP.getContent()) > 0
+    assert not VCTP.getSection().parse_pending
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_lazy_after_file_closed(rsrc_inp_fn, tmp_path, load_and_save_vi, load_vi):
+    """ Test whether lazy VI can be exported and saved after its file is closed.
+    """
+    # Exported files are written next to the XML
+    xml_fname = str(tmp_path / "vi.xml")
+    vi, rsrc_data = load_and_save_vi(rsrc_inp_fn, xml=xml_fname, filebase="vi")
+    # The file is closed when the VI is returned
+    lvi = load_vi(rsrc_inp_fn, lazy=True, xml=xml_fname, filebase="vi")
+    assert lvi.saveRSRCToBytes() == rsrc_data
+    assert xml_bytes(lvi.exportXMLTree()) == xml_bytes(vi.exportXMLTree())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, memory-mapped reading of RSRC files.
+
+    This test checks whether VI read through memory mapping gives the same
+    results as VI read from regular file, and whether the mapping is released
+    without making the VI unusable.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import io
+import glob
+import pytest
+
+# Import the functions to be tested
+import pylabview.LVxml as ET
+from pylabview.LVrsrcontainer import VI, RSRCMappedFile
+
+
+def xml_bytes(root):
+    xml_fh = io.BytesIO()
+    ET.ElementTree(root).write(xml_fh, encoding='utf-8')
+    return xml_fh.getvalue()
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True) +
+  glob.glob('./examples/**/*.llb', recursive=True)))
+def test_mmap_load_export_save(rsrc_inp_fn, tmp_path, make_po, load_and_save_vi):
+    """ Test whether memory-mapped VI gives the same XML and RSRC data as regular one.
+    """
+    # Exported files are written next to the XML
+    xml_fname = str(tmp_path / "vi.xml")
+    vi, rsrc_data = load_and_save_vi(rsrc_inp_fn, xml=xml_fname, filebase="vi")
+    po = make_po(rsrc_inp_fn, mmap=True, xml=xml_fname, filebase="vi")
+    with open(rsrc_inp_fn, "rb") as rsrc_fh, VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp) as mvi:
+        assert isinstance(mvi.rsrc_fh, RSRCMappedFile)
+        assert mvi.saveRSRCToBytes() == rsrc_data
+        assert xml_bytes(mvi.exportXMLTree()) == xml_bytes(vi.exportXMLTree())
+        # Raw data of sections without coding should not be copied
+        assert any(isinstance(section.raw_data, memoryview)
+          for block in mvi.blocks.values() for section in block.sections.values())
+    # Leaving the `with` statement releases the mapping, but the VI remains usable
+    assert mvi.rsrc_fh is None
+    assert not any(isinstance(section.raw_data, memoryview)
+      for block in mvi.blocks.values() for section in block.sections.values())
+    assert mvi.saveRSRCToBytes() == rsrc_data
+    mvi.close()
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True)))
+def test_mmap_force_complete_read(rsrc_inp_fn, make_po, load_and_save_vi):
+    """ Test whether forcing complete read releases the mapping.
+    """
+    vi, rsrc_data = load_and_save_vi(rsrc_inp_fn)
+    po = make_po(rsrc_inp_fn, mmap=True)
+    with open(rsrc_inp_fn, "rb") as rsrc_fh:
+        mvi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
+        mvi.forceCompleteReadRSRC()
+        assert mvi.rsrc_fh is None
+    assert mvi.saveRSRCToBytes() == rsrc_data
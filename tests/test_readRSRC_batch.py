@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, batch processing of directories.
+
+    This test extracts a directory of RSRC files in batch mode, and checks
+    the results and the summary of failures.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import sys
+import shutil
+import filecmp
+import pytest
+from unittest.mock import patch
+
+# Import the functions to be tested
+from pylabview.readRSRC import main as readRSRC_main
+
+
+BATCH_INP_FILES = [
+    os.path.join("examples", "lv14f1", "empty_vifile.vi"),
+    os.path.join("examples", "lv14f1", "empty_libfile.llb"),
+]
+
+
+def prepare_batch_dir(batch_path):
+    """ Copies example files to given directory, with one in a sub-directory
+    """
+    os.makedirs(os.path.join(batch_path, "sub"))
+    shutil.copy(BATCH_INP_FILES[0], os.path.join(batch_path, "sub"))
+    shutil.copy(BATCH_INP_FILES[1], batch_path)
+    # Files with unrelated extensions are not part of the batch
+    with open(os.path.join(batch_path, "notes.txt"), "w") as txt_fh:
+        txt_fh.write("not a RSRC file")
+
+
+def run_readRSRC(command):
+    with patch.object(sys, 'argv', [os.path.join("pylabview", "readRSRC.py")] + command):
+        return readRSRC_main()
+
+
+def test_batch_extract_create(tmp_path, capsys):
+    """ Test whether batch extraction and re-creation processes all files and replicates directories.
+    """
+    batch_path = str(tmp_path / "inp")
+    prepare_batch_dir(batch_path)
+    extr_path = str(tmp_path / "extr")
+    assert run_readRSRC(["-x", "--batch", batch_path, "--batch-out", extr_path, "-j", "2"]) == 0
+    assert os.path.isfile(os.path.join(extr_path, "sub", "empty_vifile.xml"))
+    assert os.path.isfile(os.path.join(extr_path, "empty_libfile.xml"))
+    out = capsys.readouterr().out
+    assert "Batch summary: 2 files processed, 2 succeeded, 0 failed" in out
+
+    out_path = str(tmp_path / "out")
+    assert run_readRSRC(["-c", "--batch", extr_path, "--batch-out", out_path, "-j", "2"]) == 0
+    assert filecmp.cmp(os.path.join(out_path, "sub", "empty_vifile.vi"), BATCH_INP_FILES[0], shallow=False)
+    out = capsys.readouterr().out
+    assert "Batch summary: 2 files processed, 2 succeeded, 0 failed" in out
+
+
+def test_batch_failure_summary(tmp_path, capsys):
+    """ Test whether failure of one file is reported in summary, without stopping the batch.
+    """
+    batch_path = str(tmp_path / "inp")
+    prepare_batch_dir(batch_path)
+    broken_fname = os.path.join(batch_path, "broken.vi")
+    with open(broken_fname, "wb") as rsrc_fh:
+        rsrc_fh.write(b'RSRC\r\n' + bytes(26))
+    extr_path = str(tmp_path / "extr")
+    assert run_readRSRC(["-x", "--batch", batch_path, "--batch-out", extr_path, "-j", "2"]) == 1
+    assert os.path.isfile(os.path.join(extr_path, "sub", "empty_vifile.xml"))
+    captured = capsys.readouterr()
+    assert "Batch summary: 3 files processed, 2 succeeded, 1 failed" in captured.out
+    assert "  {}: ".format(broken_fname) in captured.out
+    assert "{}: Batch item failed".format(broken_fname) in captured.err
+
+
+def test_batch_missing_directory(tmp_path):
+    """ Test whether batch processing of non-existing directory raises an error.
+    """
+    with pytest.raises(FileNotFoundError):
+        run_readRSRC(["-x", "--batch", str(tmp_path / "none"), "--batch-out", str(tmp_path / "extr")])
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+""" Test for pyLabview project, profiling statistics.
+
+    This test checks whether processing statistics are gathered and
+    printed when requested with `--profile` option.
+    Run it using `pytest` in project root folder.
+"""
+
+# Copyright (C) 2022 Mefistotelis <mefistotelis@gmail.com>
+#
+# This work is licensed under the terms of the MIT license.
+# For a copy, see <https://opensource.org/licenses/MIT>.
+
+import os
+import sys
+import glob
+import json
+import pytest
+from unittest.mock import patch
+
+# Import the functions to be tested
+from pylabview.LVmisc import ProcessingStats, StatsPhase
+from pylabview.LVrsrcontainer import VI, VI_OPTION_DEFAULTS
+from pylabview.readRSRC import main as readRSRC_main
+
+
+def test_stats_phase_gathering():
+    """ Test whether measured phases are accumulated, and merged between stats objects.
+    """
+    stats = ProcessingStats()
+    for i in range(3):
+        with StatsPhase(stats, "getData", b'VCTP', bytes_in=10) as sp:
+            sp.bytes_out = 20
+    with StatsPhase(stats, "saveRSRC"):
+        pass
+    # Measuring without stats object does nothing
+    with StatsPhase(None, "getData", b'VCTP', bytes_in=10):
+        pass
+    other = ProcessingStats()
+    other.merge(stats)
+    for gathered in (stats, other,):
+        stats_list = gathered.exportList()
+        assert [(itm["phase"], itm["ident"], itm["count"], itm["bytes_in"], itm["bytes_out"]) for itm in stats_list] == \
+          [("getData", "VCTP", 3, 30, 60), ("saveRSRC", None, 1, 0, 0)]
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True))[:3])
+def test_readRSRC_profile_json(rsrc_inp_fn, tmp_path, capsys):
+    """ Test whether extraction with profiling prints statistics of its phases as JSON.
+    """
+    command = [os.path.join("pylabview", "readRSRC.py"), "-x", "--profile", "json",
+      "-i", rsrc_inp_fn, "-m", str(tmp_path / "vi.xml")]
+    with patch.object(sys, 'argv', command):
+        assert readRSRC_main() == 0
+    out = capsys.readouterr().out
+    stats_list = json.loads(out[out.index("[\n"):])
+    phases = set(itm["phase"] for itm in stats_list)
+    assert {"readRSRCBlockData", "getData", "parseRSRCData", "exportXMLTree"} <= phases
+    for itm in stats_list:
+        if itm["phase"] == "getData":
+            assert itm["ident"] is not None
+            assert itm["bytes_out"] > 0
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True))[:1])
+def test_readRSRC_profile_table(rsrc_inp_fn, capsys):
+    """ Test whether profiling prints table of statistics by default.
+    """
+    command = [os.path.join("pylabview", "readRSRC.py"), "-l", "--profile", "-i", rsrc_inp_fn]
+    with patch.object(sys, 'argv', command):
+        assert readRSRC_main() == 0
+    out = capsys.readouterr().out
+    lines = out[out.index("phase"):].splitlines()
+    assert lines[0].split() == ["phase", "ident", "count", "time", "[s]", "bytes", "in", "bytes", "out"]
+    assert any(line.startswith("readRSRCList") for line in lines[1:])
+
+
+@pytest.mark.parametrize("rsrc_inp_fn", sorted(glob.glob('./examples/**/*.vi', recursive=True))[:1])
+def test_vi_options_defaults(rsrc_inp_fn, make_po, load_and_save_vi):
+    """ Test whether VI can be loaded with options which do not include processing tuning.
+    """
+    vi, rsrc_data = load_and_save_vi(rsrc_inp_fn)
+    po = make_po(rsrc_inp_fn)
+    for name, default in VI_OPTION_DEFAULTS:
+        delattr(po, name)
+    with open(rsrc_inp_fn, "rb") as rsrc_fh:
+        dvi = VI(po, rsrc_fh=rsrc_fh, text_encoding=po.textcp)
+        assert dvi.saveRSRCToBytes() == rsrc_data
+    assert po.stats is None